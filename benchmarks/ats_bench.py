@@ -0,0 +1,117 @@
+"""
+ATS adapter benchmark - job boards read through the platform APIs, replayed
+from a local server with responses in each platform's JSON format.
+
+    python -m benchmarks.ats_bench [--postings 300] [--title Engineer] [--latency 0.05]
+
+For each platform it reports API requests, wall time, the postings matched
+against the ones expected, and how many schema fields came back filled. The
+browser path for the same board would need one extract_data LLM call per
+posting on top of rendering every page.
+"""
+
+import time
+import asyncio
+import argparse
+from dataclasses import replace
+
+from aiohttp import web
+
+from benchmarks.fixtures import (
+    greenhouse_board, greenhouse_jobs, job, lever_postings, smartrecruiters_posting,
+    smartrecruiters_postings, workday_jobs, workday_posting
+)
+from pure_agents.ats_adapters import AtsClient, AtsReader, detect_board, title_matches
+
+FIELDS = ("title", "company", "location", "description", "requirements", "salary", "employment_type",
+          "posted_date", "url")
+
+BOARD_URLS = {
+    "greenhouse": "https://boards.greenhouse.io/embed/job_board?for=acme",
+    "lever": "https://jobs.lever.co/acme",
+    "workday": "https://acme.wd5.myworkdayjobs.com/en-US/External",
+    "smartrecruiters": "https://jobs.smartrecruiters.com/Acme1",
+}
+
+
+def api_app(postings: int, latency: float) -> web.Application:
+    async def delay():
+        if latency:
+            await asyncio.sleep(latency)
+
+    async def greenhouse(request):
+        await delay()
+        return web.json_response(greenhouse_jobs(postings))
+
+    async def greenhouse_info(request):
+        await delay()
+        return web.json_response(greenhouse_board())
+
+    async def lever(request):
+        await delay()
+        return web.json_response(lever_postings(postings))
+
+    async def workday_list(request):
+        await delay()
+        body = await request.json()
+        return web.json_response(workday_jobs(postings, body["offset"], body["limit"], body.get("searchText", "")))
+
+    async def workday_detail(request):
+        await delay()
+        req_id = int(request.match_info["path"].rsplit("_R", 1)[-1])
+        return web.json_response(workday_posting(req_id - 10000, BOARD_URLS["workday"]))
+
+    async def smartrecruiters_list(request):
+        await delay()
+        q = request.query
+        return web.json_response(smartrecruiters_postings(postings, int(q["offset"]), int(q["limit"]), q.get("q", "")))
+
+    async def smartrecruiters_detail(request):
+        await delay()
+        return web.json_response(smartrecruiters_posting(request.match_info["id"]))
+
+    app = web.Application()
+    app.router.add_get("/greenhouse/acme/jobs", greenhouse)
+    app.router.add_get("/greenhouse/acme", greenhouse_info)
+    app.router.add_get("/lever/acme", lever)
+    app.router.add_post("/workday/jobs", workday_list)
+    app.router.add_get("/workday/{path:job/.*}", workday_detail)
+    app.router.add_get("/smartrecruiters/postings", smartrecruiters_list)
+    app.router.add_get("/smartrecruiters/postings/{id}", smartrecruiters_detail)
+    return app
+
+
+async def run(postings, title, latency, port=8790):
+    runner = web.AppRunner(api_app(postings, latency))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    local = f"http://127.0.0.1:{port}"
+    expected = {j["title"] for j in (job(i) for i in range(postings)) if title_matches(j["title"], title)}
+    expected_count = sum(1 for i in range(postings) if title_matches(job(i)["title"], title))
+
+    print(f"{'platform':<17}{'requests':>9}{'wall s':>8}{'matched':>9}{'expected':>10}{'fields filled':>15}")
+    try:
+        for platform, url in BOARD_URLS.items():
+            # Detected from the real board URL, answered by the local server
+            board = replace(detect_board(url), api=f"{local}/{platform}" + ("/acme" if platform in ("greenhouse", "lever") else ""))
+            reader = AtsReader(AtsClient())
+            start = time.perf_counter()
+            result = await reader.read(board, title)
+            elapsed = time.perf_counter() - start
+            await reader.close()
+            records = result.records if result else []
+            filled = sum(1 for r in records for f in FIELDS if r.get(f))
+            wrong = [r["title"] for r in records if r["title"] not in expected]
+            print(f"{platform:<17}{reader.client.requests:>9}{elapsed:>8.2f}{len(records):>9}{expected_count:>10}"
+                  f"{filled / max(len(records) * len(FIELDS), 1):>15.0%}" + (f"  unexpected: {wrong[:3]}" if wrong else ""))
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--postings", type=int, default=300, help="postings on each board")
+    parser.add_argument("--title", default="Engineer")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the fake API takes per request")
+    args = parser.parse_args()
+    asyncio.run(run(args.postings, args.title, args.latency))
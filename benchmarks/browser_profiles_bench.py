@@ -0,0 +1,131 @@
+"""
+Browser profile benchmark - page-load time and bytes transferred per
+launch profile against a local fixture careers site.
+
+    python -m benchmarks.browser_profiles_bench [--profiles debug production] [--runs 3]
+
+The debug profile opens a visible window, so it needs a display.
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+from pure_agents.browser_tool import BrowserTool
+from benchmarks.fixtures import listing_page
+
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + b"\0" * 40_000
+FONT_BYTES = b"wOF2" + b"\0" * 80_000
+TRACKER_JS = "(function(){var x=new Image();x.src='/pixel.gif';})();" * 200
+
+
+def fixture_app(tracker_url: str) -> web.Application:
+    """Careers site whose pages pull in images, a web font and a third-party tracker"""
+    page = listing_page(80).replace(
+        "</body>", f'<script src="{tracker_url}"></script></body>'
+    )
+
+    async def listing(request):
+        return web.Response(text=page, content_type="text/html")
+
+    async def stylesheet(request):
+        css = "@font-face{font-family:Inter;src:url(/fonts/inter.woff2) format('woff2')}body{font-family:Inter}"
+        return web.Response(text=css, content_type="text/css")
+
+    async def image(request):
+        return web.Response(body=IMAGE_BYTES, content_type="image/png")
+
+    async def font(request):
+        return web.Response(body=FONT_BYTES, content_type="font/woff2")
+
+    async def script(request):
+        return web.Response(text="window.loaded=true;", content_type="application/javascript")
+
+    app = web.Application()
+    app.router.add_get("/careers", listing)
+    app.router.add_get("/static/{name}", stylesheet)
+    app.router.add_get("/img/{name}", image)
+    app.router.add_get("/fonts/{name}", font)
+    app.router.add_get("/analytics.js", script)
+    return app
+
+
+def tracker_app() -> web.Application:
+    async def collect(request):
+        await asyncio.sleep(0.2)  # third-party hosts are slow
+        return web.Response(text=TRACKER_JS, content_type="application/javascript")
+
+    app = web.Application()
+    app.router.add_get("/collect.js", collect)
+    return app
+
+
+async def start(app, port, host="127.0.0.1"):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def measure(profile: str, url: str, tracker_host: str, runs: int) -> dict:
+    tool = BrowserTool(profile=profile)
+    # Treat the local tracker server like a known analytics host
+    tool.blocked_hosts = tool.blocked_hosts + (tracker_host,)
+    await tool.initialize()
+
+    transferred = 0
+
+    async def on_finished(request):
+        nonlocal transferred
+        try:
+            sizes = await request.sizes()
+            transferred += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception:
+            pass
+
+    tool.page.on("requestfinished", lambda request: asyncio.ensure_future(on_finished(request)))
+
+    times = []
+    try:
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            await tool.page.goto(url, wait_until="load")
+            times.append(time.perf_counter() - start_time)
+        await asyncio.sleep(0.5)  # let the last size lookups land
+    finally:
+        blocked = tool.blocked_requests
+        await tool.cleanup()
+
+    return {
+        "profile": profile,
+        "load_ms": sum(times) / len(times) * 1000,
+        "kb_per_load": transferred / runs / 1024,
+        "blocked_per_load": blocked / runs,
+    }
+
+
+async def run(profiles, runs, port=8765):
+    tracker_port = port + 1
+    site = await start(fixture_app(f"http://localhost:{tracker_port}/collect.js"), port)
+    # Served under a different host name so it is a third-party request
+    tracker = await start(tracker_app(), tracker_port, host="localhost")
+    try:
+        print(f"{'profile':<12}{'load ms':>10}{'KB/load':>10}{'blocked':>9}")
+        for profile in profiles:
+            result = await measure(profile, f"http://127.0.0.1:{port}/careers",
+                                   f"localhost:{tracker_port}", runs)
+            print(f"{result['profile']:<12}{result['load_ms']:>10.0f}"
+                  f"{result['kb_per_load']:>10.0f}{result['blocked_per_load']:>9.0f}")
+    finally:
+        await site.cleanup()
+        await tracker.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", nargs="+", default=["debug", "production"])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.profiles, args.runs))
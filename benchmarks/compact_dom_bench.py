@@ -0,0 +1,55 @@
+"""
+Compact DOM benchmark - prompt size and link recall of the compact page
+representation versus the old cleaned-HTML truncation.
+
+    python -m benchmarks.compact_dom_bench
+"""
+
+import time
+
+from pure_agents.html_cleaner import HTMLCleaner
+from pure_agents.compact_dom import compact_page
+from benchmarks.fixtures import listing_page, detail_page
+
+# Previous get_page_content behaviour
+OLD_LIMIT = 25000
+
+
+def approx_tokens(text: str) -> int:
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except ImportError:
+        return len(text) // 4
+
+
+def run():
+    fixtures = {
+        "listing_40": listing_page(40),
+        "listing_120": listing_page(120),
+        "listing_300": listing_page(300),
+        "detail": detail_page(1),
+    }
+    print(f"{'page':<14}{'raw KB':>8}{'full tok':>10}{'old tok':>9}{'new tok':>9}{'ratio':>7}"
+          f"{'old links':>11}{'new links':>11}{'ms':>7}")
+    for name, html in fixtures.items():
+        full = HTMLCleaner().clean(html).html
+        old = full[:OLD_LIMIT]
+
+        start = time.perf_counter()
+        new = compact_page(html)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        job_links = {f"/jobs/{10000 + i}" for i in range(400)}
+        old_links = sum(1 for link in job_links if f'href="{link}"' in old)
+        new_links = sum(1 for link in job_links if f"-> {link}]" in new.text)
+
+        old_tokens, new_tokens = approx_tokens(old), approx_tokens(new.text)
+        # ratio: tokens the cleaned HTML needs to show the whole page vs the compact form
+        full_tokens = approx_tokens(full)
+        print(f"{name:<14}{len(html) / 1024:>8.0f}{full_tokens:>10}{old_tokens:>9}{new_tokens:>9}"
+              f"{full_tokens / max(new_tokens, 1):>7.1f}{old_links:>11}{new_links:>11}{elapsed:>7.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,233 @@
+"""
+End-to-end benchmark - full scraper runs against local fixture career sites
+with the OpenAI API replaced by benchmarks.fake_openai. Nothing leaves the
+machine, so runs are repeatable and comparable.
+
+    python -m benchmarks.e2e_bench [--scenarios paginated iframe load_more] [--runs 1]
+                                   [--llm-latency 0.2] [--warm] [--fake-rpm N]
+                                   [--mode agent|pipeline] [--save run.json] [--baseline old.json]
+
+Scenarios:
+    paginated   3 pages of listings behind "Next page" links, JSON-LD detail pages
+    iframe      board embedded in an iframe among ad frames, detail pages without JSON-LD
+    load_more   listings appended by a "Load more jobs" button, JSON-LD detail pages
+
+Per run it reports wall time, agent turns, LLM calls, tokens, 429s and the
+share of expected jobs recalled. Each invocation starts with empty caches;
+with --warm the LLM cache and known listing routes carry over between runs.
+--fake-rpm makes the fake server answer 429 above a requests-per-minute
+limit, to exercise the client-side rate limiter. --mode pipeline runs the
+fixed algorithm as code, so turns stay at zero unless the agent takes over.
+Needs Playwright's Chromium.
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from statistics import mean
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+from benchmarks.fake_openai import FakeOpenAI
+from benchmarks.fixtures import detail_page, home_page, iframe_host_page, job_cards, listing_page, page_jobs
+
+JOB_TITLE = "Engineer"
+PER_PAGE = 25
+PAGES = 3
+
+
+def site_app(scenario: str) -> web.Application:
+    """One career site: / links to /careers, job details live under /jobs/<id>"""
+    json_ld = scenario != "iframe"
+
+    def html(text):
+        return web.Response(text=text, content_type="text/html")
+
+    async def home(request):
+        return html(home_page())
+
+    async def careers(request):
+        page = int(request.query.get("page", "1"))
+        if scenario == "paginated":
+            next_href = f"/careers?page={page + 1}" if page < PAGES else None
+            return html(listing_page(PER_PAGE, page=page - 1, next_href=next_href))
+        if scenario == "load_more":
+            script = (f"<script>var shown=1;function loadMore(){{fetch('/careers/more?page='+shown)"
+                      f".then(function(r){{return r.text()}}).then(function(h){{"
+                      f"document.querySelector('.job-list').insertAdjacentHTML('beforeend',h);shown++;"
+                      f"if(shown>={PAGES})document.querySelector('.load-more').remove();}});}}</script>")
+            return html(listing_page(PER_PAGE, load_more=True).replace("</body>", script + "</body>"))
+        return html(iframe_host_page("/board", ad_base="/ads/slot"))
+
+    async def more(request):
+        return html(job_cards(PER_PAGE, page=int(request.query["page"])))
+
+    async def board(request):
+        return html(listing_page(PER_PAGE * PAGES))
+
+    async def ad(request):
+        return html("<html><body><div class='ad'>Ad</div></body></html>")
+
+    async def detail(request):
+        return html(detail_page(int(request.match_info["id"]) - 10000, json_ld=json_ld))
+
+    async def empty(request):
+        return web.Response(text="", content_type="text/plain")
+
+    app = web.Application()
+    app.router.add_get("/", home)
+    app.router.add_get("/careers", careers)
+    app.router.add_get("/careers/more", more)
+    app.router.add_get("/board", board)
+    app.router.add_get("/ads/slot/{k}", ad)
+    app.router.add_get("/jobs/{id}", detail)
+    app.router.add_get("/{tail:.*}", empty)
+    return app
+
+
+def expected_paths(scenario: str) -> set:
+    """Detail page paths of every job matching JOB_TITLE on the site"""
+    if scenario == "iframe":
+        jobs = page_jobs(PER_PAGE * PAGES)
+    else:
+        jobs = [j for page in range(PAGES) for j in page_jobs(PER_PAGE, page)]
+    return {f"/jobs/{j['id']}" for j in jobs if JOB_TITLE.lower() in j["title"].lower()}
+
+
+async def start(app, port):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def run_scenario(scenario, port, fake, output_dir, warm, mode="agent") -> dict:
+    from main import UniversalJobScraper
+    from utils.tracing import Tracer, set_tracer
+
+    tracer = set_tracer(Tracer())
+    fake.reset()
+    scraper = UniversalJobScraper(profile="production", mode=mode)
+    job_params = {"job_title": JOB_TITLE, "company_name": None,
+                  "company_domain": f"http://127.0.0.1:{port}/", "location": None}
+    try:
+        await scraper.initialize()
+        start_time = time.perf_counter()
+        output = await scraper.scrape_jobs(job_params, output_path=os.path.join(output_dir, f"{scenario}.json"),
+                                           use_cached_route=warm, resume=False)
+        latency = time.perf_counter() - start_time
+    finally:
+        await scraper.cleanup()
+
+    jobs = output["result"].get("jobs", []) if isinstance(output["result"], dict) else []
+    found = {urlparse(j.get("url", "")).path.rstrip("/") for j in jobs if isinstance(j, dict)}
+    expected = expected_paths(scenario)
+    return {
+        "scenario": scenario,
+        "latency": latency,
+        **fake.stats(),
+        "jobs_found": len(found),
+        "jobs_expected": len(expected),
+        "recall": len(found & expected) / len(expected) if expected else 1.0,
+        "spans": tracer.summary()["spans"],
+    }
+
+
+def averages(results) -> dict:
+    by_scenario = {}
+    for r in results:
+        by_scenario.setdefault(r["scenario"], []).append(r)
+    keys = ("latency", "turns", "llm_calls", "prompt_tokens", "completion_tokens", "recall")
+    return {name: {k: mean(r[k] for r in runs) for k in keys} for name, runs in by_scenario.items()}
+
+
+def report(results, baseline=None):
+    print(f"\n{'scenario':<12}{'run':>4}{'wall s':>9}{'turns':>7}{'LLM calls':>11}"
+          f"{'prompt tok':>12}{'compl tok':>11}{'429s':>6}{'recall':>8}")
+    for r in results:
+        print(f"{r['scenario']:<12}{r['run']:>4}{r['latency']:>9.1f}{r['turns']:>7}{r['llm_calls']:>11}"
+              f"{r['prompt_tokens']:>12}{r['completion_tokens']:>11}{r['rate_limited']:>6}{r['recall']:>8.0%}")
+
+    if baseline:
+        print(f"\nvs baseline{'':<1}{'wall s':>9}{'turns':>7}{'LLM calls':>11}{'prompt tok':>12}{'recall':>8}")
+        current = averages(results)
+        before = averages(baseline["results"])
+        for name, now in current.items():
+            if name not in before:
+                continue
+            old = before[name]
+            print(f"{name:<12}{now['latency'] - old['latency']:>+9.1f}{now['turns'] - old['turns']:>+7.0f}"
+                  f"{now['llm_calls'] - old['llm_calls']:>+11.0f}{now['prompt_tokens'] - old['prompt_tokens']:>+12.0f}"
+                  f"{now['recall'] - old['recall']:>+8.0%}")
+
+
+async def run(scenarios, runs, latency, warm, save=None, baseline=None, fake_rpm=0, port=8780, mode="agent"):
+    work_dir = tempfile.mkdtemp(prefix="e2e_bench_")
+    fake = FakeOpenAI(latency=latency, rpm=fake_rpm)
+    openai_port = port + len(scenarios)
+
+    # Must be in place before the scraper modules read their configuration
+    os.environ.update({
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+        "OPENAI_API_KEY": "bench",
+        "LLM_CACHE": "1" if warm else "0",
+        "LLM_CACHE_PATH": os.path.join(work_dir, "llm_cache.sqlite"),
+        "SELECTOR_CACHE_PATH": os.path.join(work_dir, "selectors.json"),
+        "ROUTE_CACHE_PATH": os.path.join(work_dir, "routes.json"),
+    })
+    from agents import set_default_openai_api, set_tracing_disabled
+    set_default_openai_api("chat_completions")
+    set_tracing_disabled(True)
+
+    servers = [await start(fake.app(), openai_port)]
+    ports = {}
+    for i, scenario in enumerate(scenarios):
+        ports[scenario] = port + i
+        servers.append(await start(site_app(scenario), port + i))
+
+    results = []
+    try:
+        for run_no in range(1, runs + 1):
+            for scenario in scenarios:
+                result = await run_scenario(scenario, ports[scenario], fake, work_dir, warm, mode)
+                result["run"] = run_no
+                results.append(result)
+    finally:
+        for server in servers:
+            await server.cleanup()
+
+    report(results, baseline)
+    if save:
+        with open(save, "w", encoding="utf-8") as f:
+            json.dump({"llm_latency": latency, "warm": warm, "mode": mode, "results": results}, f, indent=2)
+        print(f"\nSaved to {save}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", nargs="+", default=["paginated", "iframe", "load_more"],
+                        choices=["paginated", "iframe", "load_more"])
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--llm-latency", type=float, default=0.2,
+                        help="seconds the fake OpenAI server takes per request")
+    parser.add_argument("--warm", action="store_true",
+                        help="keep the LLM cache and listing routes between runs")
+    parser.add_argument("--fake-rpm", type=int, default=0,
+                        help="requests per minute the fake server allows before answering 429")
+    parser.add_argument("--mode", choices=["agent", "pipeline"], default="agent",
+                        help="run the scraper agent-driven or as the deterministic pipeline")
+    parser.add_argument("--save", help="write results as JSON for later comparison")
+    parser.add_argument("--baseline", help="JSON from an earlier --save to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    asyncio.run(run(args.scenarios, args.runs, args.llm_latency, args.warm, args.save, baseline, args.fake_rpm,
+                    mode=args.mode))
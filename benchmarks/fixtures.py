@@ -0,0 +1,274 @@
+"""
+Fixture pages - deterministic synthetic career-site HTML for benchmarks
+Shaped like real ATS output: deep wrapper divs, utility classes, inline
+scripts and tracking markup around a list of job cards. The same jobs are
+also available as the JSON of the Greenhouse, Lever, Workday and
+SmartRecruiters job board APIs.
+"""
+
+import re
+import html
+import json
+import random
+
+TITLES = [
+    "Software Engineer", "Senior Data Engineer", "Product Manager", "UX Designer",
+    "DevOps Engineer", "Machine Learning Engineer", "QA Analyst", "Technical Writer",
+    "Sales Manager", "Customer Success Lead", "Backend Developer", "Frontend Developer"
+]
+LOCATIONS = ["Berlin, Germany", "Austin, TX", "Remote", "London, UK", "Toronto, Canada", "Wolfsburg, Germany"]
+TEAMS = ["Engineering", "Data", "Product", "Design", "Sales", "Operations"]
+
+HEAD = """<!doctype html><html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<link rel="stylesheet" href="/static/app.{n}.css"><style>{style}</style>
+<script>window.dataLayer=window.dataLayer||[];function gtag(){{dataLayer.push(arguments)}}{script}</script>
+</head><body class="antialiased bg-white text-gray-900">"""
+
+NAV = """<header class="site-header sticky top-0 z-50"><div class="container mx-auto px-4"><div class="flex items-center justify-between h-16">
+<a href="/" class="logo-link"><svg viewBox="0 0 100 20"><path d="M0 0h100v20H0z"/></svg><span class="sr-only">Acme</span></a>
+<nav class="hidden md:flex space-x-6"><a href="/about" class="nav-link text-sm font-medium">About</a><a href="/careers" class="nav-link text-sm font-medium">Careers</a><a href="/blog" class="nav-link text-sm font-medium">Blog</a></nav>
+</div></div></header>"""
+
+
+def job(i, seed=0):
+    rnd = random.Random(seed * 1000 + i)
+    return {
+        "id": 10000 + i,
+        "title": f"{rnd.choice(TITLES)} {['I', 'II', 'III'][i % 3]}",
+        "location": rnd.choice(LOCATIONS),
+        "team": rnd.choice(TEAMS),
+        "posted": f"2026-0{1 + i % 9}-{10 + i % 18}",
+        "employment_type": rnd.choice(["FULL_TIME", "PART_TIME", "CONTRACTOR"]),
+        "salary": 60000 + rnd.randrange(0, 80000, 1000),
+    }
+
+
+def _card(j, base="/jobs"):
+    return f"""<li class="job-card group relative rounded-lg border border-gray-200 p-4 hover:shadow-md transition" data-job-id="{j['id']}" data-analytics='{{"event":"job_impression","id":{j['id']}}}'>
+<div class="flex flex-col gap-1"><div class="flex items-start justify-between"><div class="min-w-0 flex-1">
+<h3 class="text-lg font-semibold leading-6 text-gray-900 truncate"><a href="{base}/{j['id']}" class="job-title-link focus:outline-none" data-track="click">{j['title']}</a></h3>
+<div class="mt-1 flex items-center text-sm text-gray-500"><svg class="mr-1.5 h-5 w-5"><path d="M10 2a6 6 0 00-6 6c0 4 6 10 6 10s6-6 6-10a6 6 0 00-6-6z"/></svg><span class="job-location">{j['location']}</span></div>
+</div><div class="ml-2 flex-shrink-0"><span class="inline-flex items-center rounded-full bg-green-100 px-2.5 py-0.5 text-xs font-medium text-green-800">{j['team']}</span></div></div>
+<div class="mt-2 text-xs text-gray-400"><time datetime="{j['posted']}">Posted {j['posted']}</time></div>
+<img src="/img/team-{j['team'].lower()}.png" alt="" class="hidden"></div></li>"""
+
+
+def page_jobs(count, page=0, seed=0):
+    """The jobs shown on one page of a board with `count` cards per page"""
+    return [job(i + page * count, seed) for i in range(count)]
+
+
+def job_cards(count, page=0, seed=0, base="/jobs"):
+    """Card markup for one page of results, e.g. a "load more" response"""
+    return "\n".join(_card(j, base) for j in page_jobs(count, page, seed))
+
+
+def listing_page(count=120, seed=0, base="/jobs", page=None, next_href=None, load_more=False):
+    """Job board with `count` cards; optional pagination or load-more control"""
+    cards = job_cards(count, page or 0, seed, base)
+    pager = ""
+    if next_href:
+        pager = f'<nav class="pagination" aria-label="Pagination"><a href="{next_href}" class="page-next" rel="next">Next page</a></nav>'
+    elif load_more:
+        pager = '<div class="load-more-wrap"><button type="button" class="btn load-more" onclick="loadMore()">Load more jobs</button></div>'
+    return (
+        HEAD.format(title="Careers - All Jobs", n=seed, style=".job-card{}" * 200, script="gtag('js',new Date());" * 40)
+        + NAV
+        + """<main id="main" class="container mx-auto px-4 py-8"><div class="grid grid-cols-12 gap-6">
+<aside class="col-span-3"><form class="filters" role="search"><label for="q">Search</label><input id="q" name="q" type="search" placeholder="Search jobs">
+<select name="location"><option>All locations</option>""" + "".join(f"<option>{l}</option>" for l in LOCATIONS) + """</select>
+<button type="submit" class="btn btn-primary">Search</button></form></aside>
+<section class="col-span-9"><h1 class="text-3xl font-bold">Open positions</h1><ul class="job-list space-y-4" role="list">"""
+        + cards
+        + "</ul>" + pager + "</section></div></main>"
+        + '<footer class="site-footer"><p>&copy; 2026 Acme</p><script src="/analytics.js"></script></footer></body></html>'
+    )
+
+
+def detail_page(i, seed=0, json_ld=True):
+    """Job detail page, optionally with schema.org JobPosting JSON-LD"""
+    j = job(i, seed)
+    description = " ".join(
+        f"<p>You will work on {j['team'].lower()} problem #{k} with a great team and modern tools.</p>"
+        for k in range(12)
+    )
+    ld = ""
+    if json_ld:
+        ld = '<script type="application/ld+json">' + json.dumps({
+            "@context": "https://schema.org/",
+            "@type": "JobPosting",
+            "title": j["title"],
+            "description": description,
+            "datePosted": j["posted"],
+            "employmentType": j["employment_type"],
+            "hiringOrganization": {"@type": "Organization", "name": "Acme Corp"},
+            "jobLocation": {"@type": "Place", "address": {
+                "@type": "PostalAddress", "addressLocality": j["location"].split(",")[0],
+                "addressCountry": j["location"].split(",")[-1].strip()}},
+            "baseSalary": {"@type": "MonetaryAmount", "currency": "USD",
+                           "value": {"@type": "QuantitativeValue", "value": j["salary"], "unitText": "YEAR"}},
+            "qualifications": "3+ years of relevant experience",
+        }) + "</script>"
+    return (
+        HEAD.format(title=j["title"], n=seed, style=".x{}" * 100, script="")
+        + ld + NAV
+        + f"""<main class="container"><article class="job-detail"><h1 class="job-title">{j['title']}</h1>
+<div class="meta"><span class="location">{j['location']}</span> · <span class="team">{j['team']}</span> · <span class="type">{j['employment_type']}</span></div>
+<section class="description">{description}</section>
+<section class="requirements"><h2>Requirements</h2><ul><li>3+ years of relevant experience</li><li>Clear communication</li></ul></section>
+<a href="/jobs/{j['id']}/apply" class="btn apply">Apply now</a></article></main></body></html>"""
+    )
+
+
+def home_page():
+    """Company landing page linking to the careers page from the nav"""
+    return (
+        HEAD.format(title="Acme - Home", n=0, style="", script="")
+        + NAV
+        + '<main class="hero"><h1>We build things</h1><p>Acme makes tools for teams.</p>'
+        + '<a href="/about" class="btn">Learn more</a></main></body></html>'
+    )
+
+
+def iframe_host_page(board_src, ad_frames=3, ad_base="https://ads.example.net/slot"):
+    """Careers page whose listings live in an embedded ATS iframe among ad frames"""
+    ads = "".join(f'<iframe src="{ad_base}/{k}" width="300" height="250"></iframe>' for k in range(ad_frames))
+    return (
+        HEAD.format(title="Careers", n=0, style="", script="")
+        + NAV
+        + f'<main><h1>Join us</h1><p>See our open roles below.</p>{ads}<iframe id="ats-frame" src="{board_src}" width="100%" height="2000"></iframe></main></body></html>'
+    )
+
+
+# ATS API responses, in the shape each platform's public job board API returns
+
+def _description(j):
+    return "".join(f"<p>You will work on {j['team'].lower()} problem #{k} with a great team.</p>" for k in range(6))
+
+
+def greenhouse_board():
+    return {"name": "Acme Corp", "content": "<p>Work at Acme</p>"}
+
+
+def greenhouse_jobs(count, seed=0):
+    """GET /v1/boards/{token}/jobs?content=true"""
+    jobs = [job(i, seed) for i in range(count)]
+    return {"jobs": [{
+        "id": j["id"],
+        "internal_job_id": j["id"] * 7,
+        "title": j["title"],
+        "updated_at": f"{j['posted']}T09:30:00-04:00",
+        "first_published": f"{j['posted']}T09:00:00-04:00",
+        "requisition_id": f"R{j['id']}",
+        "location": {"name": j["location"]},
+        "absolute_url": f"https://boards.greenhouse.io/acme/jobs/{j['id']}",
+        "language": "en",
+        "metadata": [{"id": 1, "name": "Employment Type", "value": j["employment_type"].replace("_", " ").title(),
+                      "value_type": "single_select"}],
+        "content": html.escape(_description(j)),
+        "departments": [{"id": 3, "name": j["team"], "child_ids": [], "parent_id": None}],
+        "offices": [{"id": 4, "name": j["location"], "location": j["location"], "child_ids": [], "parent_id": None}],
+    } for j in jobs], "meta": {"total": count}}
+
+
+def lever_postings(count, seed=0):
+    """GET /v0/postings/{company}?mode=json"""
+    return [{
+        "id": f"0f3c{j['id']:08d}-aaaa-bbbb-cccc-000000000000",
+        "text": j["title"],
+        "createdAt": 1767000000000 + j["id"] * 3600000,
+        "categories": {"commitment": j["employment_type"].replace("_", " ").title(), "department": j["team"],
+                       "location": j["location"], "team": j["team"], "allLocations": [j["location"]]},
+        "country": "DE",
+        "description": _description(j),
+        "descriptionPlain": html_to_plain(_description(j)),
+        "lists": [{"text": "Requirements", "content": "<li>3+ years of relevant experience</li><li>Clear communication</li>"},
+                  {"text": "Benefits", "content": "<li>Remote friendly</li><li>Learning budget</li>"}],
+        "additional": "<p>We value diversity.</p>",
+        "additionalPlain": "We value diversity.",
+        "salaryRange": {"currency": "USD", "interval": "per-year-salary", "min": j["salary"], "max": j["salary"] + 20000},
+        "hostedUrl": f"https://jobs.lever.co/acme/0f3c{j['id']:08d}-aaaa-bbbb-cccc-000000000000",
+        "applyUrl": f"https://jobs.lever.co/acme/0f3c{j['id']:08d}-aaaa-bbbb-cccc-000000000000/apply",
+        "workplaceType": "hybrid",
+    } for j in (job(i, seed) for i in range(count))]
+
+
+def _workday_path(j):
+    return f"/job/{j['location'].split(',')[0]}/{j['title'].replace(' ', '-')}_R{j['id']}"
+
+
+def workday_jobs(count, offset, limit, search_text="", seed=0):
+    """POST /wday/cxs/{tenant}/{site}/jobs; like Workday, only the first page has the total"""
+    words = search_text.lower().split()
+    matching = [j for j in (job(i, seed) for i in range(count)) if all(w in j["title"].lower() for w in words)]
+    return {
+        "total": len(matching) if offset == 0 else 0,
+        "jobPostings": [{
+            "title": j["title"],
+            "externalPath": _workday_path(j),
+            "locationsText": j["location"],
+            "postedOn": "Posted 3 Days Ago",
+            "bulletFields": [f"R{j['id']}"],
+        } for j in matching[offset:offset + limit]],
+        "facets": [],
+    }
+
+
+def workday_posting(i, site_url, seed=0):
+    """GET /wday/cxs/{tenant}/{site}/job/..."""
+    j = job(i, seed)
+    return {
+        "jobPostingInfo": {
+            "id": f"{j['id']:x}", "title": j["title"], "jobDescription": _description(j),
+            "location": j["location"], "postedOn": "Posted 3 Days Ago", "startDate": j["posted"],
+            "timeType": j["employment_type"].replace("_", " ").title(), "jobReqId": f"R{j['id']}",
+            "externalUrl": f"{site_url}{_workday_path(j)}", "canApply": True,
+        },
+        "hiringOrganization": {"name": "Acme Corp", "url": ""},
+        "similarJobs": [],
+    }
+
+
+def smartrecruiters_postings(count, offset, limit, q="", seed=0):
+    """GET /v1/companies/{company}/postings"""
+    words = q.lower().split()
+    matching = [j for j in (job(i, seed) for i in range(count)) if all(w in j["title"].lower() for w in words)]
+    return {
+        "offset": offset, "limit": limit, "totalFound": len(matching),
+        "content": [_smartrecruiters_summary(j) for j in matching[offset:offset + limit]],
+    }
+
+
+def _smartrecruiters_summary(j):
+    city, _, country = j["location"].partition(", ")
+    return {
+        "id": str(744000000000000 + j["id"]),
+        "name": j["title"],
+        "uuid": f"uuid-{j['id']}",
+        "refNumber": f"REF{j['id']}",
+        "company": {"identifier": "Acme1", "name": "Acme Corp"},
+        "releasedDate": f"{j['posted']}T08:00:00.000Z",
+        "location": {"city": city, "country": country.lower()[:2] or None, "remote": j["location"] == "Remote"},
+        "typeOfEmployment": {"label": j["employment_type"].replace("_", " ").title()},
+        "department": {"label": j["team"]},
+    }
+
+
+def smartrecruiters_posting(posting_id, seed=0):
+    """GET /v1/companies/{company}/postings/{id}"""
+    j = job(int(posting_id) - 744000000000000 - 10000, seed)
+    return {
+        **_smartrecruiters_summary(j),
+        "postingUrl": f"https://jobs.smartrecruiters.com/Acme1/{posting_id}",
+        "applyUrl": f"https://jobs.smartrecruiters.com/Acme1/{posting_id}?oga=true",
+        "jobAd": {"sections": {
+            "companyDescription": {"title": "Company Description", "text": "<p>Acme makes tools.</p>"},
+            "jobDescription": {"title": "Job Description", "text": _description(j)},
+            "qualifications": {"title": "Qualifications", "text": "<ul><li>3+ years of relevant experience</li></ul>"},
+            "additionalInformation": {"title": "Additional Information", "text": "<p>Hybrid work.</p>"},
+        }},
+    }
+
+
+def html_to_plain(fragment):
+    return " ".join(re.sub(r"<[^>]+>", " ", fragment).split())
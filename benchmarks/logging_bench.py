@@ -0,0 +1,129 @@
+"""
+Logging benchmark - cost on the event loop of the old per-character console
+handler versus the queue pipeline in utils.logger.
+
+    python -m benchmarks.logging_bench [--records 5000] [--size 500]
+
+Both setups log the same records from coroutines on one event loop while a
+ticker measures how late the loop wakes up. Console output goes to a temp
+file; on a real terminal the per-character writes of the old handler are
+slower still.
+"""
+
+import os
+import time
+import queue
+import asyncio
+import logging
+import argparse
+import tempfile
+from statistics import mean
+
+from utils.logger import (
+    ColorFormatter, BatchFileHandler, BatchStreamHandler, CappedQueueHandler, _Listener, LEVEL_COLORS, COLORS
+)
+
+FILE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+CONSOLE_FORMAT = "%(levelname)s - %(name)s - %(message)s"
+
+
+class LegacyColorFormatter(logging.Formatter):
+    """Previous formatter, colors the shared record in place"""
+
+    def format(self, record):
+        level_color = LEVEL_COLORS.get(record.levelno, COLORS["WHITE"])
+        record.levelname = f"{level_color}{record.levelname}{COLORS['RESET']}"
+        record.name = f"{COLORS['BLUE']}{record.name}{COLORS['RESET']}"
+        record.msg = f"{COLORS['WHITE']}{record.getMessage()}{COLORS['RESET']}"
+        return super().format(record)
+
+
+class LegacyStreamingHandler(logging.StreamHandler):
+    """Previous console handler, one write and flush per character"""
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+            for char in msg + self.terminator:
+                self.stream.write(char)
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+def legacy_logger(work_dir, console):
+    logger = logging.getLogger("bench.legacy")
+    file_handler = logging.FileHandler(os.path.join(work_dir, "legacy.log"), encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+    console_handler = LegacyStreamingHandler(console)
+    console_handler.setFormatter(LegacyColorFormatter(CONSOLE_FORMAT))
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    return logger, lambda: None
+
+
+def queued_logger(work_dir, console):
+    logger = logging.getLogger("bench.queued")
+    file_handler = BatchFileHandler(os.path.join(work_dir, "queued.log"), encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+    console_handler = BatchStreamHandler(console)
+    console_handler.setFormatter(ColorFormatter(CONSOLE_FORMAT))
+    log_queue = queue.SimpleQueue()
+    listener = _Listener(log_queue, [console_handler, file_handler])
+    logger.addHandler(CappedQueueHandler(log_queue))
+    return logger, listener.stop
+
+
+async def measure(logger, records, size) -> dict:
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        interval = 0.001
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    async def producer(worker, count):
+        payload = "x" * size
+        for i in range(count):
+            logger.info(f"worker {worker} record {i}: {payload}")
+            if i % 50 == 0:
+                await asyncio.sleep(0)
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(producer(w, records // 4) for w in range(4)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+
+    lags.sort()
+    return {
+        "us_per_record": elapsed / records * 1e6,
+        "lag_mean_ms": mean(lags) * 1000 if lags else 0.0,
+        "lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+def run(records, size):
+    work_dir = tempfile.mkdtemp(prefix="logging_bench_")
+    print(f"{'handler':<10}{'us/record':>11}{'loop lag ms':>13}{'max lag ms':>12}")
+    for name, build in (("legacy", legacy_logger), ("queued", queued_logger)):
+        with open(os.path.join(work_dir, f"{name}.console"), "w", encoding="utf-8") as console:
+            logger, stop = build(work_dir, console)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            result = asyncio.run(measure(logger, records, size))
+            stop()
+        print(f"{name:<10}{result['us_per_record']:>11.1f}{result['lag_mean_ms']:>13.2f}"
+              f"{result['lag_max_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=500, help="characters of payload per record")
+    args = parser.parse_args()
+    run(args.records, args.size)
@@ -4,35 +4,42 @@ Universal Job Scraper - Pure OpenAI Agents SDK
 ZERO hardcoded selectors or patterns
 """
 
+import argparse
 import asyncio
 import json
 import os
+import re
 from dotenv import load_dotenv
-from agents import Agent, Runner
+from agents import Agent, Runner, set_default_openai_client
+from pure_agents.openai_client import get_client, close_client
 from pure_agents.orchestrator import create_orchestrator_agent
+from pure_agents.pipeline import JobPipeline, PipelineError
 from pure_agents.tools import BrowserTool, LLMAnalysisTool
+from pure_agents.route_cache import get_route_cache, describe_route, company_key
+from pure_agents.posting_store import get_posting_store
+from pure_agents.checkpoint import RunState
 from utils.logger import setup_logger
+from utils.tracing import get_tracer, start_trace, summary_path
 import time
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
-from openai import RateLimitError
 
 load_dotenv()
 logger = setup_logger(__name__)
 
+SCRAPE_MODES = ("agent", "pipeline")
 
-# Add retry decorator for rate limits
-def with_rate_limit_handling(func):
-    return retry(
-        wait=wait_exponential(multiplier=1, min=4, max=60),
-        stop=stop_after_attempt(5),
-        retry=retry_if_exception_type(RateLimitError),
-        reraise=True
-    )(func)
 
 class UniversalJobScraper:
-    def __init__(self):
-        self.browser_tool = None
-        self.llm_tool = None
+    def __init__(self, browser_tool=None, llm_tool=None, profile=None, mode=None):
+        # A browser_tool passed in (e.g. a batch session) is owned by the caller
+        self.browser_tool = browser_tool
+        self.llm_tool = llm_tool
+        self.owns_browser = browser_tool is None
+        self.profile = profile
+        # "agent": the orchestrator agent runs every step; "pipeline": the steps run
+        # as code and the agent only takes over when one of them fails
+        self.mode = mode or os.getenv("SCRAPE_MODE", "agent")
+        if self.mode not in SCRAPE_MODES:
+            raise ValueError(f"Unknown mode '{self.mode}', use one of {', '.join(SCRAPE_MODES)}")
         self.orchestrator = None
         # self.runner = None
         
@@ -40,11 +47,16 @@ class UniversalJobScraper:
         """Initialize pure agent system"""
         logger.info("Initializing AI Job Scraper with Pure Agents")
         
+        # Agent and tools share one pooled OpenAI client
+        set_default_openai_client(get_client())
+        
         # Initialize tools
-        self.browser_tool = BrowserTool()
-        self.llm_tool = LLMAnalysisTool()
+        if self.llm_tool is None:
+            self.llm_tool = LLMAnalysisTool()
         
-        await self.browser_tool.initialize()
+        if self.browser_tool is None:
+            self.browser_tool = BrowserTool(profile=self.profile)
+            await self.browser_tool.initialize()
         
         # Create orchestrator agent
         self.orchestrator = create_orchestrator_agent(
@@ -84,16 +96,9 @@ class UniversalJobScraper:
             "location": location if location else None
         }
         
-    async def scrape_jobs(self, job_params):
-        """Scrape jobs with rate limit handling"""
-        logger.info(f"Starting universal scrape: {job_params}")
-        
-        max_retries = 3
-        retry_delay = 3  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                initial_message = f"""
+    def build_message(self, job_params, route=None):
+        """Initial agent message, pointing straight at the listings when the route is known"""
+        message = f"""
     I need to scrape job information:
     - Job Title: {job_params['job_title']}
     - Company: {job_params.get('company_name') or job_params.get('company_domain')}
@@ -101,49 +106,303 @@ class UniversalJobScraper:
 
     Find ALL matching jobs. Extract complete information.
     """
-                
-                result = await Runner.run(self.orchestrator, initial_message, max_turns=50)
-    
-                final_output = result.final_output if hasattr(result, 'final_output') else str(result)
-                
-                try:
-                    parsed_result = json.loads(final_output)
-                except:
-                    parsed_result = final_output
-                
-                output = {
-                    "success": True,
-                    "job_params": job_params,
-                    "result": parsed_result  # Now properly parsed
-                }
-                
-                with open("output.json", "w", encoding="utf-8") as f:
-                    json.dump(output, f, indent=2, ensure_ascii=False)
-                    
-                logger.info("Scraping completed")
-                return output
-                
+        if route:
+            message += f"""
+    The listings page for this company is already known. SKIP Steps 1-3 and do this instead:
+{describe_route(route, job_params['job_title'])}
+    Then continue from STEP 4.
+    """
+        return message
+        
+    async def resume_from_checkpoint(self, job_params, state):
+        """Scrape only the job URLs the checkpoint still lists as pending"""
+        remaining = state.checkpoint.remaining()
+        logger.info(f"Resuming from checkpoint: {len(remaining)} jobs left "
+                    f"(listing: {state.checkpoint.listing_url})")
+        await self.browser_tool.scrape_details(remaining, self.llm_tool)
+        jobs = [r for r in state.sink.records() if "error" not in r]
+        return {"jobs": jobs, "total_found": len(jobs), "search_query": job_params["job_title"]}
+        
+    async def run_pipeline(self, job_params, route=None):
+        """Steps 1-6 as code; None when a step failed and the agent has to take over"""
+        async with get_tracer().span("pipeline", kind="pipeline", query=job_params["job_title"]):
+            try:
+                return await JobPipeline(self.browser_tool, self.llm_tool).run(job_params, route)
+            except PipelineError as e:
+                logger.warning(f"Pipeline stopped at {e.step} ({str(e)}), handing over to the agent")
             except Exception as e:
-                error_msg = str(e)
+                logger.warning(f"Pipeline failed ({type(e).__name__}: {str(e)}), handing over to the agent")
+        # The agent starts at STEP 1, not inside whatever frame the pipeline entered
+        self.browser_tool.leave_frames()
+        return None
+        
+    async def run_agent(self, job_params, route=None):
+        """Let the orchestrator agent work through the algorithm; returns its parsed final output"""
+        initial_message = self.build_message(job_params, route)
+        
+        tracer = get_tracer()
+        started = time.perf_counter()
+        async with tracer.span("orchestrator", kind="agent", query=job_params["job_title"]):
+            result = await Runner.run(self.orchestrator, initial_message, max_turns=50)
+            # The agent's own model calls, outside any tool span
+            usage = result.context_wrapper.usage
+            tracer.record("agent_turns", "openai", wall=time.perf_counter() - started,
+                          prompt_tokens=usage.input_tokens,
+                          completion_tokens=usage.output_tokens)
+
+        final_output = result.final_output if hasattr(result, 'final_output') else str(result)
+        
+        try:
+            return json.loads(final_output)
+        except:
+            return final_output
+        
+    async def scrape_jobs(self, job_params, output_path="output.json", use_cached_route=True, resume=True,
+                          on_record=None):
+        """
+        Scrape jobs, resuming from the checkpoint of an interrupted run.
+        on_record(record) is awaited for each job record as it is extracted.
+        """
+        logger.info(f"Starting universal scrape: {job_params}")
+        
+        # Jobs stream to <output>.ndjson; <output>.checkpoint.json allows resuming the same query
+        scope = f"{company_key(job_params)}|{job_params['job_title'].lower()}"
+        state = RunState(output_path, scope)
+        if not (resume and state.can_resume()):
+            if state.checkpoint.pending and state.checkpoint.scope != scope:
+                logger.info(f"Discarding checkpoint of another query ({state.checkpoint.scope})")
+            state.start_fresh()
+        if on_record is not None:
+            state.sink.subscribers.append(on_record)
+        
+        # Postings already extracted by an earlier crawl of this query are reused when unchanged
+        store = get_posting_store()
+        postings = store.start_run(scope) if store else None
+        self.browser_tool.postings = postings
+        self.browser_tool.run_state = state
+        self.browser_tool.on_links = state.add_links
+        self.browser_tool.job_title = job_params["job_title"]
+        
+        routes = get_route_cache()
+        route = routes.get(job_params) if use_cached_route else None
+        if route:
+            logger.info(f"Using cached route: {route.get('access_method')} at {route.get('listing_url')}")
+        self.browser_tool.leave_frames()
+        
+        try:
+            if state.can_resume():
+                state.start_resume()
+                parsed_result = await self.resume_from_checkpoint(job_params, state)
+            else:
+                parsed_result = None
+                if self.mode == "pipeline":
+                    parsed_result = await self.run_pipeline(job_params, route)
+                if parsed_result is None:
+                    parsed_result = await self.run_agent(job_params, route)
+                
+                found = count_jobs(parsed_result) or len(state.sink.records())
+                if route and not found and not self.browser_tool.listing_links:
+                    # The listing URL or access method no longer leads to any jobs; a listing
+                    # that is reached but has no match for the title keeps its route
+                    logger.warning("Cached route produced no listings, falling back to full discovery")
+                    routes.forget(job_params)
+                    self.browser_tool.leave_frames()
+                    return await self.scrape_jobs(job_params, output_path, use_cached_route=False, resume=False,
+                                                  on_record=on_record)
+                if found and self.browser_tool.route:
+                    routes.save(job_params, self.browser_tool.route)
+            
+            parsed_result = merge_streamed(parsed_result, state.sink.records(), job_params)
+            if not state.finish():
+                logger.warning(f"{len(state.checkpoint.remaining())} jobs failed, the next run of this query "
+                               f"resumes them")
+            
+            output = {
+                "success": True,
+                "job_params": job_params,
+                "result": parsed_result  # Now properly parsed
+            }
+            if postings:
+                # A resumed run only scrapes the leftovers; the rest of the listing the
+                # interrupted run harvested is still there and must not count as removed
+                postings.seen.update(state.checkpoint.pending)
+                # New, changed and removed postings since the previous crawl
+                output["changes"] = postings.finish()
+            
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
                 
-                if "rate_limit" in error_msg.lower() or "429" in error_msg:
-                    wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                    logger.warning(f"Rate limit hit. Waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    await asyncio.sleep(wait_time)
-                    
-                    if attempt == max_retries - 1:
-                        raise Exception("Rate limit exceeded after all retries")
-                else:
-                    logger.error(f"Scraping failed: {error_msg}")
-                    raise
+            logger.info("Scraping completed")
+            return output
+            
+        except Exception as e:
+            # Rate limits are retried per request in the OpenAI transport; anything
+            # reaching here is final, and the checkpoint lets the next run resume
+            logger.error(f"Scraping failed: {str(e)}")
+            raise
             
     async def cleanup(self):
         """Cleanup resources"""
-        if self.browser_tool:
+        if self.browser_tool and self.owns_browser:
             await self.browser_tool.cleanup()
+            await close_client()
+
+
+def count_jobs(result):
+    """Number of jobs in the agent's final output, 0 if it isn't the expected JSON"""
+    if isinstance(result, dict) and isinstance(result.get("jobs"), list):
+        return len(result["jobs"])
+    return 0
+
+
+def merge_streamed(result, records, job_params):
+    """Add streamed job records the agent's final answer left out"""
+    records = [r for r in records if "error" not in r]
+    if not records:
+        return result
+    if not isinstance(result, dict) or not isinstance(result.get("jobs"), list):
+        return {"jobs": records, "total_found": len(records),
+                "search_query": job_params["job_title"], "agent_output": result}
+    known = {job.get("url") for job in result["jobs"] if isinstance(job, dict)}
+    missing = [r for r in records if r.get("url") not in known]
+    if missing:
+        result["jobs"].extend(missing)
+        result["total_found"] = len(result["jobs"])
+    return result
+
+
+def parse_query(query):
+    """Job params from a query dict with the same keys as get_user_input"""
+    if not query.get("job_title") or not (query.get("company_name") or query.get("company_domain")):
+        raise ValueError("needs job_title and company_name or company_domain")
+    return {
+        "job_title": query["job_title"],
+        "company_name": query.get("company_name"),
+        "company_domain": query.get("company_domain"),
+        "location": query.get("location")
+    }
+
+
+def load_batch(path):
+    """Read one query per JSONL line"""
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                queries.append(parse_query(json.loads(line)))
+            except ValueError as e:
+                logger.warning(f"Skipping line {line_no}: {str(e)}")
+    return queries
+
+
+def query_output_path(output_dir, index, job_params):
+    """Per-query output file, e.g. outputs/0003_acme_data-engineer.json"""
+    company = job_params.get("company_name") or job_params.get("company_domain")
+    slug = re.sub(r"[^a-z0-9]+", "-", f"{company}_{job_params['job_title']}".lower()).strip("-")
+    return os.path.join(output_dir, f"{index:04d}_{slug[:80]}.json")
+
+
+async def run_batch(path, concurrency=3, output_dir="outputs", profile="production", mode=None):
+    """Run every query in a JSONL file over one warm browser, each in its own context"""
+    queries = load_batch(path)
+    os.makedirs(output_dir, exist_ok=True)
+    logger.info(f"Batch: {len(queries)} queries from {path}, {concurrency} at a time")
+    
+    browser_tool = BrowserTool(profile=profile)
+    await browser_tool.initialize()
+    llm_tool = LLMAnalysisTool()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run_query(index, job_params):
+        output_path = query_output_path(output_dir, index, job_params)
+        async with semaphore:
+            session = await browser_tool.new_session()
+            scraper = UniversalJobScraper(browser_tool=session, llm_tool=llm_tool, mode=mode)
+            try:
+                await scraper.initialize()
+                await scraper.scrape_jobs(job_params, output_path=output_path)
+                return {"job_params": job_params, "success": True, "output": output_path}
+            except Exception as e:
+                logger.error(f"Batch query {index} failed: {str(e)}")
+                with open(output_path, "w", encoding="utf-8") as f:
+                    json.dump({"success": False, "job_params": job_params, "error": str(e)},
+                              f, indent=2, ensure_ascii=False)
+                return {"job_params": job_params, "success": False, "output": output_path, "error": str(e)}
+            finally:
+                await session.cleanup()
+    
+    try:
+        summary = await asyncio.gather(*(run_query(i, q) for i, q in enumerate(queries)))
+    finally:
+        await browser_tool.cleanup()
+        await close_client()
+    
+    with open(os.path.join(output_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    
+    succeeded = sum(1 for r in summary if r["success"])
+    print(f"\nBatch finished: {succeeded}/{len(summary)} succeeded. Results in {output_dir}/")
+    return summary
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AI Job Scraper")
+    parser.add_argument("--batch", metavar="QUERIES_JSONL",
+                        help="run non-interactively over a JSONL file of queries")
+    parser.add_argument("--concurrency", type=int, default=3,
+                        help="queries run at once in batch mode")
+    parser.add_argument("--output-dir", default="outputs",
+                        help="directory for per-query results in batch and service mode")
+    parser.add_argument("--profile", choices=["debug", "production"],
+                        help="browser launch profile (default: BROWSER_PROFILE, else debug "
+                             "interactively and production in batch mode)")
+    parser.add_argument("--mode", choices=SCRAPE_MODES,
+                        help="agent: the orchestrator agent runs every step; pipeline: the steps run as "
+                             "code with the agent as fallback (default: SCRAPE_MODE, else agent)")
+    parser.add_argument("--serve", action="store_true",
+                        help="run as an HTTP scrape service instead of prompting (see service.py)")
+    parser.add_argument("--host", default="127.0.0.1", help="service listen address")
+    parser.add_argument("--port", type=int, default=8080, help="service port")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="warm browser workers in service mode")
+    parser.add_argument("--trace-summary", choices=["json", "prometheus"],
+                        help="also write a per-span summary next to the trace file in TRACE_DIR")
+    return parser.parse_args()
+
+
+def finish_trace(fmt=None):
+    tracer = get_tracer()
+    tracer.log_summary()
+    if fmt:
+        tracer.write_summary(summary_path(tracer, fmt), fmt)
+
 
 async def main():
-    scraper = UniversalJobScraper()
+    args = parse_args()
+    # Spans for every tool and OpenAI call go to traces/trace_<timestamp>.ndjson
+    start_trace()
+    if args.serve:
+        # Imported here, service.py builds on this module
+        from service import run_service
+        try:
+            await run_service(host=args.host, port=args.port, workers=args.workers,
+                              profile=args.profile or os.getenv("BROWSER_PROFILE", "production"),
+                              output_dir=args.output_dir, mode=args.mode)
+        finally:
+            finish_trace(args.trace_summary)
+        return
+    if args.batch:
+        try:
+            await run_batch(args.batch, concurrency=args.concurrency, output_dir=args.output_dir,
+                            profile=args.profile or os.getenv("BROWSER_PROFILE", "production"), mode=args.mode)
+        finally:
+            finish_trace(args.trace_summary)
+        return
+    
+    scraper = UniversalJobScraper(profile=args.profile, mode=args.mode)
     
     try:
         await scraper.initialize()
@@ -174,6 +433,7 @@ async def main():
         
     finally:
         await scraper.cleanup()
+        finish_trace(args.trace_summary)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
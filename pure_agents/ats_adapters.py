@@ -0,0 +1,404 @@
+"""
+ATS Adapters - job boards of applicant tracking systems read through their JSON APIs
+Greenhouse, Lever, Workday and SmartRecruiters serve listings and postings as
+JSON. When the scraper lands on one of their boards, directly or embedded in
+an iframe, the whole board is pulled through the API in bulk and mapped onto
+the job schema, without rendering pages or asking the LLM.
+"""
+
+import os
+import re
+import html
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, quote, urlparse
+
+import aiohttp
+
+from utils.logger import setup_logger
+from utils.tracing import get_tracer
+from .structured_data import html_to_text
+
+logger = setup_logger(__name__)
+
+ENABLED = os.getenv("ATS_ADAPTERS", "1") != "0"
+ATS_TIMEOUT = float(os.getenv("ATS_TIMEOUT", "20"))
+ATS_CONCURRENCY = int(os.getenv("ATS_CONCURRENCY", "8"))
+# Upper bound of postings read from one board
+MAX_POSTINGS = int(os.getenv("ATS_MAX_POSTINGS", "2000"))
+
+GREENHOUSE_API = os.getenv("GREENHOUSE_API", "https://boards-api.greenhouse.io/v1/boards")
+LEVER_API = os.getenv("LEVER_API", "https://api.lever.co/v0/postings")
+LEVER_EU_API = os.getenv("LEVER_EU_API", "https://api.eu.lever.co/v0/postings")
+SMARTRECRUITERS_API = os.getenv("SMARTRECRUITERS_API", "https://api.smartrecruiters.com/v1/companies")
+
+# Postings per listing request for the APIs that page
+WORKDAY_PAGE_SIZE = 20
+SMARTRECRUITERS_PAGE_SIZE = 100
+
+# Lever lists and SmartRecruiters sections that hold the requirements
+REQUIREMENT_HEADINGS = re.compile(
+    r"requirement|qualification|what you.{0,20}(bring|need|have)|you have|skills|profile|about you",
+    re.IGNORECASE
+)
+
+
+def title_matches(title: str, job_title: str) -> bool:
+    """Every word of the searched title starts a word of the posting title"""
+    have = re.findall(r"\w+", (title or "").lower())
+    return all(any(h.startswith(w) for h in have) for w in re.findall(r"\w+", job_title.lower()))
+
+
+def _date(value):
+    """ISO date from an ISO timestamp or epoch milliseconds"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).date().isoformat()
+    if isinstance(value, str) and re.match(r"\d{4}-\d{2}-\d{2}", value):
+        return value[:10]
+    return value or None
+
+
+def _record(**fields) -> dict:
+    """Job record with every schema field present"""
+    record = {f: None for f in ("title", "company", "location", "description", "requirements",
+                                "salary", "employment_type", "posted_date", "url")}
+    record.update(fields)
+    return record
+
+
+class AtsClient:
+    """Pooled JSON client shared by the adapters"""
+
+    def __init__(self):
+        self.session = None
+        self._semaphore = None
+        self.requests = 0
+
+    async def _request(self, method: str, url: str, **kwargs):
+        # Created lazily so session and semaphore belong to the running loop
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=ATS_CONCURRENCY, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=ATS_TIMEOUT),
+                headers={"Accept": "application/json"}
+            )
+            self._semaphore = asyncio.Semaphore(ATS_CONCURRENCY)
+        async with self._semaphore:
+            self.requests += 1
+            async with self.session.request(method, url, **kwargs) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    async def get_json(self, url: str, params: dict = None):
+        return await self._request("GET", url, params=params)
+
+    async def post_json(self, url: str, body: dict):
+        return await self._request("POST", url, json=body)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+        self.session = None
+        self._semaphore = None
+
+
+@dataclass
+class AtsBoard(ABC):
+    """One company's board on one platform"""
+    platform: str
+    token: str
+    # Board page the scraper came across
+    url: str
+    # API root for this board
+    api: str
+    # Public board page, for building posting URLs
+    site: str = None
+
+    @abstractmethod
+    async def fetch(self, client: AtsClient, job_title: str) -> tuple:
+        """(postings on the board, records of those matching job_title)"""
+
+
+@dataclass
+class AtsResult:
+    board: AtsBoard
+    total: int
+    records: list = field(default_factory=list)
+
+
+class GreenhouseBoard(AtsBoard):
+    HOSTS = re.compile(r"^(boards|job-boards)(\.eu)?\.greenhouse\.io$")
+
+    @classmethod
+    def from_url(cls, url: str):
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        if host.startswith("boards-api") and host.endswith("greenhouse.io"):
+            match = re.match(r"/v1/boards/([\w-]+)", parsed.path)
+            token = match and match.group(1)
+        elif cls.HOSTS.match(host):
+            # Embeds name the board in ?for=, hosted boards in the first path segment
+            token = (parse_qs(parsed.query).get("for") or [None])[0]
+            if not token:
+                segments = [s for s in parsed.path.split("/") if s]
+                token = segments[0] if segments and segments[0] != "embed" else None
+        else:
+            return None
+        return cls("Greenhouse", token, url, f"{GREENHOUSE_API}/{token}") if token else None
+
+    async def fetch(self, client, job_title):
+        data, board = await asyncio.gather(
+            client.get_json(f"{self.api}/jobs", {"content": "true"}),
+            client.get_json(self.api),
+            return_exceptions=True
+        )
+        if isinstance(data, Exception):
+            raise data
+        company = board.get("name") if isinstance(board, dict) else None
+        jobs = data.get("jobs") or []
+        records = []
+        for job in jobs[:MAX_POSTINGS]:
+            if not title_matches(job.get("title"), job_title):
+                continue
+            metadata = {str(m.get("name", "")).lower(): m.get("value") for m in job.get("metadata") or []}
+            employment_type = next((v for k, v in metadata.items() if "employment" in k or "time type" in k), None)
+            records.append(_record(
+                title=job.get("title"),
+                company=job.get("company_name") or company,
+                location=(job.get("location") or {}).get("name"),
+                # Greenhouse returns the job content HTML-escaped
+                description=html_to_text(html.unescape(job.get("content") or "")),
+                employment_type=employment_type if isinstance(employment_type, str) else None,
+                posted_date=_date(job.get("first_published") or job.get("updated_at")),
+                url=job.get("absolute_url"),
+            ))
+        return len(jobs), records
+
+
+class LeverBoard(AtsBoard):
+    HOSTS = re.compile(r"^jobs(\.eu)?\.lever\.co$")
+
+    @classmethod
+    def from_url(cls, url: str):
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        match = cls.HOSTS.match(host)
+        segments = [s for s in parsed.path.split("/") if s]
+        if not match or not segments:
+            return None
+        api = LEVER_EU_API if match.group(1) else LEVER_API
+        return cls("Lever", segments[0], url, f"{api}/{segments[0]}")
+
+    async def fetch(self, client, job_title):
+        postings = await client.get_json(self.api, {"mode": "json"})
+        records = []
+        for posting in postings[:MAX_POSTINGS]:
+            if not title_matches(posting.get("text"), job_title):
+                continue
+            categories = posting.get("categories") or {}
+            lists = posting.get("lists") or []
+            requirements = [item for item in lists if REQUIREMENT_HEADINGS.search(item.get("text", ""))]
+            other = [item for item in lists if item not in requirements]
+            description = " ".join(filter(None, [
+                posting.get("descriptionPlain") or html_to_text(posting.get("description")),
+                *(f"{item.get('text')}: {html_to_text(item.get('content'))}" for item in other),
+                posting.get("additionalPlain"),
+            ]))
+            salary = posting.get("salaryRange") or {}
+            records.append(_record(
+                title=posting.get("text"),
+                location=categories.get("location") or ", ".join(categories.get("allLocations") or []) or None,
+                description=" ".join(description.split()) or None,
+                requirements=html_to_text(" ".join(item.get("content", "") for item in requirements)),
+                salary=(f"{salary.get('min')}-{salary.get('max')} {salary.get('currency') or ''} "
+                        f"{salary.get('interval') or ''}".strip() if salary.get("min") else None),
+                employment_type=categories.get("commitment"),
+                posted_date=_date(posting.get("createdAt")),
+                url=posting.get("hostedUrl"),
+            ))
+        return len(postings), records
+
+
+class WorkdayBoard(AtsBoard):
+    HOSTS = re.compile(r"^([\w-]+)\.(wd\d+\.)?(myworkdayjobs|myworkdaysite)\.com$")
+    LANGUAGE = re.compile(r"^[a-z]{2}-[A-Z]{2}$")
+
+    @classmethod
+    def from_url(cls, url: str):
+        parsed = urlparse(url)
+        match = cls.HOSTS.match(parsed.netloc.lower())
+        if not match:
+            return None
+        segments = [s for s in parsed.path.split("/") if s]
+        prefix = []
+        if segments and cls.LANGUAGE.match(segments[0]):
+            prefix.append(segments.pop(0))
+        # myworkdaysite.com boards live under /recruiting/<tenant>/<site>
+        tenant = match.group(1)
+        if len(segments) >= 3 and segments[0] == "recruiting":
+            prefix.extend(segments[:2])
+            tenant, segments = segments[1], segments[2:]
+        if not segments or segments[0] in ("wday", "job"):
+            return None
+        site = segments[0]
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        return cls("Workday", f"{tenant}/{site}", url, f"{origin}/wday/cxs/{tenant}/{site}",
+                   site="/".join([origin, *prefix, site]))
+
+    async def fetch(self, client, job_title):
+        def page(offset):
+            return client.post_json(f"{self.api}/jobs", {
+                "appliedFacets": {}, "limit": WORKDAY_PAGE_SIZE, "offset": offset, "searchText": job_title
+            })
+
+        # Only the first page reliably carries the total
+        first = await page(0)
+        total = min(first.get("total") or 0, MAX_POSTINGS)
+        pages = await asyncio.gather(*(page(offset) for offset in range(WORKDAY_PAGE_SIZE, total, WORKDAY_PAGE_SIZE)))
+        listed = [p for data in (first, *pages) for p in data.get("jobPostings") or []]
+        matching = [p for p in listed if p.get("externalPath") and title_matches(p.get("title"), job_title)]
+
+        async def detail(posting):
+            try:
+                data = await client.get_json(f"{self.api}{posting['externalPath']}")
+            except Exception as e:
+                logger.warning(f"Workday posting {posting['externalPath']} failed: {str(e)}")
+                return _record(title=posting.get("title"), location=posting.get("locationsText"),
+                               url=f"{self.site}{posting['externalPath']}")
+            info = data.get("jobPostingInfo") or {}
+            locations = [info.get("location"), *(info.get("additionalLocations") or [])]
+            return _record(
+                title=info.get("title") or posting.get("title"),
+                company=(data.get("hiringOrganization") or {}).get("name"),
+                location="; ".join(l for l in locations if l) or posting.get("locationsText"),
+                description=html_to_text(info.get("jobDescription")),
+                employment_type=info.get("timeType"),
+                posted_date=_date(info.get("startDate")) or info.get("postedOn") or posting.get("postedOn"),
+                url=info.get("externalUrl") or f"{self.site}{posting['externalPath']}",
+            )
+
+        records = await asyncio.gather(*(detail(p) for p in matching))
+        return first.get("total") or len(listed), list(records)
+
+
+class SmartRecruitersBoard(AtsBoard):
+    HOSTS = re.compile(r"^(jobs|careers)\.smartrecruiters\.com$")
+
+    @classmethod
+    def from_url(cls, url: str):
+        parsed = urlparse(url)
+        segments = [s for s in parsed.path.split("/") if s]
+        if not cls.HOSTS.match(parsed.netloc.lower()) or not segments:
+            return None
+        company = segments[0]
+        return cls("SmartRecruiters", company, url, f"{SMARTRECRUITERS_API}/{quote(company)}",
+                   site=f"https://jobs.smartrecruiters.com/{company}")
+
+    async def fetch(self, client, job_title):
+        def page(offset):
+            return client.get_json(f"{self.api}/postings",
+                                   {"limit": SMARTRECRUITERS_PAGE_SIZE, "offset": offset, "q": job_title})
+
+        first = await page(0)
+        total = min(first.get("totalFound") or 0, MAX_POSTINGS)
+        pages = await asyncio.gather(*(page(offset) for offset in
+                                       range(SMARTRECRUITERS_PAGE_SIZE, total, SMARTRECRUITERS_PAGE_SIZE)))
+        listed = [p for data in (first, *pages) for p in data.get("content") or []]
+        matching = [p for p in listed if p.get("id") and title_matches(p.get("name"), job_title)]
+
+        async def detail(posting):
+            try:
+                data = await client.get_json(f"{self.api}/postings/{posting['id']}")
+            except Exception as e:
+                logger.warning(f"SmartRecruiters posting {posting['id']} failed: {str(e)}")
+                data = posting
+            sections = (data.get("jobAd") or {}).get("sections") or {}
+            location = data.get("location") or {}
+            place = ", ".join(p for p in (location.get("city"), location.get("region"), location.get("country")) if p)
+            if location.get("remote"):
+                place = f"{place}; Remote" if place else "Remote"
+            return _record(
+                title=data.get("name"),
+                company=(data.get("company") or {}).get("name"),
+                location=place or None,
+                description=html_to_text(" ".join(
+                    (sections.get(key) or {}).get("text") or ""
+                    for key in ("jobDescription", "additionalInformation")
+                )),
+                requirements=html_to_text((sections.get("qualifications") or {}).get("text")),
+                employment_type=(data.get("typeOfEmployment") or {}).get("label"),
+                posted_date=_date(data.get("releasedDate")),
+                url=data.get("postingUrl") or f"{self.site}/{posting['id']}",
+            )
+
+        records = await asyncio.gather(*(detail(p) for p in matching))
+        return first.get("totalFound") or len(listed), list(records)
+
+
+BOARD_TYPES = (GreenhouseBoard, LeverBoard, WorkdayBoard, SmartRecruitersBoard)
+
+
+def detect_board(url: str):
+    """AtsBoard for a URL on one of the supported platforms, else None"""
+    if not ENABLED or not url:
+        return None
+    for board_type in BOARD_TYPES:
+        try:
+            board = board_type.from_url(url)
+        except Exception:
+            board = None
+        if board is not None:
+            return board
+    return None
+
+
+class AtsReader:
+    def __init__(self, client: AtsClient = None):
+        self.client = client or AtsClient()
+        self.stats = {"boards": 0, "postings": 0, "failures": 0}
+
+    async def read(self, board: AtsBoard, job_title: str):
+        """AtsResult with the board's postings matching job_title, None if the API failed"""
+        async with get_tracer().span("ats_board", kind="fetch", platform=board.platform):
+            try:
+                total, records = await board.fetch(self.client, job_title)
+            except Exception as e:
+                self.stats["failures"] += 1
+                logger.warning(f"{board.platform} API for '{board.token}' failed, "
+                               f"falling back to the browser: {str(e)}")
+                return None
+        records = [r for r in records if r.get("url")]
+        self.stats["boards"] += 1
+        self.stats["postings"] += len(records)
+        logger.info(f"{board.platform} board '{board.token}': {len(records)} of {total} postings "
+                    f"match '{job_title}'")
+        return AtsResult(board=board, total=total, records=records)
+
+    def log_stats(self):
+        if any(self.stats.values()):
+            logger.info(f"ATS adapters: {self.stats['boards']} boards read through their API, "
+                        f"{self.stats['postings']} postings, {self.stats['failures']} failed "
+                        f"({self.client.requests} requests)")
+
+    async def close(self):
+        await self.client.close()
+
+
+_reader = None
+
+
+def get_ats_reader() -> AtsReader:
+    global _reader
+    if _reader is None:
+        _reader = AtsReader()
+    return _reader
+
+
+async def close_ats_reader():
+    global _reader
+    if _reader is not None:
+        _reader.log_stats()
+        await _reader.close()
+    _reader = None
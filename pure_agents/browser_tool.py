@@ -2,166 +2,415 @@
 Browser Tool - Playwright interface for agents
 Tools that agents can call to control browser
 """
+import os
 import re
+import json
 import asyncio
+from urllib.parse import urljoin
 from playwright.async_api import async_playwright
 from agents import function_tool
 from utils.logger import setup_logger
+from utils import tracing
+from .html_cleaner import get_cleaner
+from .compact_dom import compact_page, compact_text
+from .ats_adapters import close_ats_reader, detect_board, get_ats_reader
+from .frame_scoring import CONFIDENT_SCORE, is_ats_host, score_frame
+from .model_routing import resolve_locally
+from .openai_client import chat_completion
+from .page_pool import PagePool
+from .harvester import LinkHarvester
+from .page_settle import SettleStats, track, wait_for_settle
+from .selector_cache import get_selector_cache
+from .static_fetch import close_fetcher, get_fetcher
+from .posting_store import close_posting_store, fingerprint, record_fingerprint
+from .route_cache import ACCESS_METHODS
+from .llm_tool import JOB_SCHEMA, parse_json_object
 
 logger = setup_logger(__name__)
 
+# Characters of compact page text handed to the agent
+PAGE_CONTENT_LIMIT = 40000
+
+# Iframes sent to the LLM classifier, best local score first
+IFRAME_CANDIDATES = 3
+IFRAME_CLASSIFY_CHARS = 6000
+
+ELEMENT_ID = re.compile(r"^\[?e\d+\]?$")
+
+# Launch profiles, selected with BrowserTool(profile=...) or BROWSER_PROFILE
+LAUNCH_PROFILES = {
+    # Visible, slowed-down browser for watching the agent work
+    "debug": {"headless": False, "slow_mo": 100, "block_resources": False},
+    # Headless, no delay, heavy resources and trackers never loaded
+    "production": {"headless": True, "slow_mo": 0, "block_resources": True},
+}
+
+# Never needed by the content cleaning, so not worth downloading
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "connect.facebook.com", "hotjar.com",
+    "segment.io", "segment.com", "mixpanel.com", "amplitude.com", "fullstory.com",
+    "newrelic.com", "nr-data.net", "adservice.google.com", "linkedin.com/px",
+    "bat.bing.com", "clarity.ms", "quantserve.com", "scorecardresearch.com",
+    "optimizely.com", "cookielaw.org", "onetrust.com",
+)
+
 class BrowserTool:
-    def __init__(self):
+    def __init__(self, detail_concurrency: int = None, profile: str = None):
+        self.profile = profile or os.getenv("BROWSER_PROFILE", "debug")
+        if self.profile not in LAUNCH_PROFILES:
+            raise ValueError(f"Unknown browser profile '{self.profile}', use one of {', '.join(LAUNCH_PROFILES)}")
+        self.blocked_hosts = BLOCKED_HOSTS
+        self.blocked_requests = 0
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
+        self.detail_concurrency = detail_concurrency or int(os.getenv("DETAIL_CONCURRENCY", "4"))
+        self.detail_pool = None
+        self.owns_browser = True
+        # How the listings were reached in this run, see route_cache
+        self.iframe_index = None
+        self.route = None
+        # [eN] ids from the last compact page -> CSS selectors
+        self.element_selectors = {}
+        self.settle_stats = SettleStats()
+        # Optional async callback receiving job links as they are harvested
+        self.on_links = None
+        # Streaming sink and checkpoint of the current scrape, see checkpoint.RunState
+        self.run_state = None
+        # Stored postings of the current query, see posting_store.PostingRun
+        self.postings = None
+        # Job title of the current scrape, for boards read through an ATS API
+        self.job_title = None
+        # Job-like links on the listing this run harvested, None before any was reached
+        self.listing_links = None
         
     async def initialize(self):
         """Start browser"""
-        logger.info("Initializing browser")
+        logger.info(f"Initializing browser ({self.profile} profile)")
+        settings = LAUNCH_PROFILES[self.profile]
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
-            headless=False,
-            slow_mo=100,
+            headless=settings["headless"],
+            slow_mo=settings["slow_mo"],
             args=['--no-sandbox']
         )
+        await self._open_context()
+        logger.info("Browser ready")
+
+    async def _open_context(self):
         self.context = await self.browser.new_context(
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             viewport={'width': 1600, 'height': 900}
         )
+        if LAUNCH_PROFILES[self.profile]["block_resources"]:
+            await self.context.route("**/*", self._filter_request)
         self.page = await self.context.new_page()
         self.page.set_default_timeout(30000)
-        logger.info("Browser ready")
+        track(self.page)
+
+    async def _filter_request(self, route):
+        """Abort images, fonts, media and known analytics/ad requests"""
+        request = route.request
+        url = request.url
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in url for host in self.blocked_hosts):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def settle(self, page=None) -> float:
+        """Wait for the page (default: current) to stop changing; returns seconds waited"""
+        return await wait_for_settle(page or self.page, stats=self.settle_stats)
+
+    async def new_session(self):
+        """
+        BrowserTool on the same running browser with its own isolated context.
+        Cleaning up a session closes only its context.
+        """
+        session = BrowserTool(detail_concurrency=self.detail_concurrency, profile=self.profile)
+        session.blocked_hosts = self.blocked_hosts
+        session.playwright = self.playwright
+        session.browser = self.browser
+        session.owns_browser = False
+        await session._open_context()
+        return session
+
+    async def reset_session(self):
+        """Fresh context and per-run state for the next scrape, keeping the browser running"""
+        if self.detail_pool:
+            await self.detail_pool.close()
+            self.detail_pool = None
+        if self.context:
+            await self.context.close()
+        self.iframe_index = None
+        self.route = None
+        self.element_selectors = {}
+        self.on_links = None
+        self.run_state = None
+        self.postings = None
+        self.job_title = None
+        self.listing_links = None
+        await self._open_context()
+
+    def leave_frames(self):
+        """Back on the top-level page with no route, so discovery can start over"""
+        # A Frame entered by the iframe tools knows the page it belongs to
+        top_page = getattr(self.page, "page", None)
+        if top_page is not None:
+            self.page = top_page
+        self.route = None
+        self.iframe_index = None
+        self.listing_links = None
         
+    async def navigate(self, url: str) -> str:
+        """Open url, or read it through its API when it is a known ATS board"""
+        if not url.startswith(('http://', 'https://')):
+            url = f"https://{url}"
+        # ATS boards are read through their API, no page needed
+        board_read = await self.read_ats_board(url)
+        if board_read:
+            return board_read
+        await self.page.goto(url, wait_until='domcontentloaded')
+        waited = await self.settle()
+        if self.page.url != url:
+            board_read = await self.read_ats_board(self.page.url, careers_url=url)
+            if board_read:
+                return board_read
+        return f"Navigated to {self.page.url} (settled in {waited:.1f}s)"
+
     def get_navigate_tool(self):
         @function_tool
         async def navigate_to_url(url: str) -> str:
             """Navigate browser to URL"""
             try:
-                if not url.startswith(('http://', 'https://')):
-                    url = f"https://{url}"
-                await self.page.goto(url, wait_until='domcontentloaded')
-                await asyncio.sleep(1)
-                return f"Navigated to {self.page.url}"
+                return await self.navigate(url)
             except Exception as e:
                 return f"Navigation failed: {str(e)}"
         return navigate_to_url
         
+    async def snapshot(self):
+        """Compact form of the current page; its [eN] ids can be passed to click/fill"""
+        page = compact_page(await self.page.content())
+        self.element_selectors = page.selectors
+        return page
+
     def get_content_tool(self):
         @function_tool
         async def get_page_content() -> str:
-            """Get current page HTML content"""
+            """Get current page content: visible text, [eN] interactive elements, links and folded job card lists"""
             try:
-                html = await self.page.content()
-                
-                # Clean HTML before returning
-                from bs4 import BeautifulSoup, Comment
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                for tag in soup(['script', 'style', 'head', 'meta', 'link', 'noscript', 'svg', 'path', 'img', 'video']):
-                    tag.decompose()
-                
-                cleaned = str(soup)[:25000]  # Now can use larger limit since it's cleaner
-                return cleaned
+                # Compact text instead of raw HTML
+                page = await self.snapshot()
+                return page.text[:PAGE_CONTENT_LIMIT]
                 
             except Exception as e:
                 return f"Error: {str(e)}"
         return get_page_content
         
-    def get_click_tool(self):
-        @function_tool
-        async def click_element(element_description: str) -> str:
-            """Click element described in natural language. Agent will use LLM to find it first."""
-            try:
-                # Get page content for LLM analysis
-                html = await self.page.content()
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(html, 'html.parser')
-                for tag in soup(['script', 'style', 'head', 'meta', 'link', 'noscript', 'svg', 'path', 'img', 'video']):
-                    tag.decompose()
-                cleaned_html = str(soup)
-                # Import LLM tool here to avoid circular dependency
-                from openai import AsyncOpenAI
-                import os
-                
-                client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-                
-                prompt = f"""Find the element to click based on this description: "{element_description}"
+    async def _ask_llm_for_selector(self, description: str, kind: str) -> str:
+        """Ask the LLM for a CSS selector matching the description"""
+        # Get page content for LLM analysis
+        html = await self.page.content()
+        page = compact_page(html)
+        self.element_selectors = page.selectors
 
-Page HTML: {cleaned_html[:20000]}
+        element_id = resolve_locally("find_selector", page, description, kind)
+        if element_id:
+            return page.selectors[element_id]
+
+        if kind == "fill":
+            prompt = f"""Find input field: "{description}"
+
+Page (interactive elements are marked [eN ...]): {page.text[:20000]}
+
+Return ONLY JSON:
+{{"id": "eN of the input", "reasoning": "why"}}"""
+        else:
+            prompt = f"""Find the element to click based on this description: "{description}"
+
+Page (interactive elements are marked [eN ...]): {page.text[:20000]}
 
 Return ONLY a JSON object:
-{{"selector": "CSS selector to click", "reasoning": "why this element"}}"""
-                
-                response = await client.chat.completions.create(
-                    model="gpt-5-mini",
-                    messages=[{"role": "user", "content": prompt}],
-                    # temperature=0
+{{"id": "eN of the element to click", "reasoning": "why this element"}}"""
+
+        response = await chat_completion(prompt, tool="find_selector")
+        result = parse_json_object(response)
+        element_id = str(result.get("id", "")).strip("[] ")
+        if element_id in page.selectors:
+            return page.selectors[element_id]
+        if result.get("selector"):
+            return result["selector"]
+        raise ValueError(f"LLM did not return a known element id: {response[:200]}")
+
+    async def _selector_still_matches(self, selector: str, kind: str) -> bool:
+        """Cheap check that a remembered selector still finds a usable element"""
+        try:
+            element = await self.page.query_selector(selector)
+            if element is None:
+                return False
+            if kind == "fill":
+                return await element.evaluate(
+                    "e => e.matches('input, textarea, select, [contenteditable]')"
                 )
-                
-                import json
-                result = json.loads(response.choices[0].message.content)
-                selector = result["selector"]
-                
-                await self.page.click(selector)
-                await asyncio.sleep(1)
-                return f"Clicked: {element_description}. New URL: {self.page.url}"
-                
+            return True
+        except Exception:
+            return False
+
+    async def find_selector(self, description: str, kind: str) -> tuple:
+        """
+        Selector for the described element: from the per-domain memory when it
+        still matches, from the LLM otherwise. Returns (selector, from_cache).
+        """
+        # Element ids from the last get_page_content need no lookup at all
+        element_id = description.strip().strip("[]")
+        if element_id in self.element_selectors:
+            return self.element_selectors[element_id], False
+
+        cache = get_selector_cache()
+        url = self.page.url
+        cached = cache.get(url, kind, description)
+        if cached and await self._selector_still_matches(cached, kind):
+            cache.hits += 1
+            tracing.add(cache_hits=1)
+            logger.info(f"Selector memory hit for '{description}': {cached}")
+            return cached, True
+
+        if cached:
+            logger.info(f"Remembered selector for '{description}' no longer matches")
+            cache.forget(url, kind, description)
+        cache.misses += 1
+        return await self._ask_llm_for_selector(description, kind), False
+
+    async def _with_selector(self, description: str, kind: str, action):
+        """Run action(selector), retrying once with the LLM if a remembered selector fails"""
+        url = self.page.url
+        selector, from_cache = await self.find_selector(description, kind)
+        if ELEMENT_ID.match(description.strip()):
+            await action(selector)
+            return selector
+        try:
+            await action(selector)
+        except Exception:
+            if not from_cache:
+                raise
+            get_selector_cache().forget(url, kind, description)
+            selector = await self._ask_llm_for_selector(description, kind)
+            await action(selector)
+        # Only a new or changed selector is worth rewriting the cache file for
+        cache = get_selector_cache()
+        if cache.get(url, kind, description) != selector:
+            cache.remember(url, kind, description, selector)
+        return selector
+
+    async def click(self, element_description: str) -> str:
+        """Click the described element and wait for the page to settle"""
+        await self._with_selector(element_description, "click", self.page.click)
+        waited = await self.settle()
+        return f"Clicked: {element_description}. New URL: {self.page.url} (settled in {waited:.1f}s)"
+
+    def get_click_tool(self):
+        @function_tool
+        async def click_element(element_description: str) -> str:
+            """Click element described in natural language, or by its [eN] id from get_page_content. Agent will use LLM to find it first."""
+            try:
+                return await self.click(element_description)
             except Exception as e:
                 return f"Click failed: {str(e)}"
         return click_element
         
+    async def fill(self, field_description: str, value: str) -> str:
+        """Fill the described field and submit it with Enter"""
+        async def fill_selector(selector):
+            await self.page.fill(selector, value)
+
+        selector = await self._with_selector(field_description, "fill", fill_selector)
+
+        # Try to submit
+        waited = 0.0
+        try:
+            await self.page.press(selector, "Enter")
+            waited = await self.settle()
+        except:
+            pass
+
+        return f"Filled '{field_description}' with '{value}' (settled in {waited:.1f}s)"
+
     def get_fill_tool(self):
         @function_tool
         async def fill_input(field_description: str, value: str) -> str:
-            """Fill input field. LLM finds the field based on description."""
+            """Fill input field, described in natural language or by its [eN] id. LLM finds the field based on description."""
             try:
-                html = await self.page.content()
-
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(html, 'html.parser')
-                for tag in soup(['script', 'style', 'head', 'meta', 'link', 'noscript', 'svg', 'path', 'img', 'video']):
-                    tag.decompose()
-                cleaned_html = str(soup)
-                
-                from openai import AsyncOpenAI
-                import os
-                
-                client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-                
-                prompt = f"""Find input field: "{field_description}"
-
-Page HTML: {cleaned_html[:20000]}
-
-Return ONLY JSON:
-{{"selector": "CSS selector for input", "reasoning": "why"}}"""
-                
-                response = await client.chat.completions.create(
-                    model="gpt-5-mini",
-                    messages=[{"role": "user", "content": prompt}],
-                    # temperature=0
-                )
-                
-                import json
-                result = json.loads(response.choices[0].message.content)
-                selector = result["selector"]
-                
-                await self.page.fill(selector, value)
-                
-                # Try to submit
-                try:
-                    await self.page.press(selector, "Enter")
-                    await asyncio.sleep(2)
-                except:
-                    pass
-                    
-                return f"Filled '{field_description}' with '{value}'"
-                
+                return await self.fill(field_description, value)
             except Exception as e:
                 return f"Fill failed: {str(e)}"
         return fill_input
 
+    async def enter_job_iframe(self) -> str:
+        """Switch the page context to the iframe holding the job listings"""
+        iframes = await self.page.query_selector_all('iframe')
+        if not iframes:
+            return "No iframes found"
+
+        async def read_frame(i, iframe):
+            try:
+                frame = await iframe.content_frame()
+                if not frame:
+                    return None
+                html = await frame.content()
+                score, reasons = score_frame(frame.url, html)
+                return {"index": i, "frame": frame, "html": html, "score": score, "reasons": reasons}
+            except Exception as e:
+                logger.debug(f"Could not read iframe {i}: {str(e)}")
+                return None
+
+        # Rank every frame on cheap local signals first
+        frames = [f for f in await asyncio.gather(*(read_frame(i, el) for i, el in enumerate(iframes))) if f]
+        frames.sort(key=lambda f: f["score"], reverse=True)
+        for f in frames:
+            logger.info(f"Iframe {f['index']} ({f['frame'].url[:80]}): score {f['score']:.1f} {f['reasons']}")
+
+        # An embedded ATS board is read through its API instead
+        for f in frames:
+            if is_ats_host(f["frame"].url):
+                board_read = await self.read_ats_board(f["frame"].url, careers_url=self.page.url)
+                if board_read:
+                    return board_read
+
+        candidates = [f for f in frames if f["score"] > 0][:IFRAME_CANDIDATES]
+        if not candidates:
+            return "No iframe with job listings found"
+
+        chosen = None
+        runner_up = candidates[1]["score"] if len(candidates) > 1 else 0
+        if candidates[0]["score"] >= CONFIDENT_SCORE and runner_up < CONFIDENT_SCORE:
+            chosen = candidates[0]
+        else:
+            # Ask the LLM only about the top candidates the content doesn't settle, all at once
+            async def classify(f):
+                answer = resolve_locally("classify_frame", f["html"])
+                if answer is not None:
+                    return answer
+                prompt = ("Does this frame contain job postings? Respond YES or NO.\n\n"
+                          f"Frame content: {compact_text(f['html'])[:IFRAME_CLASSIFY_CHARS]}")
+                return await chat_completion(prompt, tool="classify_frame", cache=True)
+
+            answers = await asyncio.gather(*(classify(f) for f in candidates), return_exceptions=True)
+            for f, answer in zip(candidates, answers):
+                if isinstance(answer, str) and "yes" in answer.lower():
+                    chosen = f
+                    break
+
+        if chosen is None:
+            return "No iframe with job listings found"
+
+        # Switch context to this iframe for future operations
+        self.page = chosen["frame"]
+        self.iframe_index = chosen["index"]
+        return f"Switched to iframe {chosen['index']} with job listings"
+
     def get_job_iframe_tool(self, llm_tool):
         @function_tool
         async def check_and_enter_job_iframe() -> str:
@@ -171,35 +420,49 @@ Return ONLY JSON:
             """
 
             try:
-                iframes = await self.page.query_selector_all('iframe')
-                if not iframes:
-                    return "No iframes found"
-
-                for i, iframe in enumerate(iframes):
-                    frame = await iframe.content_frame()
-                    if not frame:
-                        continue
-
-                    html = await frame.content()
-
-                    # Ask LLM if this frame contains job listings
-                    analysis = await llm_tool.get_analyze_tool()(
-                        html,
-                        "Does this frame contain job postings? Respond YES or NO."
-                    )
-
-                    if "yes" in analysis.lower():
-                        # Switch context to this iframe for future operations
-                        self.page = frame
-                        return f"Switched to iframe {i} with job listings"
-
-                return "No iframe with job listings found"
-
+                return await self.enter_job_iframe()
             except Exception as e:
                 return f"Iframe check failed: {str(e)}"
 
         return check_and_enter_job_iframe
 
+    def get_harvest_tool(self, llm_tool):
+        @function_tool
+        async def harvest_job_links(criteria: str, max_pages: int = 10) -> str:
+            """
+            Extract job links matching criteria from the current listing and all of its
+            following pages ("next" pagination, "load more" buttons, infinite scroll),
+            up to max_pages. Returns a JSON array of {"url", "job_title"}.
+            """
+            try:
+                harvester = LinkHarvester(self, llm_tool)
+                if self.run_state:
+                    self.run_state.set_listing_url(self.page.url)
+                links = await harvester.harvest(criteria, max_pages=max_pages, on_links=self.on_links)
+                return json.dumps(links, ensure_ascii=False)
+            except Exception as e:
+                logger.error(f"Link harvesting failed: {str(e)}")
+                return "[]"
+        return harvest_job_links
+
+    def get_route_tool(self):
+        @function_tool
+        async def remember_listing_route(careers_url: str, listing_url: str, access_method: str) -> str:
+            """
+            Record how the job listings were reached so later runs can skip discovery.
+            listing_url is the page where the access method was applied.
+            access_method is one of: visible, view_all, search, iframe.
+            """
+            if access_method not in ACCESS_METHODS:
+                return f"Unknown access_method '{access_method}', use one of {', '.join(ACCESS_METHODS)}"
+            self.route = {
+                "careers_url": careers_url,
+                "listing_url": listing_url,
+                "iframe_index": self.iframe_index,
+                "access_method": access_method
+            }
+            return f"Route recorded: {access_method} at {listing_url}"
+        return remember_listing_route
 
     def get_iframe_tool(self):
         @function_tool
@@ -230,13 +493,186 @@ Return ONLY JSON:
                 return f"Iframe check failed: {str(e)}"
         return check_and_enter_iframe
         
+    async def read_ats_board(self, url: str, careers_url: str = None):
+        """
+        Read a recognized ATS board through its API and record every posting
+        matching the job title. Returns the message for the agent, None when
+        url is no supported board or its API failed.
+        """
+        # One board per run; a posting on it visited later is not a reason to read it again
+        if self.route and self.route.get("access_method") == "ats":
+            return None
+        board = detect_board(url)
+        if board is None or not self.job_title:
+            return None
+        result = await get_ats_reader().read(board, self.job_title)
+        if result is None:
+            return None
+
+        targets = [record["url"] for record in result.records]
+        self.listing_links = result.total
+        if self.run_state:
+            self.run_state.set_listing_url(board.url)
+            self.run_state.checkpoint.add_pending(targets)
+        if self.postings:
+            self.postings.seen.update(targets)
+        for record in result.records:
+            if self.postings:
+                known = self.postings.get(record["url"])
+                content_hash = record_fingerprint(record)
+                if known and known["fingerprint"] == content_hash:
+                    self.postings.keep(record["url"])
+                else:
+                    self.postings.save(record["url"], content_hash, record)
+            if self.run_state:
+                await self.run_state.record(record)
+
+        self.route = {
+            "careers_url": careers_url or url,
+            "listing_url": board.url,
+            "iframe_index": None,
+            "access_method": "ats"
+        }
+        message = (f"{board.platform} job board read through its API: {len(result.records)} of "
+                   f"{result.total} postings match '{self.job_title}' and were scraped with full details. "
+                   f"Skip Steps 2-5 and go to STEP 6")
+        if self.run_state:
+            return message + " with an empty jobs array; the scraped jobs are added to it automatically."
+        return message + f" with these jobs: {json.dumps(result.records, ensure_ascii=False)}"
+
+    async def scrape_details(self, urls, llm_tool) -> list:
+        """Open each job URL on the page pool and extract its details concurrently"""
+        if self.detail_pool is None:
+            self.detail_pool = PagePool(self.context, size=self.detail_concurrency)
+
+        # Resolve relative links against the listing page and drop duplicates
+        base_url = self.page.url if self.page else ""
+        seen = set()
+        targets = []
+        for url in urls:
+            full_url = urljoin(base_url, url.strip())
+            if full_url and full_url not in seen:
+                seen.add(full_url)
+                targets.append(full_url)
+
+        # Jobs finished by an earlier, interrupted run come from the result sink
+        done = {}
+        if self.run_state:
+            self.run_state.checkpoint.add_pending(targets)
+            done = {r["url"]: r for r in self.run_state.sink.records()
+                    if r.get("url") and self.run_state.is_completed(r["url"])}
+            if done:
+                logger.info(f"{len(done)} of {len(targets)} jobs already scraped, skipping them")
+        if self.postings:
+            self.postings.seen.update(targets)
+
+        fetcher = get_fetcher()
+        postings = self.postings
+
+        async def emit(record):
+            if self.run_state:
+                await self.run_state.record(record)
+            return record
+
+        async def extract(url, html, etag=None, last_modified=None, require_title=False):
+            """Record for a page, from the posting store when its content is unchanged"""
+            known = postings.get(url) if postings else None
+            content_hash = fingerprint(html) if postings else None
+            if known and known["fingerprint"] == content_hash:
+                logger.info(f"Unchanged job: {known['record'].get('title') or url}")
+                return await emit(postings.keep(url, etag, last_modified))
+
+            record = parse_json_object(await llm_tool.extract(html, JOB_SCHEMA))
+            if require_title and not record.get("title"):
+                return None
+            record["url"] = url
+            logger.info(f"Scraped job: {record.get('title') or url}")
+            if postings:
+                postings.save(url, content_hash, record, etag, last_modified)
+            return await emit(record)
+
+        async def scrape_static(url):
+            """Record from a plain HTTP fetch, None when the page has to be rendered"""
+            known = postings.get(url) if postings else None
+            page = await fetcher.fetch(url,
+                                       etag=known and known["etag"],
+                                       last_modified=known and known["last_modified"],
+                                       confirm=True)
+            if page is None:
+                return None
+            if page.not_modified:
+                logger.info(f"Not modified: {known['record'].get('title') or url}")
+                return await emit(postings.keep(url))
+            try:
+                record = await extract(url, page.html, page.etag, page.last_modified, require_title=True)
+            except Exception as e:
+                logger.debug(f"Static page of {url} not usable: {str(e)}")
+                record = None
+            # Only a usable record counts for the domain, so a JavaScript shell with
+            # enough boilerplate text still sends the domain to the browser
+            fetcher.record(url, worked=record is not None)
+            return record
+
+        async def scrape_rendered(page, url):
+            try:
+                await page.goto(url, wait_until='domcontentloaded')
+                await self.settle(page)
+                return await extract(url, await page.content())
+            except Exception as e:
+                logger.error(f"Job scrape failed for {url}: {str(e)}")
+                return {"url": url, "error": str(e)}
+
+        remaining = [url for url in targets if url not in done]
+        records = dict(done)
+
+        # Server-rendered pages need no browser; the rest go through the page pool
+        static = await fetcher.map(scrape_static, remaining)
+        for record in static:
+            if record is not None:
+                records[record["url"]] = record
+        rendered = [url for url, record in zip(remaining, static) if record is None]
+
+        logger.info(f"Scraped {len(remaining) - len(rendered)} jobs over HTTP, rendering {len(rendered)}, "
+                    f"{self.detail_pool.size} at a time")
+        for record in await self.detail_pool.map(scrape_rendered, rendered):
+            records[record["url"]] = record
+        return [records[url] for url in targets]
+
+    def get_scrape_details_tool(self, llm_tool):
+        @function_tool
+        async def scrape_job_details(urls: list[str]) -> str:
+            """
+            Visit every job URL in parallel and extract title, company, location,
+            description, requirements, salary, employment_type and posted_date.
+            Returns a JSON array with one record per URL.
+            """
+            try:
+                records = await self.scrape_details(urls, llm_tool)
+                return json.dumps(records, ensure_ascii=False)
+            except Exception as e:
+                return f"Job detail scraping failed: {str(e)}"
+        return scrape_job_details
+
     async def cleanup(self):
-        """Close browser"""
+        """Close browser, or only this session's context if the browser is shared"""
         try:
-            if self.page:
-                await self.page.close()
+            if self.settle_stats.calls:
+                logger.info(f"Page settling: {self.settle_stats.summary()}")
+            if self.blocked_requests:
+                logger.info(f"Blocked {self.blocked_requests} heavy/tracking requests")
+            if self.detail_pool:
+                await self.detail_pool.close()
+            # Closing the context closes its pages, including the one self.page may be a frame of
             if self.context:
                 await self.context.close()
+            if not self.owns_browser:
+                return
+            get_cleaner().log_report()
+            await close_fetcher()
+            await close_ats_reader()
+            close_posting_store()
+            selectors = get_selector_cache()
+            logger.info(f"Selector memory: {selectors.hits} hits / {selectors.misses} misses")
             if self.browser:
                 await self.browser.close()
             if self.playwright:
@@ -0,0 +1,180 @@
+"""
+Checkpoint - streaming NDJSON results and resumable scrape state
+Every job record is appended to an NDJSON file the moment it is extracted,
+and a checkpoint file tracks the listing URL plus pending and completed job
+URLs, so a crashed or rate-limited run resumes with only the remaining jobs.
+"""
+
+import os
+import json
+import time
+from pathlib import Path
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Runs that resume one checkpoint before its failing jobs are given up
+MAX_RESUMES = int(os.getenv("CHECKPOINT_MAX_RESUMES", "2"))
+# Checkpoints older than this are not resumed; the listing may have moved on
+MAX_AGE = float(os.getenv("CHECKPOINT_MAX_AGE", str(24 * 3600)))
+
+
+class ResultSink:
+    """Append-only NDJSON file of job records"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        # Async callbacks receiving each record as it is written
+        self.subscribers = []
+
+    async def write(self, record: dict):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        for subscriber in self.subscribers:
+            try:
+                await subscriber(record)
+            except Exception as e:
+                logger.warning(f"Result subscriber failed: {str(e)}")
+
+    def records(self) -> list:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Last line of a crashed run may be cut off
+                    logger.warning(f"Skipping truncated line in {self.path}")
+        return records
+
+    def reset(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+class Checkpoint:
+    def __init__(self, path):
+        self.path = Path(path)
+        # Query the checkpoint belongs to
+        self.scope = None
+        self.listing_url = None
+        self.pending = []
+        self.completed = []
+        self.finished = False
+        self.resumes = 0
+        self.updated = 0
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self.scope = data.get("scope")
+                self.listing_url = data.get("listing_url")
+                self.pending = data.get("pending", [])
+                self.completed = data.get("completed", [])
+                self.finished = data.get("finished", False)
+                self.resumes = data.get("resumes", 0)
+                self.updated = data.get("updated", 0)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable checkpoint {self.path}: {str(e)}")
+
+    def remaining(self) -> list:
+        done = set(self.completed)
+        return [url for url in self.pending if url not in done]
+
+    def add_pending(self, urls):
+        known = set(self.pending)
+        self.pending.extend(url for url in urls if url not in known)
+        self.save()
+
+    def mark_completed(self, url: str):
+        if url not in self.completed:
+            self.completed.append(url)
+            self.save()
+
+    def save(self):
+        self.updated = time.time()
+        data = {
+            "scope": self.scope,
+            "listing_url": self.listing_url,
+            "pending": self.pending,
+            "completed": self.completed,
+            "finished": self.finished,
+            "resumes": self.resumes,
+            "updated": self.updated
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def reset(self):
+        self.scope = None
+        self.listing_url = None
+        self.pending = []
+        self.completed = []
+        self.finished = False
+        self.resumes = 0
+        self.updated = 0
+        if self.path.exists():
+            self.path.unlink()
+
+
+class RunState:
+    """Sink and checkpoint for one query, stored next to its output file"""
+
+    def __init__(self, output_path, scope: str = None):
+        base = os.path.splitext(output_path)[0]
+        self.scope = scope
+        self.sink = ResultSink(f"{base}.ndjson")
+        self.checkpoint = Checkpoint(f"{base}.checkpoint.json")
+
+    def can_resume(self) -> bool:
+        """Recent unfinished work of the same query; another query's checkpoint is never resumed"""
+        checkpoint = self.checkpoint
+        return (checkpoint.scope == self.scope and not checkpoint.finished
+                and checkpoint.resumes < MAX_RESUMES and time.time() - checkpoint.updated < MAX_AGE
+                and bool(checkpoint.remaining()))
+
+    def start_resume(self):
+        self.checkpoint.resumes += 1
+        self.checkpoint.save()
+
+    def start_fresh(self):
+        self.sink.reset()
+        self.checkpoint.reset()
+        self.checkpoint.scope = self.scope
+
+    def set_listing_url(self, url: str):
+        self.checkpoint.listing_url = url
+        self.checkpoint.save()
+
+    async def add_links(self, links: list):
+        self.checkpoint.add_pending([link["url"] for link in links if link.get("url")])
+
+    def is_completed(self, url: str) -> bool:
+        return url in self.checkpoint.completed
+
+    async def record(self, record: dict):
+        await self.sink.write(record)
+        if record.get("url"):
+            self.checkpoint.mark_completed(record["url"])
+
+    def finish(self) -> bool:
+        """
+        Mark the run finished; False while jobs are left that the next run resumes.
+        Jobs still failing after MAX_RESUMES resumes are given up, so the next
+        run of the query crawls the listing again.
+        """
+        remaining = self.checkpoint.remaining()
+        if remaining and self.checkpoint.resumes < MAX_RESUMES:
+            return False
+        if remaining:
+            logger.warning(f"Giving up on {len(remaining)} jobs after {self.checkpoint.resumes} resumes")
+        self.checkpoint.finished = True
+        self.checkpoint.save()
+        return True
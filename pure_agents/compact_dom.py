@@ -0,0 +1,310 @@
+"""
+Compact DOM - token-efficient page representation for the LLM
+Instead of truncated raw HTML the agents see visible text, interactive
+elements with short ids ([e12]) that map back to CSS selectors, and
+repeated card structures folded to one line per card.
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import json
+
+from .html_cleaner import clean_html
+from .structured_data import COMPACT_MARKER, find_job_posting, job_record, record_from_compact
+
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'dialog', 'div', 'dl', 'dt',
+    'fieldset', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'tbody',
+    'thead', 'tr', 'ul', 'body', 'html'
+}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+FIELD_TAGS = {'input', 'select', 'textarea'}
+SKIP_TAGS = {'template', 'iframe', 'canvas', 'object', 'embed'}
+
+# Siblings with the same structure that are folded into one line each
+MIN_REPEATED_CARDS = 3
+
+# Marker lines that separate blocks in the rendered text
+BLOCK_SEPARATOR = "\n\n"
+
+_CSS_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+
+
+@dataclass
+class CompactPage:
+    text: str
+    blocks: list = field(default_factory=list)
+    selectors: dict = field(default_factory=dict)
+    links: list = field(default_factory=list)
+
+
+def looks_like_html(content: str) -> bool:
+    head = content.lstrip()[:1000].lower()
+    return head.startswith('<') and ('<html' in head or '<body' in head or '<div' in head
+                                     or head.startswith('<!doctype'))
+
+
+def _text(element) -> str:
+    return " ".join("".join(element.itertext()).split())
+
+
+def css_selector(element) -> str:
+    """Short CSS selector for an element in the cleaned tree"""
+    element_id = element.get('id')
+    if element_id and _CSS_IDENT.match(element_id):
+        return f"#{element_id}"
+
+    parts = []
+    node = element
+    while node is not None and isinstance(node.tag, str) and node.tag not in ('html',):
+        node_id = node.get('id')
+        if node is not element and node_id and _CSS_IDENT.match(node_id):
+            parts.append(f"#{node_id}")
+            break
+        parent = node.getparent()
+        if parent is None or node.tag == 'body':
+            parts.append(node.tag)
+            break
+        same_tag = [sibling for sibling in parent if sibling.tag == node.tag]
+        if len(same_tag) > 1:
+            parts.append(f"{node.tag}:nth-of-type({same_tag.index(node) + 1})")
+        else:
+            parts.append(node.tag)
+        node = parent
+    return " > ".join(reversed(parts))
+
+
+def _signature(element) -> str:
+    classes = " ".join(sorted((element.get('class') or "").split()))
+    return f"{element.tag}.{classes}"
+
+
+class _Builder:
+    def __init__(self):
+        self.blocks = []
+        self.line = []
+        self.selectors = OrderedDict()
+        self.links = []
+
+    def element_id(self, element) -> str:
+        short_id = f"e{len(self.selectors) + 1}"
+        self.selectors[short_id] = css_selector(element)
+        return short_id
+
+    def flush(self):
+        line = " ".join(" ".join(self.line).split())
+        if line:
+            self.blocks.append(line)
+        self.line = []
+
+    def add_text(self, text):
+        if text and text.strip():
+            self.line.append(text.strip())
+
+    def link_token(self, a) -> str:
+        href = a.get('href', '')
+        text = _text(a)[:120]
+        short_id = self.element_id(a)
+        self.links.append({'id': short_id, 'url': href, 'text': text})
+        return f'[{short_id} link "{text}" -> {href}]'
+
+    def field_token(self, element) -> str:
+        short_id = self.element_id(element)
+        attrs = []
+        for name in ('type', 'name', 'placeholder', 'aria-label', 'value'):
+            value = element.get(name)
+            if value:
+                attrs.append(f'{name}="{value[:60]}"')
+        if element.tag == 'select':
+            options = [_text(o) for o in element.iter('option')][:8]
+            attrs.append(f"options={options}")
+        return f"[{short_id} {element.tag} {' '.join(attrs)}]".replace(" ]", "]")
+
+    def button_token(self, element) -> str:
+        short_id = self.element_id(element)
+        label = _text(element)[:80] or element.get('aria-label', '') or element.get('value', '')
+        return f'[{short_id} button "{label}"]'
+
+    def walk(self, element):
+        tag = element.tag if isinstance(element.tag, str) else None
+        if tag is None or tag in SKIP_TAGS:
+            if element.tail:
+                self.add_text(element.tail)
+            return
+        if element.get('hidden') is not None or element.get('aria-hidden') == 'true':
+            if element.tail:
+                self.add_text(element.tail)
+            return
+
+        is_block = tag in BLOCK_TAGS
+        if is_block:
+            self.flush()
+
+        if tag == 'a' and element.get('href'):
+            self.line.append(self.link_token(element))
+        elif tag in FIELD_TAGS:
+            self.line.append(self.field_token(element))
+        elif tag == 'button' or element.get('role') == 'button':
+            self.line.append(self.button_token(element))
+        elif tag in HEADING_TAGS:
+            self.flush()
+            self.line.append('#' * int(tag[1]))
+            self.add_text(element.text)
+            for child in element:
+                self.walk(child)
+            self.flush()
+        elif self.fold_cards(element):
+            pass
+        else:
+            self.add_text(element.text)
+            for child in element:
+                self.walk(child)
+
+        if is_block:
+            self.flush()
+        if element.tail:
+            self.add_text(element.tail)
+
+    def fold_cards(self, element) -> bool:
+        """Render runs of same-structure children that contain links as one line per card"""
+        children = [child for child in element if isinstance(child.tag, str)]
+        if len(children) < MIN_REPEATED_CARDS:
+            return False
+
+        groups = OrderedDict()
+        for child in children:
+            groups.setdefault(_signature(child), []).append(child)
+        signature, cards = max(groups.items(), key=lambda item: len(item[1]))
+        if len(cards) < MIN_REPEATED_CARDS or len(cards) < len(children) / 2:
+            return False
+        if sum(1 for card in cards if card.find('.//a[@href]') is not None or
+               (card.tag == 'a' and card.get('href'))) < len(cards) / 2:
+            return False
+
+        self.flush()
+        self.add_text(element.text)
+        self.flush()
+        first_class = (cards[0].get('class') or "").split()[:1]
+        label = cards[0].tag + (f".{first_class[0]}" if first_class else "")
+        lines = [f"LIST of {len(cards)} <{label}> items:"]
+        for child in children:
+            if _signature(child) != signature:
+                self.walk(child)
+                continue
+            lines.append("- " + self.card_line(child))
+        self.blocks.append("\n".join(lines))
+        return True
+
+    def card_line(self, card) -> str:
+        tokens = []
+        anchors = [card] if card.tag == 'a' and card.get('href') else card.iter('a')
+        seen = set()
+        for a in anchors:
+            href = a.get('href')
+            if href and href not in seen:
+                seen.add(href)
+                tokens.append(self.link_token(a))
+        for node in card.iter(*FIELD_TAGS, 'button'):
+            tokens.append(self.field_token(node) if node.tag in FIELD_TAGS else self.button_token(node))
+
+        # Text outside the links: location, team, date...
+        texts = []
+        for node in card.iter():
+            if not isinstance(node.tag, str):
+                continue
+            in_link = node.tag == 'a' or any(True for _ in node.iterancestors('a'))
+            tail_in_link = node is not card and (
+                node.getparent().tag == 'a' or any(True for _ in node.getparent().iterancestors('a'))
+            )
+            pieces = ([] if in_link else [node.text]) + ([] if tail_in_link or node is card else [node.tail])
+            for piece in pieces:
+                if piece and piece.strip():
+                    piece = " ".join(piece.split())
+                    if piece not in texts:
+                        texts.append(piece)
+        text = " | ".join(texts)[:200]
+        return " ".join(tokens) + (f" {text}" if text else "")
+
+
+_compact_cache = OrderedDict()
+_COMPACT_CACHE_SIZE = 32
+
+
+def compact_page(html: str) -> CompactPage:
+    """Compact representation of a page, built once per distinct cleaned page"""
+    cleaned = clean_html(html)
+    cached = _compact_cache.get(cleaned.key)
+    if cached is not None:
+        _compact_cache.move_to_end(cleaned.key)
+        return cached
+
+    builder = _Builder()
+    # An embedded JobPosting goes first, already mapped onto the job schema
+    posting = find_job_posting(cleaned.structured)
+    if posting is not None:
+        builder.blocks.append(COMPACT_MARKER + json.dumps(job_record(posting), ensure_ascii=False))
+    body = cleaned.tree.find('.//body')
+    builder.walk(body if body is not None else cleaned.tree)
+    builder.flush()
+
+    page = CompactPage(
+        text=BLOCK_SEPARATOR.join(builder.blocks),
+        blocks=builder.blocks,
+        selectors=dict(builder.selectors),
+        links=builder.links
+    )
+    _compact_cache[cleaned.key] = page
+    while len(_compact_cache) > _COMPACT_CACHE_SIZE:
+        _compact_cache.popitem(last=False)
+    return page
+
+
+def structured_job_record(content: str):
+    """JobPosting record from raw HTML or from compact text, None if the page has none"""
+    if looks_like_html(content):
+        posting = find_job_posting(clean_html(content).structured)
+        return job_record(posting) if posting is not None else None
+    return record_from_compact(content)
+
+
+def compact_text(content: str) -> str:
+    """Compact text for HTML input; anything else is assumed to be compact already"""
+    if looks_like_html(content):
+        return compact_page(content).text
+    return content
+
+
+def split_into_chunks(text: str, max_chars: int) -> list:
+    """
+    Split compact text along block boundaries into chunks of at most max_chars.
+    Oversized card lists are split between cards, repeating the LIST header.
+    """
+    pieces = []
+    for block in text.split(BLOCK_SEPARATOR):
+        if len(block) <= max_chars:
+            pieces.append(block)
+            continue
+        lines = block.split("\n")
+        header = lines[0] if lines[0].startswith("LIST of") else ""
+        current = header
+        for line in lines[1:] if header else lines:
+            if current and len(current) + len(line) + 1 > max_chars:
+                pieces.append(current)
+                current = header
+            current = f"{current}\n{line}" if current else line[:max_chars]
+        if current and current != header:
+            pieces.append(current)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(BLOCK_SEPARATOR) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}{BLOCK_SEPARATOR}{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,97 @@
+"""
+Frame Scoring - cheap local signals for which iframe holds job listings
+Used to rank iframes before any of them is sent to the LLM.
+"""
+
+import re
+from urllib.parse import urlparse
+from .html_cleaner import clean_html
+
+# Hosts of applicant tracking systems that embed job boards
+KNOWN_ATS_HOSTS = (
+    "greenhouse.io", "lever.co", "myworkdayjobs.com", "myworkdaysite.com", "smartrecruiters.com",
+    "workable.com", "ashbyhq.com", "icims.com", "jobvite.com", "taleo.net", "successfactors.com",
+    "successfactors.eu", "recruitee.com", "bamboohr.com", "personio.de", "personio.com",
+    "teamtailor.com", "breezy.hr", "applytojob.com", "ultipro.com", "dayforcehcm.com",
+    "oraclecloud.com", "phenompeople.com", "avature.net", "eightfold.ai", "softgarden.io",
+    "join.com", "pinpointhq.com", "rippling-ats.com", "jazzhr.com", "comeet.co", "workday.com",
+)
+
+# Hosts that never hold job listings, matched with their subdomains
+NON_JOB_HOSTS = (
+    "doubleclick.net", "googlesyndication.com", "googletagmanager.com", "youtube.com",
+    "youtube-nocookie.com", "vimeo.com", "facebook.com", "twitter.com", "x.com", "instagram.com",
+    "hotjar.com", "intercom.io", "zendesk.com", "onetrust.com", "cookielaw.org", "maps.google.com",
+    "spotify.com", "soundcloud.com", "adsrvr.org", "criteo.com",
+)
+# Widgets living under a path of a host that otherwise may hold jobs
+NON_JOB_PATHS = (
+    ("google.com", "/recaptcha"), ("google.com", "/maps"), ("linkedin.com", "/embed"),
+)
+# Host labels of ad servers (ads.example.com)
+NON_JOB_LABELS = ("ads",)
+
+JOB_WORDS = re.compile(
+    r"\b(jobs?|careers?|positions?|openings?|vacanc(?:y|ies)|apply|requisition|hiring|"
+    r"full[- ]time|part[- ]time|internship|stellen\w*|karriere|emplois?|empleos?)\b",
+    re.IGNORECASE
+)
+JOB_LINK = re.compile(r"(job|career|position|opening|posting|requisition|vacanc|stellen)", re.IGNORECASE)
+
+# Score from which an ATS frame is taken without asking the LLM
+CONFIDENT_SCORE = 15
+
+
+def _on_host(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def is_ats_host(url: str) -> bool:
+    host = urlparse(url).netloc.lower()
+    return any(_on_host(host, ats) for ats in KNOWN_ATS_HOSTS)
+
+
+def is_non_job_host(url: str) -> bool:
+    """Ad, media, chat and consent widgets that never hold job listings"""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if not host:
+        return False
+    return (any(_on_host(host, domain) for domain in NON_JOB_HOSTS)
+            or any(_on_host(host, domain) and parsed.path.lower().startswith(path) for domain, path in NON_JOB_PATHS)
+            or any(label in NON_JOB_LABELS for label in host.split(".")))
+
+
+def score_frame(url: str, html: str) -> tuple:
+    """(score, reasons) for how likely a frame is to contain job listings"""
+    score = 0.0
+    reasons = []
+    url_lower = (url or "").lower()
+
+    if is_ats_host(url_lower):
+        score += 10
+        reasons.append("ATS host")
+    if is_non_job_host(url_lower):
+        score -= 10
+        reasons.append("ad/media host")
+    if JOB_LINK.search(urlparse(url_lower).path):
+        score += 3
+        reasons.append("job-like URL")
+
+    if len(html) < 500:
+        score -= 5
+        reasons.append("almost empty")
+
+    page = clean_html(html)
+    job_links = sum(1 for link in page.links
+                    if JOB_LINK.search(link['url']) or JOB_WORDS.search(link['text']))
+    if job_links:
+        score += min(job_links, 20) * 0.5
+        reasons.append(f"{job_links} job-like links")
+
+    keyword_hits = len(JOB_WORDS.findall(page.html[:200000]))
+    if keyword_hits:
+        score += min(keyword_hits, 25) * 0.2
+        reasons.append(f"{keyword_hits} job keywords")
+
+    return score, reasons
@@ -0,0 +1,168 @@
+"""
+Link Harvester - follows pagination, "load more" and infinite scroll
+Collects job links across every page of a listing without one agent turn
+per page. The paging control is detected once per site and reused.
+"""
+
+import re
+from urllib.parse import urljoin
+from utils.logger import setup_logger
+from utils import tracing
+from .compact_dom import compact_page
+from .frame_scoring import JOB_LINK
+from .llm_tool import normalize_url, parse_json_object
+from .model_routing import resolve_locally
+from .openai_client import chat_completion
+from .selector_cache import get_selector_cache
+
+logger = setup_logger(__name__)
+
+PAGING_KINDS = ("next", "load_more", "scroll")
+
+# Pages in a row without new links before giving up
+MAX_EMPTY_PAGES = 2
+
+SCROLL_JS = "() => { window.scrollTo(0, document.body.scrollHeight); return document.body.scrollHeight; }"
+
+
+class LinkHarvester:
+    def __init__(self, browser_tool, llm_tool):
+        self.browser_tool = browser_tool
+        self.llm_tool = llm_tool
+
+    @property
+    def page(self):
+        return self.browser_tool.page
+
+    async def harvest(self, criteria: str, max_pages: int = 10, on_links=None) -> list:
+        """
+        Extract matching job links from the current listing and every following
+        page, up to max_pages. on_links(new_links) is called as each page lands.
+        """
+        links = []
+        seen_urls = set()
+        seen_lines = set()
+        control = None
+        empty_pages = 0
+
+        for page_no in range(1, max_pages + 1):
+            html = await self.page.content()
+            base_url = self.page.url
+            compact = compact_page(html)
+            if page_no == 1:
+                # Job-like links on the listing, matching or not: tells a listing without
+                # matches apart from a page that is no listing at all
+                self.browser_tool.listing_links = sum(1 for link in compact.links if JOB_LINK.search(link["url"]))
+
+            # Only content not seen on earlier pages goes to the LLM
+            delta = self._new_content(compact.text, seen_lines)
+            found = await self.llm_tool.find_links(delta, criteria) if delta else []
+
+            new_links = []
+            for link in found:
+                if not isinstance(link, dict) or not link.get("url"):
+                    continue
+                link["url"] = urljoin(base_url, link["url"])
+                key = normalize_url(link["url"])
+                if key not in seen_urls:
+                    seen_urls.add(key)
+                    new_links.append(link)
+
+            links.extend(new_links)
+            logger.info(f"Harvest page {page_no}: {len(new_links)} new links ({len(links)} total)")
+            if new_links and on_links is not None:
+                await on_links(new_links)
+
+            empty_pages = 0 if new_links else empty_pages + 1
+            if empty_pages >= MAX_EMPTY_PAGES or page_no == max_pages:
+                break
+
+            if control is None:
+                control = await self.detect_control(html)
+                if control is None:
+                    logger.info("No pagination control found, single page listing")
+                    break
+                logger.info(f"Paging control: {control[0]} {control[1]}")
+
+            if not await self._advance(control, html):
+                logger.info("Listing did not change after paging, stopping")
+                break
+
+        return links
+
+    @staticmethod
+    def _new_content(text: str, seen_lines: set) -> str:
+        fresh = []
+        for line in text.splitlines():
+            stripped = line.strip()
+            if not stripped or stripped.startswith("LIST of"):
+                continue
+            # Element ids shift between pages, compare without them
+            key = re.sub(r"\[e\d+ ", "[", stripped)
+            if key not in seen_lines:
+                seen_lines.add(key)
+                fresh.append(line)
+        return "\n".join(fresh)
+
+    async def detect_control(self, html: str):
+        """(kind, selector) of the paging control: memory first, then local heuristics, then the LLM"""
+        cache = get_selector_cache()
+        url = self.page.url
+
+        for kind in PAGING_KINDS:
+            selector = cache.get(url, "paging", kind)
+            if selector and (kind == "scroll" or await self.browser_tool._selector_still_matches(selector, "click")):
+                cache.hits += 1
+                tracing.add(cache_hits=1)
+                return kind, selector
+
+        cache.misses += 1
+        control = resolve_locally("detect_paging", html) or await self._detect_with_llm(html)
+        if control is None and await self._scroll_grows_page():
+            control = ("scroll", "window")
+        if control is not None:
+            cache.remember(url, "paging", control[0], control[1])
+        return control
+
+    async def _detect_with_llm(self, html: str):
+        page = compact_page(html)
+        prompt = f"""This is the end of a job listings page. Which element shows the next results?
+
+Page (interactive elements are marked [eN ...]):
+{page.text[-6000:]}
+
+Return ONLY JSON:
+{{"kind": "next" or "load_more" or "none", "id": "eN of the element or null"}}"""
+        try:
+            result = parse_json_object(await chat_completion(prompt, tool="detect_paging", cache=True))
+        except Exception as e:
+            logger.warning(f"Paging detection failed: {str(e)}")
+            return None
+        element_id = str(result.get("id") or "").strip("[] ")
+        if result.get("kind") in ("next", "load_more") and element_id in page.selectors:
+            return result["kind"], page.selectors[element_id]
+        return None
+
+    async def _scroll_grows_page(self) -> bool:
+        try:
+            before = await self.page.evaluate(SCROLL_JS)
+            await self.browser_tool.settle()
+            after = await self.page.evaluate("() => document.body.scrollHeight")
+            return after > before
+        except Exception:
+            return False
+
+    async def _advance(self, control, html_before: str) -> bool:
+        """Move to the next page of results; False when nothing changed"""
+        kind, selector = control
+        try:
+            if kind == "scroll":
+                await self.page.evaluate(SCROLL_JS)
+            else:
+                await self.page.click(selector)
+            await self.browser_tool.settle()
+            return await self.page.content() != html_before
+        except Exception as e:
+            logger.info(f"Paging control stopped working: {str(e)}")
+            return False
+
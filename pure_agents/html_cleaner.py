@@ -0,0 +1,173 @@
+"""
+HTML Cleaner - shared parse-once cleaning for all tools
+Pages are parsed with lxml and cached by content hash, so an unchanged page
+is parsed exactly once no matter how many tools look at it.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from lxml import etree, html as lxml_html
+
+from utils.logger import setup_logger
+from utils import tracing
+from . import structured_data
+
+logger = setup_logger(__name__)
+
+# Tags that never carry anything the agents need
+STRIP_TAGS = ('script', 'style', 'head', 'meta', 'link', 'noscript', 'svg', 'path', 'img', 'video')
+
+# Size of each piece fed to the parser
+FEED_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class CleanedPage:
+    """A parsed and cleaned page. Treat as read-only, it is shared via the cache."""
+    key: str
+    tree: object
+    html: str
+    links: list = field(default_factory=list)
+    # JSON-LD and microdata, collected before scripts and meta tags are stripped
+    structured: dict = field(default_factory=dict)
+    original_bytes: int = 0
+    cleaned_bytes: int = 0
+    parse_time: float = 0.0
+
+
+class HTMLCleaner:
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "parse_time": 0.0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "bytes_not_reparsed": 0,
+        }
+
+    @staticmethod
+    def content_key(html: str) -> str:
+        return hashlib.sha1(html.encode('utf-8', 'replace')).hexdigest()
+
+    def clean(self, html: str) -> CleanedPage:
+        """Return the cleaned page for this HTML, parsing only on a cache miss"""
+        key = self.content_key(html)
+        page = self._cache.get(key)
+        if page is not None:
+            self._cache.move_to_end(key)
+            self.stats["hits"] += 1
+            self.stats["bytes_not_reparsed"] += page.original_bytes
+            tracing.add(cache_hits=1)
+            return page
+
+        self.stats["misses"] += 1
+        page = self._parse(key, html)
+        self._store(key, page)
+        # Cleaned output is often handed straight back to another tool, so make
+        # re-cleaning it a cache hit as well
+        cleaned_key = self.content_key(page.html)
+        if cleaned_key != key:
+            self._store(cleaned_key, page)
+        return page
+
+    def _store(self, key: str, page: CleanedPage):
+        self._cache[key] = page
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _parse(self, key: str, html: str) -> CleanedPage:
+        start = time.perf_counter()
+
+        # Feed the document in chunks instead of building one big parse call
+        parser = etree.HTMLParser(remove_comments=True, remove_pis=True)
+        for i in range(0, len(html), FEED_CHUNK_SIZE):
+            parser.feed(html[i:i + FEED_CHUNK_SIZE])
+        try:
+            root = parser.close()
+        except etree.XMLSyntaxError:
+            # Empty or whitespace-only documents have no element at all
+            root = None
+
+        if root is None:
+            root = lxml_html.fromstring("<html><body></body></html>")
+
+        structured = structured_data.collect(root)
+        etree.strip_elements(root, *STRIP_TAGS, with_tail=False)
+        cleaned_html = etree.tostring(root, method='html', encoding='unicode')
+
+        links = []
+        for a in root.iter('a'):
+            href = a.get('href')
+            if not href:
+                continue
+            parent = a.getparent()
+            links.append({
+                'url': href,
+                'text': _text(a)[:100],
+                'parent_text': _text(parent)[:200] if parent is not None else ""
+            })
+
+        elapsed = time.perf_counter() - start
+        original_bytes = len(html.encode('utf-8', 'replace'))
+        cleaned_bytes = len(cleaned_html.encode('utf-8', 'replace'))
+
+        self.stats["parse_time"] += elapsed
+        self.stats["bytes_in"] += original_bytes
+        self.stats["bytes_out"] += cleaned_bytes
+        tracing.add(html_bytes_in=original_bytes, html_bytes_out=cleaned_bytes)
+
+        logger.debug(
+            f"Parsed page {key[:10]} in {elapsed * 1000:.1f}ms "
+            f"({original_bytes} -> {cleaned_bytes} bytes)"
+        )
+
+        return CleanedPage(
+            key=key,
+            tree=root,
+            html=cleaned_html,
+            links=links,
+            structured=structured,
+            original_bytes=original_bytes,
+            cleaned_bytes=cleaned_bytes,
+            parse_time=elapsed
+        )
+
+    def report(self) -> dict:
+        """Parse time and bytes saved so far"""
+        return {
+            **self.stats,
+            "bytes_stripped": self.stats["bytes_in"] - self.stats["bytes_out"],
+            "cached_pages": len(self._cache),
+        }
+
+    def log_report(self):
+        r = self.report()
+        logger.info(
+            f"HTML cleaner: {r['hits']} hits / {r['misses']} misses, "
+            f"parse time {r['parse_time']:.3f}s, "
+            f"{r['bytes_stripped']} bytes stripped, "
+            f"{r['bytes_not_reparsed']} bytes not re-parsed"
+        )
+
+
+def _text(element) -> str:
+    return " ".join("".join(element.itertext()).split())
+
+
+_cleaner = HTMLCleaner()
+
+
+def get_cleaner() -> HTMLCleaner:
+    """Shared cleaner used by every tool"""
+    return _cleaner
+
+
+def clean_html(html: str) -> CleanedPage:
+    return _cleaner.clean(html)
@@ -0,0 +1,132 @@
+"""
+LLM Cache - persistent SQLite cache of LLM answers
+Keyed by a hash of model, completion budget and prompt (the prompt already
+embeds the cleaned content), with TTL expiry and size-bounded LRU eviction.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+from collections import defaultdict
+from pathlib import Path
+from utils.logger import setup_logger
+from utils import tracing
+
+logger = setup_logger(__name__)
+
+DEFAULT_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite")
+DEFAULT_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+
+class LLMCache:
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                tool TEXT,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self.db.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, max_tokens: int = None, effort: str = None) -> str:
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\0")
+        # Answers given under another completion budget or effort are not reused
+        if max_tokens or effort:
+            digest.update(f"{max_tokens}|{effort}".encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(prompt.encode("utf-8", "replace"))
+        return digest.hexdigest()
+
+    def get(self, key: str, tool: str = "default"):
+        """Cached response for key, or None if missing or expired"""
+        now = time.time()
+        row = self.db.execute(
+            "SELECT response, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.db.commit()
+            self.misses[tool] += 1
+            return None
+
+        self.db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        self.db.commit()
+        self.hits[tool] += 1
+        tracing.add(cache_hits=1)
+        return row[0]
+
+    def set(self, key: str, response: str, tool: str = "default"):
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses (key, tool, response, created, last_access) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, tool, response, now, now)
+        )
+        self._evict(now)
+        self.db.commit()
+
+    def _evict(self, now: float):
+        self.db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        count = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self.db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def stats(self) -> dict:
+        """Hit/miss counters per tool"""
+        tools = sorted(set(self.hits) | set(self.misses))
+        return {tool: {"hits": self.hits[tool], "misses": self.misses[tool]} for tool in tools}
+
+    def log_stats(self):
+        for tool, counts in self.stats().items():
+            logger.info(f"LLM cache [{tool}]: {counts['hits']} hits / {counts['misses']} misses")
+
+    def close(self):
+        self.db.close()
+
+
+_cache = None
+
+
+def get_llm_cache():
+    """Shared cache, or None when disabled with LLM_CACHE=0"""
+    global _cache
+    if os.getenv("LLM_CACHE", "1") == "0":
+        return None
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
+
+
+def close_llm_cache():
+    global _cache
+    if _cache is not None:
+        _cache.log_stats()
+        _cache.close()
+    _cache = None
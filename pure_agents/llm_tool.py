@@ -2,114 +2,199 @@
 LLM Analysis Tool - Agents use this to analyze content
 """
 
-import os
 import json
-from openai import AsyncOpenAI
+import asyncio
+from urllib.parse import urldefrag
 from agents import function_tool
 from utils.logger import setup_logger
+from .compact_dom import compact_text, split_into_chunks, structured_job_record
+from .model_routing import resolve_locally
+from .openai_client import chat_completion, get_client
 
 logger = setup_logger(__name__)
 
+# Characters of compact page text per prompt
+CONTENT_LIMIT = 40000
+
+# Characters of compact page text per link-extraction call
+LINK_CHUNK_SIZE = 12000
+
+# Fields extracted for every job posting
+JOB_SCHEMA = "title, company, location, description, requirements, salary, employment_type, posted_date"
+
+
+def parse_json_object(text: str) -> dict:
+    """Parse a JSON object from an LLM reply, tolerating code fences and chatter"""
+    text = text.strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError(f"No JSON object in response: {text[:200]}")
+    return json.loads(text[start:end + 1])
+
+
+def normalize_url(url: str) -> str:
+    """URL without fragment or trailing slash, for de-duplication"""
+    return urldefrag(url.strip())[0].rstrip("/")
+
+
 class LLMAnalysisTool:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-    def get_analyze_tool(self):
-        @function_tool
-        async def analyze_content(content: str, question: str) -> str:
-            """Ask LLM to analyze HTML/text content and answer a question"""
-            try:
-                prompt = f"""Analyze this content and answer the question.
+        self.client = get_client()
+
+    # Plain coroutines, usable from other tools as well as by the agent
+
+    async def analyze(self, content: str, question: str) -> str:
+        """Ask LLM a question about HTML/text content"""
+        prompt = f"""Analyze this content and answer the question.
 
-Content: {content[:15000]}
+Content: {compact_text(content)[:15000]}
 
 Question: {question}
 
 Provide a clear, actionable answer."""
-                
-                response = await self.client.chat.completions.create(
-                    model="gpt-5-mini",
-                    messages=[{"role": "user", "content": prompt}],
-                    # temperature=0.1
-                )
-                
-                return response.choices[0].message.content
-                
-            except Exception as e:
-                return f"Analysis failed: {str(e)}"
-        return analyze_content
-        
-    def get_extract_links_tool(self):
-        @function_tool
-        async def extract_links(content: str, criteria: str) -> str:
-            """Extract links from HTML matching criteria"""
-            try:
-                from bs4 import BeautifulSoup
-                import json
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                for tag in soup(['script', 'style', 'head', 'meta', 'link', 'noscript', 'svg', 'path', 'img', 'video']):
-                    tag.decompose()
-                
-                cleaned_html = str(soup)[:30000]
-                
-                # Also extract all links as fallback
-                all_links = []
-                for a in soup.find_all('a', href=True):
-                    all_links.append({
-                        'url': a['href'],
-                        'text': a.get_text(strip=True)[:100],
-                        'parent_text': a.parent.get_text(strip=True)[:200] if a.parent else ""
-                    })
-                
-                prompt = f"""Find ALL job posting links matching: "{criteria}"
-
-    HTML content:
-    {cleaned_html}
+
+        return await chat_completion(prompt, tool="analyze_content", cache=True)
+
+    async def find_links(self, content: str, criteria: str) -> list:
+        """
+        Return the job links in the content matching criteria, [] on failure.
+        Large pages are split along card/section boundaries and the chunks
+        are searched concurrently, so nothing past the first screen is dropped.
+        """
+        page_text = compact_text(content)
+        chunks = split_into_chunks(page_text, LINK_CHUNK_SIZE)
+        if len(chunks) > 1:
+            logger.info(f"Extracting links from {len(chunks)} chunks concurrently")
+
+        results = await asyncio.gather(
+            *(self._find_links_in_chunk(chunk, criteria) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        # Merge, keeping the first occurrence of each URL
+        links = []
+        seen = set()
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Link extraction chunk failed: {str(result)}")
+                continue
+            for link in result:
+                if not isinstance(link, dict) or not link.get("url"):
+                    continue
+                key = normalize_url(link["url"])
+                if key not in seen:
+                    seen.add(key)
+                    links.append(link)
+
+        logger.info(f"Successfully extracted {len(links)} job links")
+        return links
+
+    async def _find_links_in_chunk(self, page_text: str, criteria: str) -> list:
+        links = resolve_locally("extract_links", page_text)
+        if links is not None:
+            return links
+
+        prompt = f"""Find ALL job posting links matching: "{criteria}"
+
+    Page content (links are shown as [eN link "text" -> url], job cards as LIST items):
+    {page_text}
 
     Look for:
     - Links in job cards/listings
     - "Apply", "View details", "Learn more" buttons near job titles
     - Links with job titles in nearby text
 
-    All links found on page (use these if they match):
-    {json.dumps(all_links[:30], indent=2)}
-
     Return JSON array:
     [{{"url": "full URL", "job_title": "inferred job title from context"}}]
 
-    IMPORTANT: 
+    IMPORTANT:
     - Return actual URLs from the page
     - Include ALL matching jobs
+    - Return [] if this part of the page has no matching jobs
     - Return ONLY valid JSON, no explanation"""
-                
-                response = await self.client.chat.completions.create(
-                    model="gpt-5-mini",
-                    messages=[{"role": "user", "content": prompt}],
-                    # temperature=0
-                )
-                
-                result = response.choices[0].message.content.strip()
-                
-                # Log raw response
-                logger.info(f"LLM raw response: {result[:500]}")
-                
-                # Try to parse
-                import json
-                try:
-                    parsed = json.loads(result)
-                    if isinstance(parsed, list):
-                        logger.info(f"Successfully extracted {len(parsed)} job links")
-                        return json.dumps(parsed)
-                    else:
-                        logger.warning(f"LLM returned non-array: {type(parsed)}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON parse error: {str(e)}, Response: {result[:200]}")
-                
-                # If parsing fails, return empty array
-                logger.warning("Returning empty array due to parsing failure")
-                return "[]"
-                
+
+        response = await chat_completion(prompt, tool="extract_links", cache=True)
+
+        result = response.strip()
+
+        # Log raw response
+        logger.debug(f"LLM raw response: {result[:500]}")
+
+        # Try to parse
+        try:
+            parsed = json.loads(result)
+            if isinstance(parsed, list):
+                return parsed
+            else:
+                logger.warning(f"LLM returned non-array: {type(parsed)}")
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parse error: {str(e)}, Response: {result[:200]}")
+
+        # If parsing fails, return empty array
+        logger.warning("Returning empty array due to parsing failure")
+        return []
+
+    async def extract(self, content: str, schema: str) -> str:
+        """
+        Extract structured data from content, returned as JSON text.
+        An embedded schema.org JobPosting (JSON-LD/microdata) is used first;
+        the LLM only fills in the fields it didn't provide.
+        """
+        fields = [f.strip() for f in schema.split(",") if f.strip()]
+        answer = resolve_locally("extract_data", content, fields)
+        if answer is not None:
+            logger.info("JobPosting structured data covered all required fields")
+            return answer
+
+        record = structured_job_record(content)
+        known, missing = {}, []
+        if record:
+            known = {f: record[f] for f in fields if record.get(f) not in (None, "", [])}
+            missing = [f for f in fields if f not in known]
+            logger.info(f"JobPosting structured data found, asking LLM for: {', '.join(missing)}")
+            schema = ", ".join(missing)
+
+        cleaned = compact_text(content)[:CONTENT_LIMIT]
+
+        prompt = f"""Extract data from this content according to the schema.
+
+    Content:
+    {cleaned}
+
+    Schema/Fields to extract: {schema}
+
+    Return ONLY a JSON object with the requested fields. Set fields to null if not found.
+    Example format: {{"title": "...", "location": "...", "description": "...", ...}}"""
+
+        response = await chat_completion(prompt, tool="extract_data", cache=True)
+        if not known:
+            return response
+        try:
+            filled = parse_json_object(response)
+        except ValueError as e:
+            # Keep the structured fields rather than losing the whole record
+            logger.warning(f"Unusable LLM reply for {', '.join(missing)}: {str(e)}")
+            filled = {f: None for f in missing}
+        return json.dumps({**known, **filled}, ensure_ascii=False)
+
+    # Agent tools
+
+    def get_analyze_tool(self):
+        @function_tool
+        async def analyze_content(content: str, question: str) -> str:
+            """Ask LLM to analyze page content (HTML or get_page_content output) and answer a question"""
+            try:
+                return await self.analyze(content, question)
+            except Exception as e:
+                return f"Analysis failed: {str(e)}"
+        return analyze_content
+
+    def get_extract_links_tool(self):
+        @function_tool
+        async def extract_links(content: str, criteria: str) -> str:
+            """Extract links from page content (HTML or get_page_content output) matching criteria"""
+            try:
+                return json.dumps(await self.find_links(content, criteria))
             except Exception as e:
                 logger.error(f"Link extraction exception: {str(e)}")
                 return "[]"
@@ -121,34 +206,8 @@ Provide a clear, actionable answer."""
         async def extract_data(content: str, schema: str) -> str:
             """Extract structured data from content based on schema"""
             try:
-                # Clean HTML
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                for tag in soup(['script', 'style', 'head', 'meta', 'link', 'noscript', 'svg', 'path', 'img', 'video']):
-                    tag.decompose()
-                
-                cleaned = str(soup)[:30000]
-                
-                prompt = f"""Extract data from this content according to the schema.
-
-    Content:
-    {cleaned}
-
-    Schema/Fields to extract: {schema}
-
-    Return ONLY a JSON object with the requested fields. Set fields to null if not found.
-    Example format: {{"title": "...", "location": "...", "description": "...", ...}}"""
-                
-                response = await self.client.chat.completions.create(
-                    model="gpt-5-mini",
-                    messages=[{"role": "user", "content": prompt}],
-                    # temperature=0
-                )
-                
-                return response.choices[0].message.content
-                
+                return await self.extract(content, schema)
             except Exception as e:
                 logger.error(f"Data extraction failed: {str(e)}")
                 return "{}"
-        return extract_data
\ No newline at end of file
+        return extract_data
@@ -0,0 +1,194 @@
+"""
+Model Routing - which model, token budget and local shortcut each tool uses
+Every LLM call names its tool. The routing table gives that tool a model tier
+and a completion budget, and optionally a local resolver that is tried first:
+when the answer is obvious from the page itself no request is made at all.
+How often each resolver answered on its own is counted and logged.
+"""
+
+import os
+import re
+import json
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Callable
+
+from utils.logger import setup_logger
+from .compact_dom import compact_page, css_selector, structured_job_record
+from .frame_scoring import JOB_LINK
+from .html_cleaner import clean_html
+from .structured_data import OPTIONAL_FIELDS
+
+logger = setup_logger(__name__)
+
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-5-mini")
+# Tier for yes/no and pick-one-element decisions
+FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-5-nano")
+
+
+@dataclass
+class Route:
+    model: str
+    # Completion budget (max_completion_tokens), reasoning tokens included
+    max_tokens: int = None
+    # reasoning_effort for models that take one
+    effort: str = None
+    # Called with the tool's inputs; a non-None result is the answer
+    resolver: Callable = None
+
+
+# Local resolvers
+
+NEXT_TEXT = re.compile(r"^(next|next page|more results|older|›|»|>|→|weiter|nächste|suivant|siguiente)$", re.IGNORECASE)
+LOAD_MORE_TEXT = re.compile(r"\b(load|show|view|see) more\b|\bmore (jobs|results|positions|openings)\b", re.IGNORECASE)
+
+# Job links that settle the iframe question without asking
+FRAME_JOB_LINKS = 3
+# Text below which a frame without job links is taken as empty
+FRAME_MIN_TEXT = 200
+
+_ELEMENT = re.compile(r'\[(e\d+) (link|button|input|select|textarea) ([^\]]*)\]')
+_LABEL = re.compile(r'"([^"]*)"')
+_FILLER_WORDS = {"the", "a", "an", "button", "link", "field", "input", "box", "click", "on", "to", "element"}
+_FILL_TAGS = ("input", "select", "textarea")
+
+
+def frame_has_jobs(html: str):
+    """YES when a frame is full of job links, NO when it is practically empty"""
+    page = compact_page(html)
+    job_links = sum(1 for link in page.links if JOB_LINK.search(link["url"]))
+    if job_links >= FRAME_JOB_LINKS:
+        return "YES"
+    if not job_links and len(page.text) < FRAME_MIN_TEXT:
+        return "NO"
+    return None
+
+
+def chunk_without_links(page_text: str):
+    """A chunk of compact text with no link in it has no job links"""
+    return None if " -> " in page_text else []
+
+
+def _words(text: str) -> str:
+    return " ".join(w for w in re.findall(r"\w+", text.lower()) if w not in _FILLER_WORDS)
+
+
+def element_by_label(page, description: str, kind: str):
+    """Id of the one element whose label matches the description"""
+    wanted = _words(description)
+    if len(wanted) < 3:
+        return None
+    exact, partial = [], []
+    for element_id, tag, attrs in _ELEMENT.findall(page.text):
+        if (tag in _FILL_TAGS) != (kind == "fill"):
+            continue
+        for label in _LABEL.findall(attrs):
+            label = _words(label)
+            if label == wanted:
+                exact.append(element_id)
+                break
+            if wanted in label:
+                partial.append(element_id)
+                break
+    matches = exact or partial
+    return matches[0] if len(set(matches)) == 1 else None
+
+
+def paging_control(html: str):
+    """(kind, selector) of an obvious "next" link or "load more" button"""
+    tree = clean_html(html).tree
+    for element in tree.iter('a', 'button'):
+        rel = (element.get('rel') or '').lower()
+        label = " ".join((element.get('aria-label') or "".join(element.itertext())).split())
+        if element.tag == 'a' and ('next' in rel.split() or NEXT_TEXT.match(label)):
+            return "next", css_selector(element)
+        if element.tag == 'button' and NEXT_TEXT.match(label):
+            return "next", css_selector(element)
+        if LOAD_MORE_TEXT.search(label):
+            return "load_more", css_selector(element)
+    return None
+
+
+def _present(value) -> bool:
+    return value not in (None, "", [])
+
+
+def structured_fields(content: str, fields: list):
+    """JSON of the requested fields when the page's JobPosting data has all but the optional ones"""
+    record = structured_job_record(content)
+    if not record or any(not _present(record.get(f)) for f in fields if f not in OPTIONAL_FIELDS):
+        return None
+    return json.dumps({f: record[f] if _present(record.get(f)) else None for f in fields}, ensure_ascii=False)
+
+
+ROUTES = {
+    "orchestrator": Route(DEFAULT_MODEL),
+    "analyze_content": Route(DEFAULT_MODEL, max_tokens=4000),
+    "extract_links": Route(DEFAULT_MODEL, max_tokens=16000, resolver=chunk_without_links),
+    "extract_data": Route(DEFAULT_MODEL, max_tokens=6000, resolver=structured_fields),
+    "find_selector": Route(FAST_MODEL, max_tokens=2000, effort="minimal", resolver=element_by_label),
+    "detect_paging": Route(FAST_MODEL, max_tokens=2000, effort="minimal", resolver=paging_control),
+    "classify_frame": Route(FAST_MODEL, max_tokens=1000, effort="minimal", resolver=frame_has_jobs),
+}
+
+DEFAULT_ROUTE = Route(DEFAULT_MODEL)
+
+
+class ModelRouter:
+    def __init__(self, routes: dict = None):
+        self.routes = dict(ROUTES if routes is None else routes)
+        self.local = Counter()
+        self.remote = Counter()
+        # {"tool": {"model": ..., "max_tokens": ..., "effort": ...}} overrides the table
+        overrides = os.getenv("MODEL_ROUTES")
+        if overrides:
+            try:
+                for tool, settings in json.loads(overrides).items():
+                    self.routes[tool] = replace(self.routes.get(tool, DEFAULT_ROUTE), **settings)
+            except Exception as e:
+                logger.warning(f"Ignoring invalid MODEL_ROUTES: {str(e)}")
+
+    def route(self, tool: str = None) -> Route:
+        return self.routes.get(tool, DEFAULT_ROUTE)
+
+    def resolve(self, tool: str, *args):
+        """Answer from the tool's local resolver, or None when the model has to decide"""
+        resolver = self.route(tool).resolver
+        if resolver is None:
+            return None
+        try:
+            answer = resolver(*args)
+        except Exception as e:
+            logger.debug(f"Local resolver for {tool} failed: {str(e)}")
+            answer = None
+        if answer is not None:
+            self.local[tool] += 1
+        return answer
+
+    def count_request(self, tool: str = None):
+        self.remote[tool or "default"] += 1
+
+    def stats(self) -> dict:
+        """Local answers and model requests per tool"""
+        tools = sorted(set(self.local) | set(self.remote))
+        return {tool: {"local": self.local[tool], "model": self.remote[tool]} for tool in tools}
+
+    def log_stats(self):
+        for tool, counts in self.stats().items():
+            total = counts["local"] + counts["model"]
+            logger.info(f"Model routing [{tool}]: {counts['local']}/{total} answered locally, "
+                        f"{counts['model']} sent to {self.route(tool).model}")
+
+
+_router = None
+
+
+def get_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        _router = ModelRouter()
+    return _router
+
+
+def resolve_locally(tool: str, *args):
+    return get_router().resolve(tool, *args)
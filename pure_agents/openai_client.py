@@ -0,0 +1,218 @@
+"""
+OpenAI Client - one pooled, long-lived client shared by every tool and the agent
+Connections are kept alive between calls and the number of in-flight
+requests is capped, whichever part of the system issues them. Every request
+also passes the shared rate limiter and is retried on its own when it fails.
+"""
+
+import os
+import asyncio
+import httpx
+from openai import AsyncOpenAI
+from utils.logger import setup_logger
+from utils import tracing
+from utils.tracing import get_tracer
+from .llm_cache import get_llm_cache, close_llm_cache
+from .model_routing import get_router
+from .rate_limiter import (MAX_RETRIES, RETRY_STATUSES, RPM_LIMIT, TPM_LIMIT, RateLimiter,
+                           estimate_tokens, retry_delay)
+
+logger = setup_logger(__name__)
+
+# Tunables, overridable from the environment
+MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "120"))
+REQUEST_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+
+
+class BoundedTransport(httpx.AsyncHTTPTransport):
+    """
+    HTTP transport that admits requests through the rate limiter, caps the
+    number in flight at once and retries each failed request with jitter
+    """
+
+    def __init__(self, max_in_flight: int, limiter: RateLimiter = None, **kwargs):
+        super().__init__(**kwargs)
+        self.max_in_flight = max_in_flight
+        self.limiter = limiter or RateLimiter()
+        self._semaphore = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+
+    async def handle_async_request(self, request):
+        # Created lazily so the semaphore belongs to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        tokens = estimate_tokens(request.content)
+
+        for attempt in range(MAX_RETRIES + 1):
+            await self.limiter.acquire(tokens)
+            try:
+                response = await self._send(request)
+            except (httpx.ConnectError, httpx.RemoteProtocolError, httpx.TimeoutException) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = retry_delay(attempt)
+                logger.warning(f"OpenAI request failed ({type(e).__name__}), retry {attempt + 1} in {delay:.1f}s")
+            else:
+                self.limiter.observe(response.headers)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return response
+                delay = retry_delay(attempt, response.headers)
+                await response.aclose()
+                if response.status_code == 429:
+                    self.limiter.pause(delay)
+                logger.warning(f"OpenAI returned {response.status_code}, retry {attempt + 1} in {delay:.1f}s")
+
+            self.limiter.retries += 1
+            tracing.add(retries=1)
+            await asyncio.sleep(delay)
+
+    async def _send(self, request):
+        await self._semaphore.acquire()
+        self.in_flight += 1
+        self.requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        tracing.add(http_requests=1)
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+        # The slot and its connection stay taken until the body has been read
+        response.stream = ReleasingStream(response.stream, self._release)
+        return response
+
+    def _release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+
+class ReleasingStream(httpx.AsyncByteStream):
+    """Response body that calls release() once, when it is closed"""
+
+    def __init__(self, stream, release):
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            if self.release is not None:
+                release, self.release = self.release, None
+                release()
+
+
+_client = None
+_transport = None
+
+
+def get_client() -> AsyncOpenAI:
+    """Return the shared client, creating it on first use"""
+    global _client, _transport
+    if _client is None:
+        _transport = BoundedTransport(
+            max_in_flight=MAX_CONCURRENCY,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            )
+        )
+        http_client = httpx.AsyncClient(
+            transport=_transport,
+            timeout=REQUEST_TIMEOUT
+        )
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=http_client,
+            # Retries happen per request in the transport, behind the rate limiter
+            max_retries=0
+        )
+        logger.info(
+            f"OpenAI client ready (max {MAX_CONCURRENCY} in flight, "
+            f"{MAX_CONNECTIONS} pooled connections, "
+            f"{RPM_LIMIT or 'unlimited'} RPM / {TPM_LIMIT or 'unlimited'} TPM)"
+        )
+    return _client
+
+
+async def chat_completion(prompt: str, model: str = None, tool: str = None,
+                          cache: bool = False, **kwargs) -> str:
+    """
+    Send a single-message chat completion through the shared client.
+    Model and completion budget come from the routing table entry of `tool`
+    unless given. With cache=True identical (model, budget, prompt) requests are
+    answered from the persistent LLM cache, counted under `tool`; only complete
+    replies are stored.
+    """
+    route = get_router().route(tool)
+    model = model or route.model
+    if route.max_tokens:
+        kwargs.setdefault("max_completion_tokens", route.max_tokens)
+    if route.effort:
+        kwargs.setdefault("reasoning_effort", route.effort)
+
+    async with get_tracer().span(tool or "chat_completion", kind="openai", model=model):
+        llm_cache = get_llm_cache() if cache else None
+        if llm_cache is not None:
+            key = llm_cache.make_key(model, prompt, kwargs.get("max_completion_tokens"),
+                                     kwargs.get("reasoning_effort"))
+            cached = llm_cache.get(key, tool or "default")
+            if cached is not None:
+                return cached
+
+        get_router().count_request(tool)
+        response = await get_client().chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
+        )
+        content = response.choices[0].message.content
+        finish_reason = response.choices[0].finish_reason
+        if finish_reason == "length":
+            logger.warning(f"{tool or 'chat_completion'} hit its {kwargs.get('max_completion_tokens')} token budget")
+
+        if response.usage is not None:
+            tracing.add(prompt_tokens=response.usage.prompt_tokens,
+                        completion_tokens=response.usage.completion_tokens)
+
+        # A reply cut off by the budget or a filter is never served again
+        if llm_cache is not None and content and finish_reason == "stop":
+            llm_cache.set(key, content, tool or "default")
+        return content
+
+
+def client_stats() -> dict:
+    if _transport is None:
+        return {"requests": 0, "peak_in_flight": 0, "throttled": 0, "wait_time": 0.0, "retries": 0}
+    return {
+        "requests": _transport.requests,
+        "peak_in_flight": _transport.peak_in_flight,
+        **_transport.limiter.stats(),
+    }
+
+
+async def close_client():
+    """Close the shared client and its connection pool"""
+    global _client, _transport
+    if _client is not None:
+        stats = client_stats()
+        logger.info(
+            f"OpenAI client: {stats['requests']} requests, "
+            f"peak {stats['peak_in_flight']} in flight, "
+            f"{stats['throttled']} throttled ({stats['wait_time']:.1f}s), "
+            f"{stats['retries']} retries"
+        )
+        await _client.close()
+    get_router().log_stats()
+    close_llm_cache()
+    _client = None
+    _transport = None
@@ -5,7 +5,9 @@ NO hardcoded logic - pure agent decisions
 
 from agents import Agent
 from utils.logger import setup_logger
+from utils.tracing import get_tracer
 from .debug_tools import create_debug_tools
+from .model_routing import get_router
 
 logger = setup_logger(__name__)
 
@@ -23,8 +25,11 @@ TOOLS:
 - fill_input(description, value)
 - extract_links(content, criteria)
 - extract_data(content, schema)
+- scrape_job_details(urls)
+- harvest_job_links(criteria, max_pages)
 - log_progress(step, details)
 - check_and_enter_job_iframe()
+- remember_listing_route(careers_url, listing_url, access_method)
 
 EXACT ALGORITHM - FOLLOW THIS:
 STEP 1: FIND COMPANY WEBSITE
@@ -60,20 +65,20 @@ STEP 3: FIND ALL JOB LISTINGS PAGE
   * If "View All" link exists: click_element("view all jobs link")
   * If ALL listings visible: continue
 - log_progress("Found job listings method", "method used")
-- Wait 2-3 seconds after navigation to confirm dynamic content has loaded
+- remember_listing_route(careers_url, url of the page where the method was applied, one of "visible", "view_all", "search", "iframe")
 
 STEP 4: EXTRACT MATCHING JOB LINKS
-- get_page_content()
-- extract_links(content, "job posting links that match title: {job_title}")
+- harvest_job_links("job posting links that match title: {job_title}")
+- This reads the listing AND follows next pages / "load more" / scrolling by itself
+- Do NOT click through pages yourself
 - Parse the JSON response
 - log_progress("Found jobs", "count: X")
 
-STEP 5: SCRAPE EACH JOB
-- For each job URL:
-  * navigate_to_url(job_url)
-  * get_page_content()
-  * extract_data(content, "title, company, location, description, requirements, salary, employment_type, posted_date")
-  * Add to results array
+STEP 5: SCRAPE ALL JOBS AT ONCE
+- scrape_job_details([every job URL from Step 4])
+- This visits all jobs in parallel and returns a JSON array of records
+- Use those records as the results array
+- Only for a record with an "error" field: navigate_to_url(job_url), get_page_content(), extract_data(content, "title, company, location, description, requirements, salary, employment_type, posted_date")
 
 STEP 6: RETURN RESULTS
 - Return JSON: {"jobs": [
@@ -95,9 +100,10 @@ CRITICAL RULES:
 - Do NOT search DuckDuckGo multiple times
 - Follow the algorithm IN ORDER
 - Use log_progress after EVERY step
+- If navigate_to_url or check_and_enter_job_iframe says a job board was read through its API, the jobs are already scraped: go straight to STEP 6
 - If a step fails, try ONE alternative then move on
 - Extract data even if incomplete
-- Wait 2-3 seconds after navigating to page to confirm all dynamic data has loaded
+- Do NOT wait after navigating or clicking; the tools already wait until the page has settled
 
 START NOW.
 START IMMEDIATELY. NO QUESTIONS.
@@ -111,14 +117,20 @@ START IMMEDIATELY. NO QUESTIONS.
       browser_tool.get_fill_tool(),
       llm_tool.get_extract_links_tool(),
       llm_tool.get_extract_data_tool(),
+      browser_tool.get_harvest_tool(llm_tool),
+      browser_tool.get_scrape_details_tool(llm_tool),
       # browser_tool.get_iframe_tool(),
-      browser_tool.get_job_iframe_tool(llm_tool)
+      browser_tool.get_job_iframe_tool(llm_tool),
+      browser_tool.get_route_tool()
    ] + create_debug_tools()
+   # Every tool call becomes a span in the run trace
+   tracer = get_tracer()
+   all_tools = [tracer.wrap_tool(tool) for tool in all_tools]
    # Create agent with tools
    agent = Agent(
       name="UniversalScraperOrchestrator",
       instructions=instructions,
-      model="gpt-5-mini",  # Use best model for complex decisions
+      model=get_router().route("orchestrator").model,
       tools=all_tools
       # max_turns=50 
    )
@@ -0,0 +1,58 @@
+"""
+Page Pool - a fixed number of reusable Playwright pages on one browser context
+"""
+
+import asyncio
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class PagePool:
+    def __init__(self, context, size: int = 4, timeout: int = 30000):
+        self.context = context
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle = asyncio.Queue()
+        self._pages = []
+        # One slot per page in use; taken before a page is opened, so callers
+        # racing through gather() cannot open more than `size` pages
+        self._slots = asyncio.Semaphore(self.size)
+
+    async def acquire(self):
+        """Get an idle page, opening a new one while under the pool size"""
+        await self._slots.acquire()
+        try:
+            if not self._idle.empty():
+                return self._idle.get_nowait()
+            page = await self.context.new_page()
+            page.set_default_timeout(self.timeout)
+            self._pages.append(page)
+            return page
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, page):
+        self._idle.put_nowait(page)
+        self._slots.release()
+
+    async def map(self, func, items):
+        """Run func(page, item) for every item, at most `size` at a time, keeping order"""
+        async def run(item):
+            page = await self.acquire()
+            try:
+                return await func(page, item)
+            finally:
+                self.release(page)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+    async def close(self):
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception as e:
+                logger.error(f"Page pool close error: {str(e)}")
+        self._pages = []
+        self._idle = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.size)
@@ -0,0 +1,122 @@
+"""
+Page Settle - wait until a page has stopped changing instead of sleeping
+A page is settled once the DOM has had no mutations and the network no
+new or pending requests for a quiet window, bounded by a timeout.
+"""
+
+import os
+import time
+import asyncio
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SETTLE_TIMEOUT = float(os.getenv("SETTLE_TIMEOUT", "10"))
+SETTLE_QUIET_MS = float(os.getenv("SETTLE_QUIET_MS", "500"))
+POLL_INTERVAL = 0.1
+
+# Requests that stay open by design and never "finish"
+LONG_LIVED_TYPES = {"websocket", "eventsource"}
+# Requests pending longer than this are treated as long-polling, not loading
+STALE_REQUEST_SECONDS = 5.0
+
+# Installs a MutationObserver once per document and returns ms since the last mutation
+DOM_IDLE_JS = """() => {
+    if (!window.__settle) {
+        window.__settle = {last: performance.now()};
+        new MutationObserver(() => { window.__settle.last = performance.now(); })
+            .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        return 0;
+    }
+    return performance.now() - window.__settle.last;
+}"""
+
+
+class _NetworkTracker:
+    """Pending requests and time of the last network activity for one page"""
+
+    def __init__(self, page):
+        self.pending = {}
+        self.last_activity = time.monotonic()
+        page.on("request", self._started)
+        page.on("requestfinished", self._done)
+        page.on("requestfailed", self._done)
+
+    def _started(self, request):
+        if request.resource_type in LONG_LIVED_TYPES:
+            return
+        self.pending[request] = time.monotonic()
+        self.last_activity = time.monotonic()
+
+    def _done(self, request):
+        self.pending.pop(request, None)
+        self.last_activity = time.monotonic()
+
+    def quiet_for(self) -> float:
+        """Seconds the network has been quiet, 0 while a recent request is pending"""
+        now = time.monotonic()
+        if any(now - started < STALE_REQUEST_SECONDS for started in self.pending.values()):
+            return 0.0
+        return now - self.last_activity
+
+
+def _tracker(page):
+    # Frames report network activity through the page they belong to
+    owner = getattr(page, "page", page)
+    tracker = getattr(owner, "_settle_tracker", None)
+    if tracker is None:
+        tracker = _NetworkTracker(owner)
+        owner._settle_tracker = tracker
+    return tracker
+
+
+def track(page):
+    """Start watching a page's network activity, ideally before its first navigation"""
+    _tracker(page)
+
+
+class SettleStats:
+    def __init__(self):
+        self.calls = 0
+        self.total_wait = 0.0
+        self.timeouts = 0
+
+    def record(self, waited: float, timed_out: bool):
+        self.calls += 1
+        self.total_wait += waited
+        self.timeouts += int(timed_out)
+
+    def summary(self) -> str:
+        average = self.total_wait / self.calls if self.calls else 0.0
+        return (f"{self.calls} settles, {self.total_wait:.1f}s total wait "
+                f"({average:.2f}s avg), {self.timeouts} timeouts")
+
+
+async def wait_for_settle(page, timeout: float = SETTLE_TIMEOUT,
+                          quiet_ms: float = SETTLE_QUIET_MS, stats: SettleStats = None) -> float:
+    """Wait until DOM and network are quiet for quiet_ms. Returns seconds waited."""
+    tracker = _tracker(page)
+    quiet = quiet_ms / 1000
+    start = time.monotonic()
+    timed_out = False
+
+    while True:
+        try:
+            dom_idle = await page.evaluate(DOM_IDLE_JS) / 1000
+        except Exception:
+            # Document is being replaced mid-navigation
+            dom_idle = 0.0
+
+        if dom_idle >= quiet and tracker.quiet_for() >= quiet:
+            break
+        if time.monotonic() - start >= timeout:
+            timed_out = True
+            break
+        await asyncio.sleep(POLL_INTERVAL)
+
+    waited = time.monotonic() - start
+    if stats is not None:
+        stats.record(waited, timed_out)
+    if timed_out:
+        logger.info(f"Page still busy after {timeout:.0f}s, continuing")
+    return waited
@@ -0,0 +1,249 @@
+"""
+Job Pipeline - the orchestrator's fixed algorithm run as code
+Steps 1-6 of the orchestrator prompt executed directly against BrowserTool
+and LLMAnalysisTool. Local page signals settle most steps; the LLM is only
+asked where a real decision is left: which search result is the company,
+which link leads to the careers page, how the listings are reached. A step
+that cannot be completed raises PipelineError, and the caller hands the run
+over to the free-form agent.
+"""
+
+import re
+from urllib.parse import parse_qs, quote_plus, urljoin, urlparse
+
+from utils.logger import setup_logger
+from .frame_scoring import JOB_LINK, is_non_job_host
+from .harvester import LinkHarvester
+
+logger = setup_logger(__name__)
+
+SEARCH_URL = "https://html.duckduckgo.com/html/?q={query}"
+
+CAREERS_TEXT = re.compile(
+    r"\b(careers?|jobs?|join (us|our team)|work (with|for) us|open (positions|roles)|vacancies|"
+    r"karriere|stellen\w*|emplois?|empleos?|carri[eè]res?)\b",
+    re.IGNORECASE
+)
+CAREERS_URL = re.compile(r"(career|/jobs?\b|join|karriere|stellen|vacanc|emploi|empleo)", re.IGNORECASE)
+VIEW_ALL_TEXT = re.compile(
+    r"\b(view|see|show|browse|search|explore) (all )?(current |open )?(jobs|openings|positions|roles|vacancies|"
+    r"opportunities)\b|\ball (jobs|openings|positions|roles)\b|\bfind (a|your) (job|role)\b",
+    re.IGNORECASE
+)
+SEARCH_FIELD = re.compile(
+    r'\[(e\d+) input [^\]]*(type="search"|(placeholder|aria-label|name)="[^"]*(job|search|keyword|title|position))',
+    re.IGNORECASE
+)
+BUTTON = re.compile(r'\[(e\d+) button "([^"]*)"\]')
+URL = re.compile(r"https?://[^\s\"'<>()\]]+|(?<![\w/])/[\w\-./?=&%#]+")
+
+# Job-like links that make a page count as the listing
+MIN_LISTING_LINKS = 3
+
+
+class PipelineError(Exception):
+    """A step the pipeline could not complete on its own"""
+
+    def __init__(self, step: str, message: str):
+        super().__init__(message)
+        self.step = step
+
+
+def job_links(page) -> list:
+    return [link for link in page.links if JOB_LINK.search(link["url"]) and link["text"]]
+
+
+def _first_url(answer: str):
+    match = URL.search(answer or "")
+    return match.group(0).rstrip(".,;") if match else None
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", (text or "").lower())
+
+
+class JobPipeline:
+    def __init__(self, browser_tool, llm_tool):
+        self.browser = browser_tool
+        self.llm = llm_tool
+
+    def board_read(self) -> bool:
+        """Whether an ATS board already delivered every posting of this run"""
+        route = self.browser.route or {}
+        return route.get("access_method") == "ats"
+
+    async def run(self, job_params: dict, route: dict = None) -> dict:
+        title = job_params["job_title"]
+        if route:
+            await self.replay_route(route, title)
+        else:
+            await self.find_company_site(job_params)
+            if not self.board_read():
+                await self.find_careers_page()
+            if not self.board_read():
+                await self.open_listings(title)
+
+        records = []
+        if not self.board_read():
+            links = await self.harvest(title)
+            records = await self.browser.scrape_details([link["url"] for link in links], self.llm)
+        jobs = [r for r in records if "error" not in r]
+        return {"jobs": jobs, "total_found": len(jobs), "search_query": title}
+
+    # STEP 1
+
+    async def find_company_site(self, job_params: dict):
+        if job_params.get("company_domain"):
+            await self.browser.navigate(job_params["company_domain"])
+            return
+
+        name = job_params["company_name"]
+        await self.browser.navigate(SEARCH_URL.format(query=quote_plus(name)))
+        page = await self.browser.snapshot()
+        candidates = []
+        for link in page.links:
+            url = urljoin(self.browser.page.url, link["url"])
+            # Result links go through the search engine's redirect
+            url = (parse_qs(urlparse(url).query).get("uddg") or [url])[0]
+            host = urlparse(url).netloc.lower()
+            if host and "duckduckgo" not in host and not is_non_job_host(url) and url not in candidates:
+                candidates.append(url)
+        if not candidates:
+            raise PipelineError("company site", f"no search results for {name}")
+
+        # A result whose host carries the company name needs no judgement
+        slug = _slug(name)
+        site = next((url for url in candidates if slug and slug in _slug(urlparse(url).netloc)), None)
+        if site is None:
+            answer = await self.llm.analyze(
+                "\n".join(candidates[:20]),
+                f"Which of these URLs is the official website of {name}, or its careers site? "
+                f"Do not pick login pages. Answer with the URL only."
+            )
+            site = _first_url(answer)
+        if not site:
+            raise PipelineError("company site", f"could not tell which result is {name}")
+        logger.info(f"Company site: {site}")
+        await self.browser.navigate(site)
+
+    # STEP 2
+
+    async def find_careers_page(self):
+        page = await self.browser.snapshot()
+        if len(job_links(page)) >= MIN_LISTING_LINKS:
+            logger.info("Landing page already lists jobs")
+            return
+
+        scores = {}
+        for link in page.links:
+            href = link["url"]
+            if not href or href.startswith(("#", "mailto:", "tel:", "javascript:")):
+                continue
+            score = 2 * bool(CAREERS_TEXT.search(link["text"])) + bool(CAREERS_URL.search(href))
+            if score:
+                scores[href] = max(score, scores.get(href, 0))
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if best and (len(best) == 1 or best[0][1] > best[1][1]):
+            careers_url = best[0][0]
+        else:
+            answer = await self.llm.analyze(page.text, "What is the URL/link to the careers or jobs page? "
+                                                       "Answer with the URL only.")
+            careers_url = _first_url(answer)
+        if not careers_url:
+            raise PipelineError("careers page", "no careers link found")
+
+        careers_url = urljoin(self.browser.page.url, careers_url)
+        logger.info(f"Careers page: {careers_url}")
+        await self.browser.navigate(careers_url)
+
+    # STEP 3
+
+    async def open_listings(self, title: str):
+        careers_url = self.browser.page.url
+        page = await self.browser.snapshot()
+        if len(job_links(page)) >= MIN_LISTING_LINKS:
+            self.remember(careers_url, careers_url, "visible")
+            return
+
+        entered = await self.browser.enter_job_iframe()
+        if self.board_read():
+            return
+        if entered.startswith("Switched"):
+            self.remember(careers_url, careers_url, "iframe")
+            return
+
+        method = self.local_access_method(page)
+        if method is None:
+            answer = (await self.llm.analyze(
+                page.text,
+                "How do I access ALL job listings? Is there a search bar, a 'View All Jobs' or 'Find a Job' "
+                "link, or are listings already visible? Answer with one of: search, view_all, visible."
+            )).lower()
+            if "search" in answer:
+                method = ("search", "job search input")
+            elif "view" in answer:
+                method = ("view_all", "view all jobs link")
+            else:
+                method = ("visible", None)
+
+        kind, element = method
+        if kind == "view_all":
+            await self.browser.click(element)
+        elif kind == "search":
+            await self.browser.fill(element, title)
+
+        if not job_links(await self.browser.snapshot()) and kind != "visible":
+            raise PipelineError("listings", f"no job listings after {kind}")
+        self.remember(careers_url, careers_url, kind)
+
+    @staticmethod
+    def local_access_method(page):
+        """(method, element) when the page shows an obvious way to the listings"""
+        for link in page.links:
+            if VIEW_ALL_TEXT.search(link["text"]):
+                return "view_all", link["id"]
+        for element_id, label in BUTTON.findall(page.text):
+            if VIEW_ALL_TEXT.search(label):
+                return "view_all", element_id
+        match = SEARCH_FIELD.search(page.text)
+        if match:
+            return "search", match.group(1)
+        return None
+
+    def remember(self, careers_url: str, listing_url: str, access_method: str):
+        """Same route record remember_listing_route keeps for the agent"""
+        logger.info(f"Listings reached: {access_method} at {listing_url}")
+        self.browser.route = {
+            "careers_url": careers_url,
+            "listing_url": listing_url,
+            "iframe_index": self.browser.iframe_index,
+            "access_method": access_method
+        }
+
+    async def replay_route(self, route: dict, title: str):
+        """Steps 1-3 from a known route"""
+        await self.browser.navigate(route["listing_url"])
+        if self.board_read():
+            return
+        if route.get("iframe_index") is not None or route.get("access_method") == "iframe":
+            if not (await self.browser.enter_job_iframe()).startswith("Switched") and not self.board_read():
+                raise PipelineError("route", "remembered iframe not found")
+        if route.get("access_method") == "search":
+            await self.browser.fill("job search input", title)
+        elif route.get("access_method") == "view_all":
+            await self.browser.click("view all jobs link")
+        self.browser.route = dict(route)
+
+    # STEP 4
+
+    async def harvest(self, title: str) -> list:
+        if self.browser.run_state:
+            self.browser.run_state.set_listing_url(self.browser.page.url)
+        links = await LinkHarvester(self.browser, self.llm).harvest(
+            f"job posting links that match title: {title}", on_links=self.browser.on_links
+        )
+        if not links:
+            raise PipelineError("job links", f"no links matching {title} on {self.browser.page.url}")
+        logger.info(f"Found {len(links)} job links")
+        return links
@@ -0,0 +1,169 @@
+"""
+Posting Store - last extracted record of every job posting, for incremental re-crawls
+Each posting keeps a fingerprint of its normalized content and the HTTP
+validators (ETag, Last-Modified) of its page. On the next crawl an unchanged
+posting is served from the store without another extraction, and the run
+reports which postings are new, changed or gone.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+from utils.logger import setup_logger
+from utils import tracing
+from .compact_dom import compact_page
+
+logger = setup_logger(__name__)
+
+DEFAULT_PATH = os.getenv("POSTING_STORE_PATH", ".cache/postings.sqlite")
+
+
+def fingerprint(html: str) -> str:
+    """Hash of what extraction sees: the compact page text without element ids"""
+    text = re.sub(r"\[e\d+ ", "[", compact_page(html).text)
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8", "replace")).hexdigest()
+
+
+def record_fingerprint(record: dict) -> str:
+    """Hash of a record that came from an API rather than a page"""
+    return hashlib.sha256(json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class PostingStore:
+    def __init__(self, path: str = DEFAULT_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                scope TEXT NOT NULL,
+                url TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                record TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                last_changed REAL NOT NULL,
+                removed REAL,
+                PRIMARY KEY (scope, url)
+            )
+        """)
+        self.db.commit()
+
+    def start_run(self, scope: str) -> "PostingRun":
+        return PostingRun(self, scope)
+
+    def close(self):
+        self.db.close()
+
+
+class PostingRun:
+    """One crawl of one query: lookups, updates and the new/changed/removed report"""
+
+    def __init__(self, store: PostingStore, scope: str):
+        self.store = store
+        self.db = store.db
+        self.scope = scope
+        self.new = []
+        self.changed = []
+        self.unchanged = []
+        # Every posting URL the crawl came across, scraped or not
+        self.seen = set()
+
+    def get(self, url: str):
+        """Stored posting for url: fingerprint, etag, last_modified and record"""
+        row = self.db.execute(
+            "SELECT fingerprint, etag, last_modified, record FROM postings "
+            "WHERE scope = ? AND url = ? AND removed IS NULL",
+            (self.scope, url)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"fingerprint": row[0], "etag": row[1], "last_modified": row[2], "record": json.loads(row[3])}
+
+    def keep(self, url: str, etag: str = None, last_modified: str = None) -> dict:
+        """Mark a posting as seen and unchanged; returns its stored record"""
+        known = self.get(url)
+        self.db.execute(
+            "UPDATE postings SET last_seen = ?, etag = COALESCE(?, etag), "
+            "last_modified = COALESCE(?, last_modified) WHERE scope = ? AND url = ?",
+            (time.time(), etag, last_modified, self.scope, url)
+        )
+        self.db.commit()
+        self.unchanged.append(url)
+        tracing.add(cache_hits=1)
+        return dict(known["record"], url=url)
+
+    def save(self, url: str, fingerprint: str, record: dict, etag: str = None, last_modified: str = None):
+        """Store a freshly extracted posting, counting it as new or changed"""
+        now = time.time()
+        existed = self.db.execute(
+            "SELECT removed FROM postings WHERE scope = ? AND url = ?", (self.scope, url)
+        ).fetchone()
+        if existed is not None and existed[0] is None:
+            self.changed.append(url)
+        else:
+            self.new.append(url)
+        self.db.execute(
+            "INSERT INTO postings (scope, url, fingerprint, etag, last_modified, record, "
+            "first_seen, last_seen, last_changed, removed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL) "
+            "ON CONFLICT(scope, url) DO UPDATE SET fingerprint = excluded.fingerprint, "
+            "etag = excluded.etag, last_modified = excluded.last_modified, record = excluded.record, "
+            "last_seen = excluded.last_seen, last_changed = excluded.last_changed, removed = NULL",
+            (self.scope, url, fingerprint, etag, last_modified, json.dumps(record, ensure_ascii=False),
+             now, now, now)
+        )
+        self.db.commit()
+
+    def finish(self) -> dict:
+        """Mark postings this crawl no longer found as removed and return the change report"""
+        seen = self.seen
+        removed = []
+        # Nothing seen means the listing wasn't reached, not that every job is gone
+        if seen:
+            rows = self.db.execute(
+                "SELECT url FROM postings WHERE scope = ? AND removed IS NULL", (self.scope,)
+            ).fetchall()
+            removed = [url for (url,) in rows if url not in seen]
+            now = time.time()
+            self.db.executemany(
+                "UPDATE postings SET removed = ? WHERE scope = ? AND url = ?",
+                [(now, self.scope, url) for url in removed]
+            )
+            self.db.commit()
+
+        logger.info(f"Postings: {len(self.new)} new, {len(self.changed)} changed, "
+                    f"{len(self.unchanged)} unchanged, {len(removed)} removed")
+        return {
+            "new": self.new,
+            "changed": self.changed,
+            "unchanged": len(self.unchanged),
+            "removed": removed,
+        }
+
+
+_store = None
+
+
+def get_posting_store():
+    """Shared store, or None when disabled with POSTING_STORE=0"""
+    global _store
+    if os.getenv("POSTING_STORE", "1") == "0":
+        return None
+    if _store is None:
+        _store = PostingStore()
+    return _store
+
+
+def close_posting_store():
+    global _store
+    if _store is not None:
+        _store.close()
+    _store = None
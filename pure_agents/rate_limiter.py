@@ -0,0 +1,149 @@
+"""
+Rate Limiter - admission control for every OpenAI request
+Requests-per-minute and tokens-per-minute token buckets shared by the agent
+model and all tool calls. Each request is admitted only once both buckets
+can cover it, using a token estimate made before it is sent.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Account limits; 0 disables a bucket
+RPM_LIMIT = int(os.getenv("OPENAI_RPM", "500"))
+TPM_LIMIT = int(os.getenv("OPENAI_TPM", "200000"))
+
+# Completion tokens assumed when a request sets no max_tokens
+COMPLETION_ESTIMATE = int(os.getenv("OPENAI_COMPLETION_ESTIMATE", "1000"))
+
+# Per-request retries on 429, 5xx and connection errors
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+RETRY_BASE = float(os.getenv("OPENAI_RETRY_BASE", "1.0"))
+RETRY_MAX = float(os.getenv("OPENAI_RETRY_MAX", "60"))
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(body: bytes) -> int:
+    """Prompt tokens (about 4 characters each) plus the completion budget of a request body"""
+    completion = COMPLETION_ESTIMATE
+    try:
+        payload = json.loads(body)
+        for key in ("max_completion_tokens", "max_tokens", "max_output_tokens"):
+            if payload.get(key):
+                completion = int(payload[key])
+                break
+    except (ValueError, TypeError, AttributeError):
+        pass
+    return len(body) // 4 + completion
+
+
+def retry_delay(attempt: int, headers=None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+    delay = random.uniform(0, min(RETRY_MAX, RETRY_BASE * 2 ** attempt))
+    if headers is not None:
+        try:
+            if headers.get("retry-after-ms"):
+                delay = max(delay, float(headers["retry-after-ms"]) / 1000)
+            elif headers.get("retry-after"):
+                delay = max(delay, float(headers["retry-after"]))
+        except ValueError:
+            pass
+    return min(delay, RETRY_MAX)
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding at most one minute of budget"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def sync(self, remaining: float):
+        """Trust the server's view when it has less budget left than we think"""
+        self._refill()
+        self.level = min(self.level, remaining)
+
+
+class RateLimiter:
+    def __init__(self, rpm: int = RPM_LIMIT, tpm: int = TPM_LIMIT):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.paused_until = 0.0
+        # Created lazily so the lock belongs to the running loop
+        self._lock = None
+        self.admitted = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+        self.retries = 0
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until one request of `tokens` fits both budgets; returns seconds waited"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        start = time.monotonic()
+        # One request is admitted at a time, in arrival order
+        async with self._lock:
+            while True:
+                wait = max(
+                    self.paused_until - time.monotonic(),
+                    self.requests.wait_time(1) if self.requests else 0.0,
+                    self.tokens.wait_time(tokens) if self.tokens else 0.0,
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+
+        waited = time.monotonic() - start
+        self.admitted += 1
+        if waited > 0.01:
+            self.throttled += 1
+            self.wait_time += waited
+        return waited
+
+    def observe(self, headers):
+        """Sync the buckets with the x-ratelimit-remaining-* headers of a response"""
+        try:
+            if self.requests and headers.get("x-ratelimit-remaining-requests"):
+                self.requests.sync(float(headers["x-ratelimit-remaining-requests"]))
+            if self.tokens and headers.get("x-ratelimit-remaining-tokens"):
+                self.tokens.sync(float(headers["x-ratelimit-remaining-tokens"]))
+        except ValueError:
+            pass
+
+    def pause(self, seconds: float):
+        """Hold back every request after a 429, not just the one that got it"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict:
+        return {
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "wait_time": self.wait_time,
+            "retries": self.retries,
+        }
@@ -0,0 +1,88 @@
+"""
+Route Cache - remembers how each company's job listings were reached
+A route is the outcome of orchestrator steps 1-3: domain, careers URL,
+listing URL, iframe index and access method. Repeat runs start directly
+at the listings step.
+"""
+
+import os
+import re
+import json
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_PATH = os.getenv("ROUTE_CACHE_PATH", ".cache/routes.json")
+
+ACCESS_METHODS = ("visible", "view_all", "search", "iframe", "ats")
+
+
+def company_key(job_params: dict) -> str:
+    """Stable key for a company from whatever the user gave us"""
+    company = job_params.get("company_domain") or job_params.get("company_name") or ""
+    return re.sub(r"[^a-z0-9.]+", " ", company.lower()).strip()
+
+
+class RouteCache:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = Path(path)
+        self.routes = {}
+        if self.path.exists():
+            try:
+                self.routes = json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable route cache {self.path}: {str(e)}")
+
+    def get(self, job_params: dict):
+        return self.routes.get(company_key(job_params))
+
+    def save(self, job_params: dict, route: dict):
+        key = company_key(job_params)
+        route = {
+            "domain": urlparse(route.get("listing_url") or route.get("careers_url") or "").netloc,
+            **route,
+            "updated": time.time()
+        }
+        self.routes[key] = route
+        self._write()
+        logger.info(f"Saved route for '{key}': {route.get('access_method')} at {route.get('listing_url')}")
+
+    def forget(self, job_params: dict):
+        key = company_key(job_params)
+        if self.routes.pop(key, None) is not None:
+            self._write()
+            logger.info(f"Dropped stale route for '{key}'")
+
+    def _write(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.routes, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as e:
+            logger.warning(f"Could not save route cache: {str(e)}")
+
+
+def describe_route(route: dict, job_title: str) -> str:
+    """Agent instructions for replaying a known route instead of Steps 1-3"""
+    steps = [f"- navigate_to_url(\"{route['listing_url']}\")"]
+    if route.get("iframe_index") is not None or route.get("access_method") == "iframe":
+        steps.append("- check_and_enter_job_iframe()")
+    if route.get("access_method") == "search":
+        steps.append(f"- fill_input(\"job search input\", \"{job_title}\")")
+    elif route.get("access_method") == "view_all":
+        steps.append("- click_element(\"view all jobs link\")")
+    return "\n".join(steps)
+
+
+_cache = None
+
+
+def get_route_cache() -> RouteCache:
+    global _cache
+    if _cache is None:
+        _cache = RouteCache()
+    return _cache
@@ -0,0 +1,88 @@
+"""
+Selector Cache - remembers which CSS selector worked for an element description
+Keyed by domain, URL pattern and description, persisted as JSON so repeat
+visits to a site don't need the LLM to find the same element again.
+"""
+
+import os
+import re
+import json
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_PATH = os.getenv("SELECTOR_CACHE_PATH", ".cache/selectors.json")
+
+# Path segments that identify one record rather than a kind of page
+_VARIABLE_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-f]{8,}|[0-9a-f-]{32,36}|.*\d{4,}.*)$", re.IGNORECASE
+)
+
+
+def url_pattern(url: str) -> tuple:
+    """(domain, path pattern) for a URL, e.g. jobs.acme.com/job/*/apply"""
+    parsed = urlparse(url)
+    domain = parsed.netloc.lower()
+    if domain.startswith("www."):
+        domain = domain[4:]
+    segments = [
+        "*" if _VARIABLE_SEGMENT.match(seg) else seg.lower()
+        for seg in parsed.path.split("/") if seg
+    ]
+    return domain, "/" + "/".join(segments)
+
+
+class SelectorCache:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self.entries = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable selector cache {self.path}: {str(e)}")
+
+    @staticmethod
+    def make_key(url: str, kind: str, description: str) -> str:
+        domain, pattern = url_pattern(url)
+        description = " ".join(description.lower().split())
+        return f"{domain}|{pattern}|{kind}|{description}"
+
+    def get(self, url: str, kind: str, description: str):
+        entry = self.entries.get(self.make_key(url, kind, description))
+        return entry["selector"] if entry else None
+
+    def remember(self, url: str, kind: str, description: str, selector: str):
+        self.entries[self.make_key(url, kind, description)] = {
+            "selector": selector,
+            "updated": time.time()
+        }
+        self._save()
+
+    def forget(self, url: str, kind: str, description: str):
+        if self.entries.pop(self.make_key(url, kind, description), None) is not None:
+            self._save()
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.entries, indent=1), encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as e:
+            logger.warning(f"Could not save selector cache: {str(e)}")
+
+
+_cache = None
+
+
+def get_selector_cache() -> SelectorCache:
+    global _cache
+    if _cache is None:
+        _cache = SelectorCache()
+    return _cache
@@ -0,0 +1,228 @@
+"""
+Static Fetch - plain HTTP first, the browser only when a page needs JavaScript
+A pooled aiohttp GET is tried before rendering a job detail page. If the
+response already holds what we need (a JobPosting or enough text) the browser
+is skipped.
+Which strategy worked is remembered per domain, so server-rendered sites go
+straight to HTTP and JavaScript-only sites straight to the browser.
+"""
+
+import os
+import json
+import time
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import aiohttp
+
+from utils.logger import setup_logger
+from utils.tracing import get_tracer
+from .html_cleaner import clean_html
+from .structured_data import find_job_posting
+
+logger = setup_logger(__name__)
+
+ENABLED = os.getenv("STATIC_FETCH", "1") != "0"
+DEFAULT_PATH = os.getenv("FETCH_STRATEGY_PATH", ".cache/fetch_strategies.json")
+FETCH_TIMEOUT = float(os.getenv("STATIC_FETCH_TIMEOUT", "15"))
+FETCH_CONCURRENCY = int(os.getenv("STATIC_FETCH_CONCURRENCY", "16"))
+
+# Visible text that makes a page worth using without rendering
+MIN_TEXT_CHARS = int(os.getenv("STATIC_MIN_TEXT", "500"))
+# Insufficient static responses before a domain is sent straight to the browser
+FAILS_BEFORE_BROWSER = 2
+# Remembered strategies are re-tested after this long
+STRATEGY_TTL = 7 * 24 * 3600
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+@dataclass
+class StaticPage:
+    html: str = None
+    etag: str = None
+    last_modified: str = None
+    # Server answered 304 to the validators we sent
+    not_modified: bool = False
+
+
+def domain_of(url: str) -> str:
+    domain = urlparse(url).netloc.lower()
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+def has_needed_content(html: str) -> bool:
+    """Whether a static response can be used as is for a job detail page"""
+    page = clean_html(html)
+    if find_job_posting(page.structured):
+        return True
+    text = " ".join(page.tree.xpath("string(//body)").split()) if page.tree is not None else ""
+    return len(text) >= MIN_TEXT_CHARS
+
+
+class StaticFetcher:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = Path(path)
+        self.session = None
+        self._semaphore = None
+        self.strategies = {}
+        self.stats = {"http": 0, "fallbacks": 0, "skipped": 0}
+        if self.path.exists():
+            try:
+                self.strategies = json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable fetch strategy file {self.path}: {str(e)}")
+
+    def strategy(self, url: str) -> str:
+        entry = self.strategies.get(domain_of(url))
+        if not entry or time.time() - entry["updated"] > STRATEGY_TTL:
+            return "http"
+        return entry["strategy"]
+
+    def settled(self, url: str) -> bool:
+        """Whether the domain's strategy is known well enough to fetch its pages all at once"""
+        if not ENABLED:
+            return True
+        entry = self.strategies.get(domain_of(url))
+        if not entry or time.time() - entry["updated"] > STRATEGY_TTL:
+            return False
+        return entry["strategy"] == "browser" or entry["fails"] == 0
+
+    def record(self, url: str, worked: bool):
+        """Remember whether plain HTTP was enough for this domain"""
+        self.stats["http" if worked else "fallbacks"] += 1
+        domain = domain_of(url)
+        entry = self.strategies.get(domain) or {"strategy": "http", "fails": 0, "updated": 0}
+        fails = 0 if worked else entry["fails"] + 1
+        strategy = "http" if worked else ("browser" if fails >= FAILS_BEFORE_BROWSER else entry["strategy"])
+        # Only touch the file when something changed or the entry is getting old
+        if (strategy, fails) == (entry["strategy"], entry["fails"]) and time.time() - entry["updated"] < STRATEGY_TTL / 2:
+            return
+        if strategy == "browser" and entry["strategy"] != "browser":
+            logger.info(f"{domain} needs JavaScript, rendering its pages in the browser from now on")
+        self.strategies[domain] = {"strategy": strategy, "fails": fails, "updated": time.time()}
+        self._save()
+
+    async def _get(self, url: str, etag: str = None, last_modified: str = None):
+        # Created lazily so session and semaphore belong to the running loop
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=FETCH_CONCURRENCY, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT),
+                headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"}
+            )
+            self._semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        async with self._semaphore:
+            async with self.session.get(url, allow_redirects=True, headers=headers) as response:
+                if response.status == 304:
+                    return StaticPage(etag=etag, last_modified=last_modified, not_modified=True)
+                if response.status != 200 or "html" not in response.headers.get("Content-Type", ""):
+                    return None
+                return StaticPage(
+                    html=await response.text(errors="replace"),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
+
+    async def fetch(self, url: str, etag: str = None, last_modified: str = None, confirm: bool = False):
+        """
+        StaticPage if plain HTTP was enough, None when the page needs the browser.
+        With validators from an earlier fetch an unchanged page comes back as not_modified.
+        With confirm the caller still has to judge the page: success is only recorded
+        when it calls record(url, worked=...) once it knows.
+        """
+        if not ENABLED:
+            return None
+        if self.strategy(url) == "browser":
+            self.stats["skipped"] += 1
+            return None
+
+        async with get_tracer().span("static_fetch", kind="fetch"):
+            try:
+                page = await self._get(url, etag, last_modified)
+            except Exception as e:
+                logger.debug(f"Static fetch failed for {url}: {str(e)}")
+                page = None
+
+        if page and page.not_modified:
+            self.record(url, worked=True)
+            return page
+        try:
+            usable = page is not None and has_needed_content(page.html)
+        except Exception as e:
+            logger.debug(f"Static page of {url} could not be checked: {str(e)}")
+            usable = False
+        if usable:
+            if not confirm:
+                self.record(url, worked=True)
+            return page
+        self.record(url, worked=False)
+        return None
+
+    async def map(self, func, urls: list) -> list:
+        """
+        func(url) for every url, results in order. Until a domain's strategy is
+        settled its pages are tried one at a time, the rest then go at once, so a
+        JavaScript-only domain costs FAILS_BEFORE_BROWSER wasted fetches, not one per page.
+        """
+        by_domain = {}
+        for url in urls:
+            by_domain.setdefault(domain_of(url), []).append(url)
+        results = {}
+
+        async def run_domain(domain_urls):
+            pending = list(domain_urls)
+            while pending and not self.settled(pending[0]):
+                url = pending.pop(0)
+                results[url] = await func(url)
+            for url, result in zip(pending, await asyncio.gather(*(func(url) for url in pending))):
+                results[url] = result
+
+        await asyncio.gather(*(run_domain(domain_urls) for domain_urls in by_domain.values()))
+        return [results[url] for url in urls]
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.strategies, indent=1), encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as e:
+            logger.warning(f"Could not save fetch strategies: {str(e)}")
+
+    def log_stats(self):
+        if any(self.stats.values()):
+            logger.info(
+                f"Static fetch: {self.stats['http']} pages over HTTP, "
+                f"{self.stats['fallbacks']} fell back to the browser, "
+                f"{self.stats['skipped']} sent straight to the browser"
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+        self.session = None
+        self._semaphore = None
+
+
+_fetcher = None
+
+
+def get_fetcher() -> StaticFetcher:
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = StaticFetcher()
+    return _fetcher
+
+
+async def close_fetcher():
+    if _fetcher is not None:
+        _fetcher.log_stats()
+        await _fetcher.close()
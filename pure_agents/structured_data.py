@@ -0,0 +1,204 @@
+"""
+Structured Data - schema.org JobPosting from JSON-LD and microdata
+Many ATS detail pages embed the whole posting, so extract_data can map it
+onto the job schema without an LLM round-trip.
+"""
+
+import json
+from lxml import html as lxml_html
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Prefix of the compact-page line that carries a mapped JobPosting
+COMPACT_MARKER = "STRUCTURED JobPosting: "
+
+# Fields JobPosting data rarely carries; their absence alone is no reason to ask the LLM
+OPTIONAL_FIELDS = ("salary", "requirements")
+
+# Elements whose text must not run into the text after them
+TEXT_BREAK_TAGS = {
+    'br', 'div', 'p', 'li', 'ul', 'ol', 'dd', 'dt', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'tr', 'td', 'th', 'blockquote', 'pre', 'section', 'article', 'header', 'footer', 'hr'
+}
+
+
+def collect(root) -> dict:
+    """JSON-LD objects and microdata items in a parsed page, before scripts are stripped"""
+    json_ld = []
+    for script in root.iter('script'):
+        if (script.get('type') or '').strip().lower() != 'application/ld+json' or not script.text:
+            continue
+        try:
+            json_ld.append(json.loads(script.text.strip()))
+        except ValueError as e:
+            logger.debug(f"Skipping malformed JSON-LD: {str(e)}")
+
+    microdata = []
+    for item in root.xpath('//*[@itemscope and contains(@itemtype, "JobPosting")]'):
+        microdata.append(_microdata_item(item))
+
+    return {"json_ld": json_ld, "microdata": microdata}
+
+
+def _microdata_item(item) -> dict:
+    result = {"@type": (item.get('itemtype') or '').rstrip('/').rsplit('/', 1)[-1]}
+    for prop in item.xpath('.//*[@itemprop]'):
+        # Only direct properties; nested items own their own properties
+        owner = prop.getparent()
+        while owner is not None and owner.get('itemscope') is None:
+            owner = owner.getparent()
+        if owner is not item:
+            continue
+        if prop.get('itemscope') is not None:
+            value = _microdata_item(prop)
+        else:
+            value = (prop.get('content') or prop.get('datetime') or prop.get('href')
+                     or " ".join("".join(prop.itertext()).split()))
+        for name in prop.get('itemprop').split():
+            result.setdefault(name, value)
+    return result
+
+
+def _iter_objects(node):
+    if isinstance(node, list):
+        for item in node:
+            yield from _iter_objects(item)
+    elif isinstance(node, dict):
+        yield node
+        if "@graph" in node:
+            yield from _iter_objects(node["@graph"])
+
+
+def _is_job_posting(obj: dict) -> bool:
+    types = obj.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return "JobPosting" in types
+
+
+def find_job_posting(structured: dict):
+    """First JobPosting found in JSON-LD, then microdata"""
+    for obj in _iter_objects(structured.get("json_ld", [])):
+        if _is_job_posting(obj):
+            return obj
+    for obj in structured.get("microdata", []):
+        if _is_job_posting(obj):
+            return obj
+    return None
+
+
+def _name(value):
+    if isinstance(value, dict):
+        return value.get("name") or value.get("@id")
+    if isinstance(value, list):
+        return _name(value[0]) if value else None
+    return value
+
+
+def html_to_text(value):
+    if not value:
+        return None
+    if isinstance(value, list):
+        value = " ".join(str(v) for v in value)
+    value = str(value)
+    if "<" in value:
+        try:
+            fragment = lxml_html.fragment_fromstring(value, create_parent='div')
+            for element in fragment.iter(*TEXT_BREAK_TAGS):
+                element.tail = " " + (element.tail or "")
+            return " ".join(fragment.text_content().split()) or None
+        except Exception:
+            pass
+    return " ".join(value.split()) or None
+
+
+def _location(posting: dict):
+    places = posting.get("jobLocation") or []
+    places = places if isinstance(places, list) else [places]
+    names = []
+    for place in places:
+        address = place.get("address") if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            parts = [address.get("addressLocality"), address.get("addressRegion"),
+                     _name(address.get("addressCountry"))]
+            text = ", ".join(p for p in parts if p)
+        else:
+            text = _name(address) or (address if isinstance(address, str) else None)
+        if text and text not in names:
+            names.append(text)
+    if str(posting.get("jobLocationType", "")).upper() == "TELECOMMUTE":
+        names.append("Remote")
+    return "; ".join(names) or None
+
+
+def _salary(posting: dict):
+    salary = posting.get("baseSalary") or posting.get("estimatedSalary")
+    if isinstance(salary, list):
+        salary = salary[0] if salary else None
+    if not salary:
+        return None
+    if not isinstance(salary, dict):
+        return str(salary)
+    currency = salary.get("currency") or ""
+    value = salary.get("value")
+    unit = ""
+    if isinstance(value, dict):
+        unit = value.get("unitText") or ""
+        if value.get("minValue") is not None and value.get("maxValue") is not None:
+            amount = f"{value['minValue']}-{value['maxValue']}"
+        else:
+            amount = value.get("value") or value.get("minValue") or value.get("maxValue")
+    else:
+        amount = value
+    if amount is None:
+        return None
+    return " ".join(str(p) for p in (currency, amount) if p) + (f" / {unit}" if unit else "")
+
+
+def _requirements(posting: dict):
+    parts = []
+    for key in ("qualifications", "experienceRequirements", "educationRequirements", "skills"):
+        value = posting.get(key)
+        if isinstance(value, list):
+            texts = []
+            for item in value:
+                if isinstance(item, dict):
+                    item = item.get("description") or _name(item)
+                text = html_to_text(item)
+                if text:
+                    texts.append(text)
+            value = "; ".join(texts)
+        elif isinstance(value, dict):
+            value = value.get("description") or _name(value)
+        text = html_to_text(value)
+        if text:
+            parts.append(text)
+    return " ".join(parts) or None
+
+
+def job_record(posting: dict) -> dict:
+    """Map a schema.org JobPosting onto the orchestrator's job schema"""
+    employment_type = posting.get("employmentType")
+    if isinstance(employment_type, list):
+        employment_type = ", ".join(employment_type)
+    return {
+        "title": html_to_text(posting.get("title") or posting.get("name")),
+        "company": _name(posting.get("hiringOrganization")),
+        "location": _location(posting),
+        "description": html_to_text(posting.get("description")),
+        "requirements": _requirements(posting),
+        "salary": _salary(posting),
+        "employment_type": employment_type or None,
+        "posted_date": posting.get("datePosted"),
+    }
+
+
+def record_from_compact(text: str):
+    """Mapped record carried in compact page text, if any"""
+    for line in text.splitlines():
+        if line.startswith(COMPACT_MARKER):
+            try:
+                return json.loads(line[len(COMPACT_MARKER):])
+            except ValueError:
+                return None
+    return None
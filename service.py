@@ -0,0 +1,229 @@
+"""
+Scrape Service - HTTP API over a queue of scrapes and warm browser workers
+One browser is launched at startup; each worker keeps its own agent and
+browser session, so a queued scrape starts without any launch cost.
+
+    POST /jobs               {"job_title": ..., "company_name"/"company_domain": ..., "location": ...}
+    GET  /jobs               all jobs and their status
+    GET  /jobs/{id}          status, and the result once finished
+    GET  /jobs/{id}/stream   job records as NDJSON while they are extracted
+    GET  /health             workers, queue length
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+from main import UniversalJobScraper, parse_query
+from pure_agents.openai_client import close_client
+from pure_agents.tools import BrowserTool, LLMAnalysisTool
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Finished jobs kept in memory for status queries
+MAX_FINISHED_JOBS = int(os.getenv("SERVICE_MAX_JOBS", "1000"))
+
+
+@dataclass
+class ScrapeJob:
+    id: str
+    params: dict
+    output_path: str
+    status: str = "queued"
+    created: float = field(default_factory=time.time)
+    started: float = None
+    finished: float = None
+    records: list = field(default_factory=list)
+    result: object = None
+    error: str = None
+    # One queue per open /stream request
+    listeners: list = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "jobs_streamed": len(self.records),
+            "error": self.error,
+        }
+
+    async def add_record(self, record: dict):
+        self.records.append(record)
+        for queue in self.listeners:
+            queue.put_nowait(record)
+
+    def close_listeners(self):
+        for queue in self.listeners:
+            queue.put_nowait(None)
+
+
+class ScrapeService:
+    def __init__(self, workers: int = 2, profile: str = "production", output_dir: str = "outputs", mode: str = None):
+        self.worker_count = workers
+        self.profile = profile
+        self.mode = mode
+        self.output_dir = output_dir
+        self.queue = asyncio.Queue()
+        self.jobs = OrderedDict()
+        self.browser_tool = None
+        self.workers = []
+        self.busy = 0
+
+    async def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.browser_tool = BrowserTool(profile=self.profile)
+        await self.browser_tool.initialize()
+        llm_tool = LLMAnalysisTool()
+
+        for i in range(self.worker_count):
+            session = await self.browser_tool.new_session()
+            scraper = UniversalJobScraper(browser_tool=session, llm_tool=llm_tool, mode=self.mode)
+            await scraper.initialize()
+            self.workers.append(asyncio.create_task(self._work(i, scraper)))
+        logger.info(f"Scrape service ready with {self.worker_count} warm workers")
+
+    async def stop(self):
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        for job in self.jobs.values():
+            job.close_listeners()
+        if self.browser_tool:
+            await self.browser_tool.cleanup()
+        await close_client()
+
+    def submit(self, params: dict) -> ScrapeJob:
+        job_id = uuid.uuid4().hex[:12]
+        job = ScrapeJob(id=job_id, params=params, output_path=os.path.join(self.output_dir, f"{job_id}.json"))
+        self.jobs[job_id] = job
+        self.queue.put_nowait(job)
+        self._prune()
+        logger.info(f"Queued scrape {job_id}: {params}")
+        return job
+
+    def _prune(self):
+        finished = [j for j in self.jobs.values() if j.status in ("done", "failed")]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+    async def _work(self, index: int, scraper: UniversalJobScraper):
+        session = scraper.browser_tool
+        while True:
+            job = await self.queue.get()
+            self.busy += 1
+            job.status = "running"
+            job.started = time.time()
+            logger.info(f"Worker {index} running scrape {job.id}")
+            try:
+                # Fresh context for every job, the browser itself stays up
+                await session.reset_session()
+                output = await scraper.scrape_jobs(job.params, output_path=job.output_path,
+                                                   resume=False, on_record=job.add_record)
+                job.result = output["result"]
+                job.status = "done"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scrape {job.id} failed: {str(e)}")
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished = time.time()
+                job.close_listeners()
+                self.busy -= 1
+                self.queue.task_done()
+
+    # HTTP handlers
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/jobs", self.handle_submit)
+        app.router.add_get("/jobs", self.handle_list)
+        app.router.add_get("/jobs/{id}", self.handle_status)
+        app.router.add_get("/jobs/{id}/stream", self.handle_stream)
+        app.router.add_get("/health", self.handle_health)
+        return app
+
+    def _job(self, request) -> ScrapeJob:
+        job = self.jobs.get(request.match_info["id"])
+        if job is None:
+            raise web.HTTPNotFound(text=json.dumps({"error": "unknown job"}), content_type="application/json")
+        return job
+
+    async def handle_submit(self, request):
+        try:
+            params = parse_query(await request.json())
+        except (ValueError, AttributeError) as e:
+            return web.json_response({"error": f"Invalid query: {str(e)}"}, status=400)
+        job = self.submit(params)
+        return web.json_response(job.summary(), status=202)
+
+    async def handle_list(self, request):
+        return web.json_response([job.summary() for job in self.jobs.values()])
+
+    async def handle_status(self, request):
+        job = self._job(request)
+        body = job.summary()
+        if job.status == "done":
+            body["result"] = job.result
+        return web.json_response(body)
+
+    async def handle_stream(self, request):
+        """Records already extracted, then each new one, then a final status line"""
+        job = self._job(request)
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+
+        queue = asyncio.Queue()
+        backlog = list(job.records)
+        finished = job.status in ("done", "failed")
+        if not finished:
+            job.listeners.append(queue)
+        try:
+            for record in backlog:
+                await response.write((json.dumps(record, ensure_ascii=False) + "\n").encode())
+            while not finished:
+                record = await queue.get()
+                if record is None:
+                    break
+                await response.write((json.dumps(record, ensure_ascii=False) + "\n").encode())
+            await response.write((json.dumps({"status": job.status, "error": job.error}) + "\n").encode())
+        finally:
+            if queue in job.listeners:
+                job.listeners.remove(queue)
+        await response.write_eof()
+        return response
+
+    async def handle_health(self, request):
+        return web.json_response({
+            "workers": self.worker_count,
+            "busy": self.busy,
+            "queued": self.queue.qsize(),
+            "jobs": len(self.jobs),
+        })
+
+
+async def run_service(host="127.0.0.1", port=8080, workers=2, profile="production", output_dir="outputs",
+                      mode=None):
+    service = ScrapeService(workers=workers, profile=profile, output_dir=output_dir, mode=mode)
+    await service.start()
+    runner = web.AppRunner(service.app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"Scrape service listening on http://{host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await service.stop()
@@ -0,0 +1,15 @@
+import pytest
+from aiohttp import web
+
+
+@pytest.fixture
+def serve():
+    """Start an aiohttp app on a free local port; the coroutine returns (runner, base URL)"""
+    async def start(app):
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        host, port = runner.addresses[0][:2]
+        return runner, f"http://{host}:{port}"
+
+    return start
@@ -0,0 +1,164 @@
+import asyncio
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from pure_agents.ats_adapters import (GREENHOUSE_API, LEVER_API, LEVER_EU_API, SMARTRECRUITERS_API, AtsClient,
+                                      AtsReader, detect_board)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "ats"
+
+
+def payload(name):
+    return json.loads((FIXTURES / f"{name}.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("url, platform, token, api", [
+    ("https://boards.greenhouse.io/acmerobotics", "Greenhouse", "acmerobotics", f"{GREENHOUSE_API}/acmerobotics"),
+    ("https://job-boards.greenhouse.io/acmerobotics/jobs/4012345007", "Greenhouse", "acmerobotics",
+     f"{GREENHOUSE_API}/acmerobotics"),
+    ("https://boards.greenhouse.io/embed/job_board?for=acmerobotics&b=https%3A%2F%2Facme.com%2Fcareers",
+     "Greenhouse", "acmerobotics", f"{GREENHOUSE_API}/acmerobotics"),
+    ("https://boards.greenhouse.io/embed/job_app?for=acmerobotics&token=4012345007", "Greenhouse", "acmerobotics",
+     f"{GREENHOUSE_API}/acmerobotics"),
+    ("https://jobs.lever.co/northwind", "Lever", "northwind", f"{LEVER_API}/northwind"),
+    ("https://jobs.lever.co/northwind/8f2c1d4e-57b1-4c1a-9a55-0f2b9c6d7e11", "Lever", "northwind",
+     f"{LEVER_API}/northwind"),
+    ("https://jobs.eu.lever.co/northwind/8f2c1d4e-57b1-4c1a-9a55-0f2b9c6d7e11/apply", "Lever", "northwind",
+     f"{LEVER_EU_API}/northwind"),
+    ("https://initech.wd1.myworkdayjobs.com/en-US/Careers", "Workday", "initech/Careers",
+     "https://initech.wd1.myworkdayjobs.com/wday/cxs/initech/Careers"),
+    ("https://initech.wd1.myworkdayjobs.com/Careers/job/Austin-TX/Machine-Learning-Engineer_R0042817", "Workday",
+     "initech/Careers", "https://initech.wd1.myworkdayjobs.com/wday/cxs/initech/Careers"),
+    ("https://wd3.myworkdaysite.com/en-US/recruiting/initech/Careers", "Workday", "initech/Careers",
+     "https://wd3.myworkdaysite.com/wday/cxs/initech/Careers"),
+    ("https://jobs.smartrecruiters.com/Globex1", "SmartRecruiters", "Globex1", f"{SMARTRECRUITERS_API}/Globex1"),
+    ("https://jobs.smartrecruiters.com/Globex1/744000012345678-backend-engineer-java-", "SmartRecruiters", "Globex1",
+     f"{SMARTRECRUITERS_API}/Globex1"),
+    ("https://careers.smartrecruiters.com/Globex1", "SmartRecruiters", "Globex1", f"{SMARTRECRUITERS_API}/Globex1"),
+])
+def test_detect_board(url, platform, token, api):
+    board = detect_board(url)
+    assert (board.platform, board.token, board.api) == (platform, token, api)
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.acme.com/careers",
+    "https://boards.greenhouse.io/embed/job_board",
+    "https://jobs.lever.co/",
+    "https://initech.wd1.myworkdayjobs.com/wday/cxs/initech/Careers/jobs",
+    "https://www.smartrecruiters.com/Globex1",
+])
+def test_detect_board_ignores_other_urls(url):
+    assert detect_board(url) is None
+
+
+def recorded_api() -> web.Application:
+    """Local stand-in answering each platform's endpoints with the recorded payloads"""
+    def reply(name):
+        async def handler(request):
+            return web.json_response(payload(name))
+        return handler
+
+    async def workday_jobs(request):
+        body = await request.json()
+        data = payload("workday_jobs")
+        if body["offset"]:
+            data["jobPostings"] = []
+        return web.json_response(data)
+
+    app = web.Application()
+    app.router.add_get("/greenhouse/jobs", reply("greenhouse_jobs"))
+    app.router.add_get("/greenhouse", reply("greenhouse_board"))
+    app.router.add_get("/lever", reply("lever_postings"))
+    app.router.add_post("/workday/jobs", workday_jobs)
+    app.router.add_get("/workday/job/Austin-TX/Machine-Learning-Engineer_R0042817", reply("workday_posting"))
+    app.router.add_get("/smartrecruiters/postings", reply("smartrecruiters_postings"))
+    app.router.add_get("/smartrecruiters/postings/744000012345678", reply("smartrecruiters_posting"))
+    return app
+
+
+def read_board(serve, board_url, platform, job_title):
+    async def run():
+        runner, base_url = await serve(recorded_api())
+        reader = AtsReader(AtsClient())
+        try:
+            board = replace(detect_board(board_url), api=f"{base_url}/{platform}")
+            return await reader.read(board, job_title)
+        finally:
+            await reader.close()
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+MAPPED = ("title", "company", "location", "description", "employment_type", "posted_date", "url")
+
+
+def test_greenhouse_mapping(serve):
+    result = read_board(serve, "https://boards.greenhouse.io/acmerobotics", "greenhouse", "Engineer")
+
+    assert result.total == 2
+    assert [{f: r[f] for f in MAPPED} for r in result.records] == [{
+        "title": "Senior Software Engineer, Platform",
+        "company": "Acme Robotics",
+        "location": "Berlin, Germany",
+        "description": "About the role You will own our fleet & telemetry services. Go and Python",
+        "employment_type": "Full-time",
+        "posted_date": "2024-04-29",
+        "url": "https://boards.greenhouse.io/acmerobotics/jobs/4012345007",
+    }]
+
+
+def test_lever_mapping(serve):
+    result = read_board(serve, "https://jobs.lever.co/northwind", "lever", "Data Engineer")
+
+    assert result.total == 2
+    [record] = result.records
+    assert {f: record[f] for f in MAPPED} == {
+        "title": "Data Engineer",
+        "company": None,
+        "location": "Toronto, ON",
+        "description": "Join the data team and build our warehouse. What you'll do: Design pipelines Own dbt models "
+                       "We offer visa sponsorship.",
+        "employment_type": "Full-time",
+        "posted_date": "2024-04-29",
+        "url": "https://jobs.lever.co/northwind/8f2c1d4e-57b1-4c1a-9a55-0f2b9c6d7e11",
+    }
+    assert record["requirements"] == "4+ years of SQL Airflow"
+    assert record["salary"] == "120000-150000 CAD per-year-salary"
+
+
+def test_workday_mapping(serve):
+    result = read_board(serve, "https://initech.wd1.myworkdayjobs.com/en-US/Careers", "workday", "Machine Learning")
+
+    assert result.total == 2
+    assert [{f: r[f] for f in MAPPED} for r in result.records] == [{
+        "title": "Machine Learning Engineer",
+        "company": "Initech",
+        "location": "Austin, TX; Seattle, WA",
+        "description": "Team: Search Ranking Train and ship ranking models.",
+        "employment_type": "Full time",
+        "posted_date": "2024-05-10",
+        "url": "https://initech.wd1.myworkdayjobs.com/Careers/job/Austin-TX/Machine-Learning-Engineer_R0042817",
+    }]
+
+
+def test_smartrecruiters_mapping(serve):
+    result = read_board(serve, "https://jobs.smartrecruiters.com/Globex1", "smartrecruiters", "Backend Engineer")
+
+    assert result.total == 2
+    [record] = result.records
+    assert {f: record[f] for f in MAPPED} == {
+        "title": "Backend Engineer (Java)",
+        "company": "Globex",
+        "location": "Lisbon, Lisbon, pt; Remote",
+        "description": "Build order routing services in Java. Hybrid, two days in the office.",
+        "employment_type": "Full-time",
+        "posted_date": "2024-05-06",
+        "url": "https://jobs.smartrecruiters.com/Globex1/744000012345678-backend-engineer-java-",
+    }
+    assert record["requirements"] == "Java 17 Kafka"
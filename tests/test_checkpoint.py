@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+from pure_agents import checkpoint
+from pure_agents.checkpoint import RunState
+
+
+def interrupted_run(output_path, scope):
+    state = RunState(output_path, scope)
+    state.start_fresh()
+    asyncio.run(state.add_links([{"url": "https://acme.test/jobs/1"}, {"url": "https://acme.test/jobs/2"}]))
+    asyncio.run(state.record({"url": "https://acme.test/jobs/1", "title": "Engineer"}))
+    return state
+
+
+def test_resumes_only_the_same_query(tmp_path):
+    output_path = str(tmp_path / "output.json")
+    interrupted_run(output_path, "acme|engineer")
+
+    assert RunState(output_path, "acme|engineer").can_resume()
+    assert not RunState(output_path, "globex|designer").can_resume()
+
+
+def test_failed_jobs_keep_the_run_resumable(tmp_path):
+    output_path = str(tmp_path / "output.json")
+    state = interrupted_run(output_path, "acme|engineer")
+
+    # jobs/2 came back as an error and was never recorded
+    assert not state.finish()
+    assert RunState(output_path, "acme|engineer").checkpoint.remaining() == ["https://acme.test/jobs/2"]
+
+    asyncio.run(state.record({"url": "https://acme.test/jobs/2", "title": "Engineer II"}))
+    assert state.finish()
+    assert not RunState(output_path, "acme|engineer").can_resume()
+
+
+def test_failing_jobs_are_given_up_after_max_resumes(tmp_path):
+    output_path = str(tmp_path / "output.json")
+    interrupted_run(output_path, "acme|engineer").finish()
+
+    for _ in range(checkpoint.MAX_RESUMES):
+        state = RunState(output_path, "acme|engineer")
+        assert state.can_resume()
+        state.start_resume()
+        # jobs/2 fails again
+
+    assert state.finish()
+    # Discovery runs again instead of resuming forever
+    assert not RunState(output_path, "acme|engineer").can_resume()
+
+
+def test_old_checkpoints_are_not_resumed(tmp_path, monkeypatch):
+    output_path = str(tmp_path / "output.json")
+    interrupted_run(output_path, "acme|engineer")
+
+    later = time.time() + checkpoint.MAX_AGE + 1
+    monkeypatch.setattr(checkpoint.time, "time", lambda: later)
+    assert not RunState(output_path, "acme|engineer").can_resume()
@@ -0,0 +1,28 @@
+from pure_agents.frame_scoring import is_non_job_host, score_frame
+
+LISTING = "<html><body><h1>Open positions</h1><ul>" + "".join(
+    f'<li><a href="/jobs/{i}">Software Engineer {i}</a> Full-time, apply now</li>' for i in range(10)
+) + "</ul></body></html>"
+
+
+def test_careers_hosts_are_not_penalized():
+    for url in ("https://careers.roblox.com/jobs", "https://jobs.netflix.com/search",
+                "https://uploads.example.com/careers", "https://boards.greenhouse.io/acme"):
+        assert not is_non_job_host(url), url
+        score, reasons = score_frame(url, LISTING)
+        assert score > 0, url
+        assert "ad/media host" not in reasons
+
+
+def test_ad_and_media_frames_are_penalized():
+    for url in ("https://www.youtube.com/embed/abc", "https://stats.g.doubleclick.net/x",
+                "https://ads.example.com/banner", "https://www.google.com/recaptcha/api2/anchor",
+                "https://x.com/acme"):
+        assert is_non_job_host(url), url
+        assert "ad/media host" in score_frame(url, "<html><body></body></html>")[1]
+
+
+def test_path_entries_only_match_their_path():
+    assert not is_non_job_host("https://careers.google.com/jobs/results")
+    assert not is_non_job_host("https://www.linkedin.com/jobs/view/1")
+    assert is_non_job_host("https://www.linkedin.com/embed/feed")
@@ -0,0 +1,17 @@
+import pytest
+
+from pure_agents.compact_dom import compact_page
+from pure_agents.html_cleaner import HTMLCleaner
+
+
+@pytest.mark.parametrize("html", ["", "   \n\t", "<!-- nothing but a comment -->"])
+def test_empty_documents_give_an_empty_page(html):
+    page = HTMLCleaner().clean(html)
+
+    assert page.html == "<html><body></body></html>"
+    assert page.links == []
+    assert not any(page.structured.values())
+
+
+def test_empty_document_compacts_to_nothing():
+    assert compact_page("").links == []
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+
+from pure_agents import llm_tool, openai_client
+from pure_agents.llm_tool import JOB_SCHEMA, LLMAnalysisTool
+
+POSTING = {
+    "@context": "https://schema.org", "@type": "JobPosting",
+    "title": "Platform Engineer",
+    "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+    "jobLocation": {"@type": "Place", "address": {"@type": "PostalAddress", "addressLocality": "Berlin",
+                                                  "addressCountry": "DE"}},
+    "description": "<p>Run our Kubernetes platform.</p>",
+    "employmentType": "FULL_TIME",
+    "datePosted": "2024-05-01",
+}
+
+
+def page(posting):
+    return (f'<html><head><script type="application/ld+json">{json.dumps(posting)}</script></head>'
+            f'<body><h1>{posting["title"]}</h1></body></html>')
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    prompts = []
+
+    def reply(answer):
+        async def fake_completion(prompt, **kwargs):
+            prompts.append(prompt)
+            return answer
+        monkeypatch.setattr(llm_tool, "chat_completion", fake_completion)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(openai_client, "_client", None)
+    return LLMAnalysisTool(), reply, prompts
+
+
+def test_posting_without_salary_or_requirements_needs_no_llm(extractor):
+    tool, reply, prompts = extractor
+    reply("should not be asked")
+
+    record = json.loads(asyncio.run(tool.extract(page(POSTING), JOB_SCHEMA)))
+
+    assert prompts == []
+    assert record["title"] == "Platform Engineer"
+    assert record["salary"] is None and record["requirements"] is None
+
+
+def test_unusable_llm_reply_keeps_the_structured_fields(extractor):
+    tool, reply, prompts = extractor
+    reply("Sorry, I could not find those fields.")
+    posting = {k: v for k, v in POSTING.items() if k != "employmentType"}
+
+    record = json.loads(asyncio.run(tool.extract(page(posting), JOB_SCHEMA)))
+
+    assert len(prompts) == 1
+    assert record["title"] == "Platform Engineer"
+    assert record["company"] == "Acme"
+    assert record["employment_type"] is None
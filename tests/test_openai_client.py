@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from benchmarks.fake_openai import FakeOpenAI
+from pure_agents import llm_cache, openai_client
+from pure_agents.llm_cache import LLMCache
+
+
+@pytest.fixture
+def local_openai(monkeypatch, serve):
+    """Point the shared client at a local server; yields a function that starts it"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(openai_client, "_client", None)
+    monkeypatch.setattr(openai_client, "_transport", None)
+    monkeypatch.setattr(llm_cache, "_cache", LLMCache(":memory:"))
+    monkeypatch.setenv("LLM_CACHE", "1")
+
+    async def start(app):
+        runner, base_url = await serve(app)
+        monkeypatch.setenv("OPENAI_BASE_URL", f"{base_url}/v1")
+        return runner
+
+    return start
+
+
+def completion(content, finish_reason="stop"):
+    return web.json_response({
+        "id": "chatcmpl-test", "object": "chat.completion", "created": int(time.time()), "model": "test",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                     "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    })
+
+
+def test_truncated_replies_are_not_cached(local_openai):
+    replies = [('[{"url": "/a"', "length"), ('[{"url": "/a"}]', "stop")]
+    served = []
+
+    async def chat_completions(request):
+        content, finish_reason = replies[min(len(served), len(replies) - 1)]
+        served.append(finish_reason)
+        return completion(content, finish_reason)
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", chat_completions)
+        runner = await local_openai(app)
+        try:
+            return [await openai_client.chat_completion("links please", tool="extract_links", cache=True)
+                    for _ in range(3)]
+        finally:
+            await openai_client.close_client()
+            await runner.cleanup()
+
+    answers = asyncio.run(run())
+
+    assert answers == ['[{"url": "/a"', '[{"url": "/a"}]', '[{"url": "/a"}]']
+    # The cut-off reply was asked again, the complete one came from the cache
+    assert served == ["length", "stop"]
+
+
+def test_cache_key_includes_completion_budget():
+    assert LLMCache.make_key("m", "p", 4000, "minimal") != LLMCache.make_key("m", "p", 16000, "minimal")
+    assert LLMCache.make_key("m", "p", 4000, "minimal") != LLMCache.make_key("m", "p", 4000, "low")
+    assert LLMCache.make_key("m", "p") == LLMCache.make_key("m", "p")
+
+
+def counting_peers(app, peers):
+    """Record the client address of every request, one per TCP connection"""
+    @web.middleware
+    async def count(request, handler):
+        peers.append(request.transport.get_extra_info("peername"))
+        return await handler(request)
+
+    app.middlewares.append(count)
+    return app
+
+
+def test_connections_are_reused_and_in_flight_is_capped(local_openai):
+    from pure_agents.llm_tool import LLMAnalysisTool
+
+    peers = []
+    requests = 40
+
+    async def run():
+        runner = await local_openai(counting_peers(FakeOpenAI(latency=0.02).app(), peers))
+        try:
+            llm = LLMAnalysisTool()
+            # Tool calls and plain completions, all at once, through the one shared client
+            await asyncio.gather(
+                *(openai_client.chat_completion(f"question {i}", tool="analyze_content") for i in range(requests // 2)),
+                *(llm.analyze(f"content {i}", "Is this a job page?") for i in range(requests // 2)),
+            )
+            return openai_client.client_stats()
+        finally:
+            await openai_client.close_client()
+            await runner.cleanup()
+
+    stats = asyncio.run(run())
+
+    assert len(peers) == stats["requests"] == requests
+    assert len(set(peers)) < requests
+    assert len(set(peers)) <= openai_client.MAX_CONCURRENCY
+    assert stats["peak_in_flight"] <= openai_client.MAX_CONCURRENCY
+
+
+def greenhouse_api() -> web.Application:
+    """Greenhouse board API answering with the recorded payloads"""
+    fixtures = Path(__file__).parent / "fixtures" / "ats"
+
+    def reply(name):
+        async def handler(request):
+            return web.json_response(json.loads((fixtures / f"{name}.json").read_text(encoding="utf-8")))
+        return handler
+
+    app = web.Application()
+    app.router.add_get("/boards/acmerobotics/jobs", reply("greenhouse_jobs"))
+    app.router.add_get("/boards/acmerobotics", reply("greenhouse_board"))
+    return app
+
+
+def test_scrape_jobs_shares_connections_without_a_browser(local_openai, serve, monkeypatch, tmp_path):
+    from agents import set_default_openai_api, set_tracing_disabled
+    from main import UniversalJobScraper
+    from pure_agents import ats_adapters, route_cache
+    from pure_agents.route_cache import RouteCache
+    from pure_agents.tools import BrowserTool
+
+    # Relative cache and output paths land in the temporary directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LLM_CACHE", "0")
+    monkeypatch.setenv("POSTING_STORE", "0")
+    monkeypatch.setattr(route_cache, "_cache", RouteCache(str(tmp_path / "routes.json")))
+    monkeypatch.setattr(ats_adapters, "_reader", None)
+    set_default_openai_api("chat_completions")
+    set_tracing_disabled(True)
+    peers = []
+    fake = FakeOpenAI(latency=0.02)
+    titles = ("Engineer", "Software Engineer", "Platform Engineer", "Senior Engineer")
+
+    async def scrape(i, title):
+        # The board is read through its API, so the browser is never started
+        scraper = UniversalJobScraper(browser_tool=BrowserTool(profile="production"), mode="agent")
+        await scraper.initialize()
+        return await scraper.scrape_jobs(
+            {"job_title": title, "company_name": None, "company_domain": "https://boards.greenhouse.io/acmerobotics",
+             "location": None},
+            output_path=str(tmp_path / f"output_{i}.json"), use_cached_route=False, resume=False)
+
+    async def run():
+        openai_runner = await local_openai(counting_peers(fake.app(), peers))
+        ats_runner, ats_url = await serve(greenhouse_api())
+        monkeypatch.setattr(ats_adapters, "GREENHOUSE_API", f"{ats_url}/boards")
+        try:
+            outputs = await asyncio.gather(*(scrape(i, title) for i, title in enumerate(titles)))
+            return outputs, openai_client.client_stats()
+        finally:
+            await ats_adapters.close_ats_reader()
+            await openai_client.close_client()
+            await ats_runner.cleanup()
+            await openai_runner.cleanup()
+
+    outputs, stats = asyncio.run(run())
+
+    for output in outputs:
+        assert [job["title"] for job in output["result"]["jobs"]] == ["Senior Software Engineer, Platform"]
+    # Every query's agent turns went through the one pooled client over a few kept-alive connections
+    assert fake.stats()["turns"] == 2 * len(titles)
+    assert len(peers) == fake.stats()["llm_calls"] == stats["requests"]
+    assert len(set(peers)) < stats["requests"]
+    assert stats["peak_in_flight"] <= openai_client.MAX_CONCURRENCY
+
+
+def chromium_available() -> bool:
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            return os.path.exists(p.chromium.executable_path)
+    except Exception:
+        return False
+
+
+@pytest.mark.skipif(not chromium_available(), reason="needs Playwright's Chromium")
+def test_scrape_jobs_reuses_connections(local_openai, serve, monkeypatch, tmp_path):
+    from agents import set_default_openai_api, set_tracing_disabled
+    from benchmarks.e2e_bench import JOB_TITLE, site_app
+    from main import UniversalJobScraper
+
+    # Relative cache and output paths land in the temporary directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LLM_CACHE", "0")
+    set_default_openai_api("chat_completions")
+    set_tracing_disabled(True)
+    peers = []
+    fake = FakeOpenAI(latency=0.02)
+
+    async def run():
+        openai_runner = await local_openai(counting_peers(fake.app(), peers))
+        site, site_url = await serve(site_app("paginated"))
+        scraper = UniversalJobScraper(profile="production", mode="agent")
+        try:
+            await scraper.initialize()
+            output = await scraper.scrape_jobs(
+                {"job_title": JOB_TITLE, "company_name": None, "company_domain": f"{site_url}/",
+                 "location": None},
+                output_path=str(tmp_path / "output.json"), use_cached_route=False, resume=False)
+            stats = openai_client.client_stats()
+        finally:
+            await scraper.cleanup()
+            await site.cleanup()
+            await openai_runner.cleanup()
+        return output, stats
+
+    output, stats = asyncio.run(run())
+
+    assert output["result"]["jobs"]
+    # Agent turns and tool calls share a handful of kept-alive connections
+    assert len(peers) == fake.stats()["llm_calls"] == stats["requests"]
+    assert len(set(peers)) < stats["requests"]
+    assert stats["peak_in_flight"] <= openai_client.MAX_CONCURRENCY
@@ -0,0 +1,64 @@
+import asyncio
+
+from pure_agents.page_pool import PagePool
+
+
+class FakePage:
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.opened = 0
+
+    async def new_page(self):
+        # Yield like Playwright does, so racing acquires interleave here
+        await asyncio.sleep(0.01)
+        self.opened += 1
+        return FakePage()
+
+
+def test_map_never_exceeds_pool_size():
+    context = FakeContext()
+    pool = PagePool(context, size=4)
+    running = peak = 0
+
+    async def work(page, item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return item * 2
+
+    results = asyncio.run(pool.map(work, range(40)))
+
+    assert results == [i * 2 for i in range(40)]
+    assert peak <= 4
+    assert context.opened <= 4
+
+
+def test_failed_open_frees_its_slot():
+    class FlakyContext(FakeContext):
+        async def new_page(self):
+            if not self.opened:
+                self.opened += 1
+                raise RuntimeError("browser closed")
+            return await super().new_page()
+
+    pool = PagePool(FlakyContext(), size=1)
+
+    async def run():
+        try:
+            await pool.acquire()
+        except RuntimeError:
+            pass
+        # Would wait forever if the failed open kept the only slot
+        page = await asyncio.wait_for(pool.acquire(), 1)
+        pool.release(page)
+
+    asyncio.run(run())
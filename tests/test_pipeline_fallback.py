@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from main import UniversalJobScraper
+from pure_agents.pipeline import JobPipeline, PipelineError
+from pure_agents.tools import BrowserTool
+
+
+class TopPage:
+    url = "https://acme.test/careers"
+
+
+class Frame:
+    """Stands in for a Playwright Frame, which knows its page"""
+    url = "https://boards.acme-ats.test/embed"
+
+    def __init__(self, page):
+        self.page = page
+
+
+@pytest.mark.parametrize("error", [PipelineError("listings", "no job listings after view_all"),
+                                   TimeoutError("Timeout 30000ms exceeded"),
+                                   ValueError("analyze returned no JSON")])
+def test_pipeline_errors_hand_over_to_the_agent_on_the_top_page(monkeypatch, error):
+    async def failing_run(self, job_params, route=None):
+        self.browser.page = Frame(top_page)
+        self.browser.iframe_index = 2
+        self.browser.route = {"access_method": "iframe"}
+        raise error
+
+    monkeypatch.setattr(JobPipeline, "run", failing_run)
+    top_page = TopPage()
+    browser = BrowserTool(profile="production")
+    browser.page = top_page
+    scraper = UniversalJobScraper(browser_tool=browser, llm_tool=object(), mode="pipeline")
+
+    result = asyncio.run(scraper.run_pipeline({"job_title": "Engineer"}))
+
+    assert result is None
+    assert browser.page is top_page
+    assert browser.iframe_index is None and browser.route is None
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from main import UniversalJobScraper
+from pure_agents import route_cache
+from pure_agents.route_cache import RouteCache
+from pure_agents.tools import BrowserTool
+
+JOB_PARAMS = {"job_title": "Engineer", "company_name": None, "company_domain": "acme.test", "location": None}
+ROUTE = {"careers_url": "https://acme.test/careers", "listing_url": "https://acme.test/careers/all",
+         "iframe_index": 1, "access_method": "iframe"}
+
+
+class TopPage:
+    url = "https://acme.test/careers/all"
+
+
+class Frame:
+    url = "https://boards.acme-ats.test/embed"
+
+    def __init__(self, page):
+        self.page = page
+
+
+@pytest.fixture
+def scraper(monkeypatch, tmp_path):
+    monkeypatch.setenv("POSTING_STORE", "0")
+    routes = RouteCache(str(tmp_path / "routes.json"))
+    routes.save(JOB_PARAMS, ROUTE)
+    monkeypatch.setattr(route_cache, "_cache", routes)
+    browser = BrowserTool(profile="production")
+    browser.page = TopPage()
+    return UniversalJobScraper(browser_tool=browser, llm_tool=object(), mode="agent")
+
+
+def run_with_agent(scraper, tmp_path, monkeypatch, listing_links):
+    """Scrape where every agent run finds no matching job; returns (route listing URL, page type) per agent run"""
+    given = []
+
+    async def agent(self, job_params, route=None):
+        given.append((route and route["listing_url"], type(self.browser_tool.page).__name__))
+        # The replay entered the remembered iframe
+        self.browser_tool.page = Frame(self.browser_tool.page)
+        self.browser_tool.listing_links = listing_links if route else 0
+        return {"jobs": [], "total_found": 0, "search_query": job_params["job_title"]}
+
+    monkeypatch.setattr(UniversalJobScraper, "run_agent", agent)
+    asyncio.run(scraper.scrape_jobs(JOB_PARAMS, output_path=str(tmp_path / "output.json")))
+    return given
+
+
+def test_listing_without_matches_keeps_its_route(scraper, tmp_path, monkeypatch):
+    given = run_with_agent(scraper, tmp_path, monkeypatch, listing_links=12)
+
+    assert [listing_url for listing_url, _ in given] == [ROUTE["listing_url"]]
+    assert route_cache.get_route_cache().get(JOB_PARAMS)["listing_url"] == ROUTE["listing_url"]
+
+
+def test_dead_route_is_dropped_and_discovery_starts_on_the_top_page(scraper, tmp_path, monkeypatch):
+    given = run_with_agent(scraper, tmp_path, monkeypatch, listing_links=0)
+
+    assert given == [(ROUTE["listing_url"], "TopPage"), (None, "TopPage")]
+    assert route_cache.get_route_cache().get(JOB_PARAMS) is None
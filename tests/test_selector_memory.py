@@ -0,0 +1,47 @@
+import asyncio
+
+from pure_agents import selector_cache
+from pure_agents.selector_cache import SelectorCache
+from pure_agents.tools import BrowserTool
+
+URL = "https://acme.test/careers"
+
+
+class Page:
+    url = URL
+
+    def __init__(self):
+        self.clicked = []
+
+    async def click(self, selector):
+        self.clicked.append(selector)
+
+
+def test_cache_hit_does_not_rewrite_the_file(monkeypatch, tmp_path):
+    cache = SelectorCache(str(tmp_path / "selectors.json"))
+    cache.remember(URL, "click", "view all jobs", "a.all-jobs")
+    monkeypatch.setattr(selector_cache, "_cache", cache)
+    saves = []
+    monkeypatch.setattr(cache, "_save", lambda: saves.append(1))
+
+    browser = BrowserTool(profile="production")
+    browser.page = Page()
+
+    async def still_matches(selector, kind):
+        return True
+
+    async def ask_llm(description, kind):
+        return "button.view-all"
+
+    monkeypatch.setattr(browser, "_selector_still_matches", still_matches)
+    monkeypatch.setattr(browser, "_ask_llm_for_selector", ask_llm)
+
+    for _ in range(3):
+        asyncio.run(browser._with_selector("view all jobs", "click", browser.page.click))
+    assert browser.page.clicked == ["a.all-jobs"] * 3
+    assert saves == []
+
+    # A selector found afresh is still remembered
+    asyncio.run(browser._with_selector("next page", "click", browser.page.click))
+    assert cache.get(URL, "click", "next page") == "button.view-all"
+    assert len(saves) == 1
@@ -0,0 +1,103 @@
+import asyncio
+import json
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+from pure_agents.static_fetch import FAILS_BEFORE_BROWSER, StaticFetcher
+
+# Enough boilerplate to pass the text check, but no job in it
+SHELL_PAGE = "<html><body><div id='app'></div><footer>" + "Cookie notice and legal text. " * 40 + "</footer></body></html>"
+JOB_PAGE = ('<html><head><script type="application/ld+json">'
+            + json.dumps({"@type": "JobPosting", "title": "Engineer", "description": "Build things"})
+            + "</script></head><body><h1>Engineer</h1></body></html>")
+
+
+def site(pages):
+    """/shell/<id>, /job/<id> and /empty/<id>, counting requests and how many were open at once"""
+    stats = {"requests": 0, "open": 0, "peak": 0}
+
+    async def handler(request):
+        stats["requests"] += 1
+        stats["open"] += 1
+        stats["peak"] = max(stats["peak"], stats["open"])
+        await asyncio.sleep(0.01)
+        stats["open"] -= 1
+        return web.Response(text=pages[request.match_info["kind"]], content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/{kind}/{id}", handler)
+    return app, stats
+
+
+def scraper(fetcher, extracted):
+    """scrape_static's use of the fetcher, with extraction judged by the page content"""
+    async def scrape(url):
+        page = await fetcher.fetch(url, confirm=True)
+        if page is None:
+            return None
+        extracted.append(url)
+        record = {"url": url} if "JobPosting" in page.html else None
+        fetcher.record(url, worked=record is not None)
+        return record
+    return scrape
+
+
+def test_javascript_domain_is_probed_before_fanning_out(tmp_path, serve):
+    fetcher = StaticFetcher(path=str(tmp_path / "strategies.json"))
+    app, stats = site({"shell": SHELL_PAGE})
+    extracted = []
+
+    async def run():
+        runner, base_url = await serve(app)
+        try:
+            urls = [f"{base_url}/shell/{i}" for i in range(10)]
+            return base_url, await fetcher.map(scraper(fetcher, extracted), urls)
+        finally:
+            await fetcher.close()
+            await runner.cleanup()
+
+    base_url, results = asyncio.run(run())
+
+    assert results == [None] * 10
+    # Only the probes were fetched and sent to extraction, the rest went straight to the browser
+    assert stats["requests"] == len(extracted) == FAILS_BEFORE_BROWSER
+    assert fetcher.strategies[urlparse(base_url).netloc]["strategy"] == "browser"
+    assert fetcher.stats["skipped"] == 10 - FAILS_BEFORE_BROWSER
+
+
+def test_server_rendered_domain_fans_out_after_one_probe(tmp_path, serve):
+    fetcher = StaticFetcher(path=str(tmp_path / "strategies.json"))
+    app, stats = site({"job": JOB_PAGE})
+    extracted = []
+
+    async def run():
+        runner, base_url = await serve(app)
+        try:
+            urls = [f"{base_url}/job/{i}" for i in range(10)]
+            return urls, await fetcher.map(scraper(fetcher, extracted), urls)
+        finally:
+            await fetcher.close()
+            await runner.cleanup()
+
+    urls, results = asyncio.run(run())
+
+    assert results == [{"url": url} for url in urls]
+    assert stats["requests"] == 10
+    assert stats["peak"] > 1
+
+
+def test_empty_page_falls_back_to_the_browser(tmp_path, serve):
+    fetcher = StaticFetcher(path=str(tmp_path / "strategies.json"))
+    app, _ = site({"empty": ""})
+
+    async def run():
+        runner, base_url = await serve(app)
+        try:
+            return await fetcher.fetch(f"{base_url}/empty/1", confirm=True)
+        finally:
+            await fetcher.close()
+            await runner.cleanup()
+
+    assert asyncio.run(run()) is None
+    assert fetcher.stats["fallbacks"] == 1
@@ -1,6 +1,12 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-import time
+import threading
 from pathlib import Path
 from datetime import datetime
 
@@ -23,57 +29,170 @@ LEVEL_COLORS = {
     logging.CRITICAL: COLORS["BOLDRED"],
 }
 
+# Longest message kept per record, the rest is cut off
+MAX_RECORD_CHARS = int(os.getenv("LOG_MAX_RECORD_CHARS", "2000"))
+# Optional structured log, one JSON object per line
+JSON_LOG_PATH = os.getenv("LOG_JSON_PATH")
+# Records written to the console in one go at most
+MAX_BATCH = 256
+
 
 class ColorFormatter(logging.Formatter):
     def format(self, record):
+        # Color a copy, the same record also goes to the file sinks
+        record = copy.copy(record)
         level_color = LEVEL_COLORS.get(record.levelno, COLORS["WHITE"])
         record.levelname = f"{level_color}{record.levelname}{COLORS['RESET']}"
         record.name = f"{COLORS['BLUE']}{record.name}{COLORS['RESET']}"
         record.msg = f"{COLORS['WHITE']}{record.getMessage()}{COLORS['RESET']}"
+        record.args = None
         return super().format(record)
 
 
-class StreamingHandler(logging.StreamHandler):
-    """Custom console handler that prints text letter by letter"""
-
-    def emit(self, record):
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class BatchMixin:
+    """Write a whole batch of records with one write and one flush"""
+
+    def emit_batch(self, records):
+        lines = []
+        for record in records:
+            if record.levelno < self.level:
+                continue
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
         try:
-            msg = self.format(record)
-            stream = self.stream
-            for char in msg + self.terminator:
-                stream.write(char)
-                stream.flush()
-                # time.sleep(0.005)  # delay per character
+            with self.lock:
+                self.stream.write("".join(lines))
+                self.flush()
         except Exception:
-            self.handleError(record)
+            self.handleError(records[-1])
 
 
-def setup_logger(name: str = __name__, level: int = logging.INFO) -> logging.Logger:
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+class BatchStreamHandler(BatchMixin, logging.StreamHandler):
+    pass
 
-    if logger.handlers:
-        return logger
+
+class BatchFileHandler(BatchMixin, logging.FileHandler):
+    pass
+
+
+class CappedQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread, cutting overlong messages short"""
+
+    def prepare(self, record):
+        # Only merge the arguments and copy the record here; formatting, tracebacks
+        # included, is left to the listener thread
+        message = record.getMessage()
+        if MAX_RECORD_CHARS and len(message) > MAX_RECORD_CHARS:
+            cut = len(message) - MAX_RECORD_CHARS
+            message = f"{message[:MAX_RECORD_CHARS]}... [{cut} chars cut]"
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        return record
+
+
+class _Listener:
+    """Background thread draining the log queue into the sinks in batches"""
+
+    def __init__(self, log_queue, handlers):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            batch = [record]
+            while len(batch) < MAX_BATCH:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._write(batch)
+                    return
+                batch.append(record)
+            self._write(batch)
+
+    def _write(self, batch):
+        for handler in self.handlers:
+            handler.emit_batch(batch)
+
+    def stop(self):
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+        for handler in self.handlers:
+            handler.close()
+
+
+_queue_handler = None
+_listener = None
+
+
+def _start_listener() -> logging.Handler:
+    """One queue and one listener thread shared by every logger"""
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        return _queue_handler
 
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
 
-    file_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    console_formatter = ColorFormatter("%(levelname)s - %(name)s - %(message)s")
-
     log_filename = logs_dir / f"job_scraper_{datetime.now().strftime('%Y%m%d')}.log"
-    file_handler = logging.FileHandler(log_filename, encoding="utf-8")
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(file_formatter)
+    file_handler = BatchFileHandler(log_filename, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    console_handler = BatchStreamHandler(sys.stdout)
+    console_handler.setFormatter(ColorFormatter("%(levelname)s - %(name)s - %(message)s"))
+
+    handlers = [file_handler, console_handler]
+    if JSON_LOG_PATH:
+        Path(JSON_LOG_PATH).parent.mkdir(parents=True, exist_ok=True)
+        json_handler = BatchFileHandler(JSON_LOG_PATH, encoding="utf-8")
+        json_handler.setFormatter(JSONFormatter())
+        handlers.append(json_handler)
+
+    log_queue = queue.SimpleQueue()
+    _listener = _Listener(log_queue, handlers)
+    _queue_handler = CappedQueueHandler(log_queue)
+    atexit.register(stop_logging)
+    return _queue_handler
+
 
-    # Use custom streaming handler
-    console_handler = StreamingHandler(sys.stdout)
-    console_handler.setLevel(level)
-    console_handler.setFormatter(console_formatter)
+def stop_logging():
+    """Write out whatever is still queued and close the sinks"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    _listener = None
+
+
+def setup_logger(name: str = __name__, level: int = logging.INFO) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+
+    if logger.handlers:
+        return logger
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Formatting and writing happen on the listener thread, never on the event loop
+    logger.addHandler(_start_listener())
 
     return logger
@@ -0,0 +1,206 @@
+"""
+Tracing - per-tool spans with wall time, token, byte and cache counters
+Spans nest through a context variable, so counters added anywhere inside a
+tool call (OpenAI requests, HTML cleaning, cache lookups) roll up to it.
+"""
+
+import os
+import json
+import time
+import itertools
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Counters every span can carry
+COUNTERS = (
+    "prompt_tokens", "completion_tokens", "html_bytes_in", "html_bytes_out",
+    "cache_hits", "http_requests", "retries", "errors",
+)
+
+# Optional USD prices per million tokens, for a cost estimate in the summary
+PRICE_INPUT = float(os.getenv("OPENAI_PRICE_INPUT_PER_M", "0") or 0)
+PRICE_OUTPUT = float(os.getenv("OPENAI_PRICE_OUTPUT_PER_M", "0") or 0)
+
+_current_span = ContextVar("current_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    def __init__(self, name, kind, parent=None):
+        self.id = next(_span_ids)
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.start = time.time()
+        self.wall = 0.0
+        self.counters = defaultdict(int)
+        self.attrs = {}
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "parent": self.parent.id if self.parent else None,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "wall": round(self.wall, 4),
+            **dict(self.counters),
+            **self.attrs,
+        }
+
+
+class Tracer:
+    """Collects spans for tools and OpenAI calls and writes them as NDJSON"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.totals = {}
+
+    @asynccontextmanager
+    async def span(self, name, kind="tool", **attrs):
+        parent = _current_span.get()
+        span = Span(name, kind, parent)
+        span.attrs.update(attrs)
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            # Count an error once, not again in every span it propagates through
+            if not getattr(e, "_traced", False):
+                add(errors=1)
+                try:
+                    e._traced = True
+                except AttributeError:
+                    pass
+            raise
+        finally:
+            span.wall = time.perf_counter() - started
+            _current_span.reset(token)
+            self._finish(span)
+
+    def _finish(self, span):
+        key = (span.kind, span.name)
+        total = self.totals.setdefault(key, defaultdict(float))
+        total["count"] += 1
+        total["wall"] += span.wall
+        total["wall_max"] = max(total["wall_max"], span.wall)
+        for name, value in span.counters.items():
+            total[name] += value
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(span.to_dict()) + "\n")
+
+    def wrap_tool(self, tool):
+        """Run every invocation of an agent FunctionTool inside a span"""
+        invoke = tool.on_invoke_tool
+
+        async def traced_invoke(ctx, input_json):
+            async with self.span(tool.name, kind="tool"):
+                result = await invoke(ctx, input_json)
+                # Tools report failures as "... failed: <reason>" strings
+                if isinstance(result, str) and " failed: " in result[:200]:
+                    add(errors=1)
+                return result
+
+        tool.on_invoke_tool = traced_invoke
+        return tool
+
+    def record(self, name, kind, wall=0.0, **counters):
+        """Record a finished span measured elsewhere, e.g. the agent's own LLM usage"""
+        parent = _current_span.get()
+        span = Span(name, kind, parent)
+        span.wall = wall
+        for counter, value in counters.items():
+            span.counters[counter] += value
+        add(**counters)
+        self._finish(span)
+
+    def summary(self) -> dict:
+        spans = []
+        for (kind, name), total in sorted(self.totals.items()):
+            entry = {"kind": kind, "name": name, **{k: round(v, 4) for k, v in total.items()}}
+            if PRICE_INPUT or PRICE_OUTPUT:
+                entry["cost_usd"] = round(
+                    total.get("prompt_tokens", 0) / 1e6 * PRICE_INPUT
+                    + total.get("completion_tokens", 0) / 1e6 * PRICE_OUTPUT, 6
+                )
+            spans.append(entry)
+        return {"generated": datetime.now().isoformat(), "spans": spans}
+
+    def prometheus(self) -> str:
+        lines = []
+        metrics = [("count", "scraper_span_count"), ("wall", "scraper_span_seconds_total"),
+                   ("wall_max", "scraper_span_seconds_max")] + [(c, f"scraper_{c}_total") for c in COUNTERS]
+        for key, metric in metrics:
+            lines.append(f"# TYPE {metric} {'gauge' if key == 'wall_max' else 'counter'}")
+            for (kind, name), total in sorted(self.totals.items()):
+                lines.append(f'{metric}{{kind="{kind}",span="{name}"}} {total.get(key, 0)}')
+        return "\n".join(lines) + "\n"
+
+    def write_summary(self, path, fmt="json"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            if fmt == "prometheus":
+                f.write(self.prometheus())
+            else:
+                json.dump(self.summary(), f, indent=2)
+        logger.info(f"Run report written to {path}")
+
+    def log_summary(self):
+        for entry in self.summary()["spans"]:
+            logger.info(
+                f"[{entry['kind']}] {entry['name']}: {int(entry['count'])} calls, "
+                f"{entry['wall']:.1f}s, {int(entry.get('prompt_tokens', 0))}+"
+                f"{int(entry.get('completion_tokens', 0))} tokens, "
+                f"{int(entry.get('cache_hits', 0))} cache hits"
+            )
+
+
+def add(**counters):
+    """Add to the counters of the current span and all spans it is nested in"""
+    span = _current_span.get()
+    while span is not None:
+        for name, value in counters.items():
+            span.counters[name] += value
+        span = span.parent
+
+
+def current_span():
+    return _current_span.get()
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer):
+    global _tracer
+    _tracer = tracer
+    return tracer
+
+
+def summary_path(tracer: Tracer, fmt: str) -> Path:
+    """Summary file next to the trace, e.g. traces/trace_<timestamp>.summary.json"""
+    base = tracer.path.with_suffix("") if tracer.path else Path(os.getenv("TRACE_DIR", "traces")) / "trace"
+    return base.with_suffix(".summary.prom" if fmt == "prometheus" else ".summary.json")
+
+
+def start_trace(directory=None) -> Tracer:
+    """New process-wide tracer writing to traces/trace_<timestamp>.ndjson"""
+    directory = Path(directory or os.getenv("TRACE_DIR", "traces"))
+    path = directory / f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+    logger.info(f"Tracing to {path}")
+    return set_tracer(Tracer(path))